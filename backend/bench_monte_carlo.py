@@ -0,0 +1,251 @@
+"""
+Throughput benchmarks for the Monte Carlo engine.
+
+Usage:
+    python bench_monte_carlo.py
+"""
+
+import multiprocessing
+import os
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from core.estimation import calculate_base_effort
+from core.monte_carlo import run_monte_carlo
+from core.parallel import run_monte_carlo_parallel
+from test_monte_carlo import make_request, reference_loop
+
+
+def _time(fn, repeats: int = 3) -> float:
+    """Best-of-N wall time in seconds."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_vectorized_vs_loop():
+    print("Vectorized kernel vs per-run loop\n" + "=" * 50)
+    print(f"{'runs':>10} {'loop (s)':>12} {'vectorized (s)':>16} {'speedup':>10}")
+    for n in (1_000, 10_000, 1_000_000):
+        request = make_request(num_simulations=n, seed=0)
+        base_effort = calculate_base_effort(request)
+        repeats = 1 if n >= 1_000_000 else 3
+
+        loop_s = _time(lambda: reference_loop(request, base_effort), repeats)
+        vec_s = _time(lambda: run_monte_carlo(request, base_effort), repeats)
+        print(f"{n:>10,} {loop_s:>12.4f} {vec_s:>16.4f} {loop_s / vec_s:>9.1f}x")
+
+
+def bench_parallel_scaling(n: int = 8_000_000):
+    print(f"\nProcess-pool scaling at {n:,} runs\n" + "=" * 50)
+    request = make_request(num_simulations=n, seed=0)
+    base_effort = calculate_base_effort(request)
+
+    serial_s = _time(lambda: run_monte_carlo(request, base_effort), 1)
+    print(f"{'serial':>10} {serial_s:>10.3f}s {n / serial_s / 1e6:>8.1f}M runs/s")
+    for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+        # Started like the service's pool (core.parallel.get_executor)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("forkserver")) as executor:
+            os.environ["SIMULATION_WORKERS"] = str(workers)
+            run_monte_carlo_parallel(request, base_effort, executor=executor)  # warm up workers
+            parallel_s = _time(lambda: run_monte_carlo_parallel(request, base_effort, executor=executor), 1)
+        print(f"{workers:>8}w  {parallel_s:>10.3f}s {n / parallel_s / 1e6:>8.1f}M runs/s"
+              f" {serial_s / parallel_s:>6.2f}x")
+
+
+def bench_streaming_memory():
+    print("\nPeak memory: exact vs streaming sketch\n" + "=" * 50)
+    for n in (100_000, 1_000_000, 10_000_000):
+        request = make_request(num_simulations=n, seed=0)
+        base_effort = calculate_base_effort(request)
+        row = f"{n:>10,}"
+        for streaming in (False, True):
+            tracemalloc.start()
+            start = time.perf_counter()
+            run_monte_carlo(request, base_effort, streaming=streaming)
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            row += f"  {'streaming' if streaming else 'exact'}: {peak / 2**20:>8.1f} MiB {elapsed:>6.2f}s"
+        print(row)
+
+
+def _p90_standard_error(request, base_effort, n: int, replicates: int = 40) -> float:
+    p90s = []
+    for seed in range(replicates):
+        replicate = request.model_copy(update={"num_simulations": n, "seed": seed})
+        p90s.append(np.percentile(run_monte_carlo(replicate, base_effort)["completion_samples"], 90))
+    return float(np.std(p90s, ddof=1))
+
+
+def bench_sampling_modes():
+    print("\nRuns needed to match the P90 standard error of 16,384 random runs\n" + "=" * 50)
+    request = make_request()
+    base_effort = calculate_base_effort(request)
+    sizes = [2 ** k for k in range(8, 15)]
+    target = _p90_standard_error(request.model_copy(update={"sampling": "random"}), base_effort, 2 ** 14)
+    print(f"target P90 standard error: {target:.4f} weeks")
+    print(f"{'sampling':>12} {'runs needed':>12} {'fraction':>10}")
+    for method in ("random", "antithetic", "lhs", "sobol"):
+        method_request = request.model_copy(update={"sampling": method})
+        needed = next(
+            (n for n in sizes if _p90_standard_error(method_request, base_effort, n) <= target * 1.05),
+            None,
+        )
+        label = f"{needed:,}" if needed else f">{sizes[-1]:,}"
+        fraction = f"{needed / 2 ** 14:.0%}" if needed else "-"
+        print(f"{method:>12} {label:>12} {fraction:>10}")
+
+
+def bench_batch_endpoint(n_projects: int = 200, n_simulations: int = 1000):
+    from fastapi.testclient import TestClient
+    from main import app
+
+    print(f"\n{n_projects} projects x {n_simulations:,} runs: sequential /simulate vs /simulate/batch\n" + "=" * 50)
+    rng = np.random.default_rng(0)
+    projects = [
+        make_request(
+            num_simulations=n_simulations,
+            seed=i,
+            scope_size=str(rng.choice(["small", "medium", "large"])),
+            integrations=int(rng.integers(0, 7)),
+            team_junior=int(rng.integers(0, 4)),
+        ).model_dump()
+        for i in range(n_projects)
+    ]
+    with TestClient(app) as client:
+        sequential_s = _time(lambda: [client.post("/simulate", json=p) for p in projects], 1)
+        batch_s = _time(lambda: client.post("/simulate/batch", json={"projects": projects}), 1)
+    print(f"sequential: {sequential_s:.3f}s ({n_projects / sequential_s:,.0f} projects/s)")
+    print(f"batch:      {batch_s:.3f}s ({n_projects / batch_s:,.0f} projects/s)  {sequential_s / batch_s:.1f}x")
+
+
+def bench_dag(n_simulations: int = 100_000):
+    from core.dag import run_dag_monte_carlo
+    from models.schemas import DagTask
+
+    print(f"\nTask-graph simulation at {n_simulations:,} runs\n" + "=" * 50)
+    rng = np.random.default_rng(0)
+    for n_tasks in (50, 200, 500):
+        tasks = []
+        for i in range(n_tasks):
+            depends_on = [f"t{j}" for j in rng.choice(i, size=min(i, 3), replace=False)] if i else []
+            likely = float(rng.uniform(1, 4))
+            tasks.append(DagTask(
+                id=f"t{i}", optimistic_weeks=0.7 * likely, likely_weeks=likely, pessimistic_weeks=2 * likely,
+                distribution="pert" if i % 2 else "triangular", depends_on=depends_on,
+            ))
+        elapsed = _time(lambda: run_dag_monte_carlo(tasks, n_simulations, seed=0), 1)
+        print(f"{n_tasks:4d} tasks: {elapsed:.2f}s ({n_tasks * n_simulations / elapsed / 1e6:.0f}M task-runs/s)")
+
+
+def bench_portfolio(n_projects: int = 100, n_simulations: int = 50_000):
+    from core.portfolio import run_portfolio
+    from models.schemas import PortfolioRequest
+
+    print(f"\nPortfolio of {n_projects} projects x {n_simulations:,} runs on a half-sized pool\n" + "=" * 50)
+    rng = np.random.default_rng(0)
+    projects = [
+        make_request(
+            project_name=f"Project {i}",
+            scope_size=str(rng.choice(["small", "medium", "large"])),
+            team_junior=int(rng.integers(0, 3)),
+            team_mid=int(rng.integers(0, 3)),
+            team_senior=int(rng.integers(1, 3)),
+        )
+        for i in range(n_projects)
+    ]
+    pool = {
+        role: sum(getattr(p, f"team_{role}") for p in projects) // 2 for role in ("junior", "mid", "senior")
+    }
+    for policy in ("shared", "fixed"):
+        request = PortfolioRequest(projects=projects, pool=pool, policy=policy, num_simulations=n_simulations, seed=0)
+        print(f"{policy:6s}: {_time(lambda: run_portfolio(request), 1):.2f}s")
+
+
+def bench_kernel_backends(runs: int = 1_000_000):
+    from core.kernels import available_kernels, benchmark_kernels
+    from core.monte_carlo import completion_weeks_from_normals
+
+    print(f"\nKernel backends on {runs:,} runs (after JIT warm-up)\n" + "=" * 50)
+    kernels = {"reference": completion_weeks_from_normals, **available_kernels()}
+    for name, seconds in benchmark_kernels(kernels, runs).items():
+        print(f"{name:10s}: {seconds * 1e3:7.2f} ms ({runs / seconds / 1e6:,.0f}M runs/s)")
+
+
+def bench_precision(n: int = 10_000_000):
+    print(f"\nfloat64 vs float32 at {n:,} runs\n" + "=" * 50)
+    for streaming in (True, False):
+        for precision in ("float64", "float32"):
+            request = make_request(num_simulations=n, seed=0, precision=precision)
+            base_effort = calculate_base_effort(request)
+            results = {}
+            elapsed = _time(lambda: results.update(run_monte_carlo(request, base_effort, streaming=streaming)), 1)
+            mode = "streaming" if streaming else "exact"
+            print(
+                f"{mode:9s} {precision}: {elapsed:.2f}s  P90 {results['p90_weeks']}  "
+                f"arrays {results['peak_memory_mb']:.1f} MiB"
+            )
+
+
+def bench_health_under_load(n_heavy: int = 4, n_simulations: int = 200_000, duration_s: float = 3.0):
+    import asyncio
+
+    import httpx
+
+    import core.offload as offload
+    from main import app
+
+    print(f"\n/health latency while {n_heavy} x {n_simulations:,}-run /simulate requests run\n" + "=" * 50)
+    payload = make_request(num_simulations=n_simulations, bypass_cache=True).model_dump()
+
+    async def measure(load: bool) -> np.ndarray:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            stop = time.perf_counter() + duration_s
+
+            async def heavy():
+                while time.perf_counter() < stop:
+                    await client.post("/simulate", json=payload, timeout=None)
+
+            workers = [asyncio.create_task(heavy()) for _ in range(n_heavy if load else 0)]
+            # Probes are due every 5 ms; latency counts from when a probe was
+            # due, so time the loop spent blocked is not hidden
+            latencies = []
+            due = time.perf_counter()
+            while due < stop:
+                await asyncio.sleep(max(0.0, due - time.perf_counter()))
+                await client.get("/health")
+                latencies.append(time.perf_counter() - due)
+                due += 0.005
+            await asyncio.gather(*workers)
+        return np.array(latencies) * 1e3
+
+    for workers in (0, offload.SIMULATION_OFFLOAD_WORKERS):
+        offload.shutdown_offload_executor()
+        offload._offload = offload.OffloadExecutor(workers)
+        mode = "inline (event loop)" if workers == 0 else f"offloaded ({workers} threads)"
+        for load in (False, True):
+            latencies = asyncio.run(measure(load))
+            p50, p99 = np.percentile(latencies, [50, 99])
+            print(f"{mode:22s} {'loaded' if load else 'idle':6s}: p50 {p50:7.2f} ms  p99 {p99:7.2f} ms  (n={len(latencies)})")
+    offload.shutdown_offload_executor()
+
+
+if __name__ == "__main__":
+    bench_vectorized_vs_loop()
+    bench_parallel_scaling()
+    bench_streaming_memory()
+    bench_sampling_modes()
+    bench_batch_endpoint()
+    bench_dag()
+    bench_portfolio()
+    bench_kernel_backends()
+    bench_precision()
+    bench_health_under_load()
@@ -0,0 +1,327 @@
+"""
+Cost-based admission control for simulation requests.
+
+Before any work starts, a request's cost is estimated in compute-seconds:
+its run count times the measured time per run for its sampling strategy
+(calibrated once on this machine), plus a fixed per-request overhead.
+Adaptive runs with max_seconds cost at most that budget. Work that is not
+a SimulationRequest (task graphs, portfolios) is charged as a number of
+serial run-equivalents, e.g. tasks x runs.
+
+The cost is then charged to two token buckets, one for the calling client
+and one shared by everyone. Each bucket holds compute-seconds, refills at a
+steady rate and is capped at a burst size. A request that either bucket
+cannot cover yet is refused with a Retry-After of the time until it could be.
+
+Synchronous requests must also finish within ADMISSION_MAX_SECONDS. The
+estimate for that is the wait behind already admitted, unfinished
+synchronous work (background jobs run on their own pool and are not
+counted) plus the request's own wall time (divided across workers when it will run
+on the process pool). Work that cannot meet the deadline is never started:
+it is refused as too large when it could not finish even on an idle server,
+or as busy (with a Retry-After) when the wait is the problem.
+
+Memory is charged too: the arrays a request materialises (by default the
+engine's peak_memory_mb accounting; routes that build larger structures pass
+their own figure) must fit ADMISSION_MAX_MEMORY_MB on their own (422
+otherwise) and alongside all admitted, unfinished work (503 otherwise).
+"""
+
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from models.schemas import SimulationRequest
+
+
+ADMISSION_MAX_SECONDS = float(os.getenv("ADMISSION_MAX_SECONDS", "30"))
+ADMISSION_CLIENT_BURST_SECONDS = float(os.getenv("ADMISSION_CLIENT_BURST_SECONDS", "30"))
+ADMISSION_CLIENT_RATE = float(os.getenv("ADMISSION_CLIENT_RATE", "0.5"))
+ADMISSION_GLOBAL_BURST_SECONDS = float(os.getenv("ADMISSION_GLOBAL_BURST_SECONDS", "120"))
+ADMISSION_GLOBAL_RATE = float(os.getenv("ADMISSION_GLOBAL_RATE", str(os.cpu_count() or 1)))
+ADMISSION_MAX_MEMORY_MB = float(os.getenv("ADMISSION_MAX_MEMORY_MB", "2048"))
+# Header naming the client (e.g. an API key); the client address when unset
+ADMISSION_CLIENT_HEADER = os.getenv("ADMISSION_CLIENT_HEADER")
+# Per-client buckets kept; the least recently seen client is forgotten first
+ADMISSION_MAX_CLIENTS = 10_000
+
+# Fixed cost of estimation, risk scoring and serialisation per request
+REQUEST_OVERHEAD_SECONDS = 0.001
+
+# Time per run relative to "random" sampling, measured on the serial engine.
+# float32 is charged as float64: it is cheaper for random draws but not for LHS/Sobol.
+SAMPLING_COST = {"random": 1.0, "antithetic": 0.75, "lhs": 2.0, "sobol": 2.3}
+
+CALIBRATION_RUNS = 65_536
+
+
+class AdmissionRejected(Exception):
+    """A request refused before it started, with the HTTP status to answer with."""
+
+    def __init__(self, status_code: int, detail: str, retry_after: Optional[float] = None):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+    def headers(self) -> Optional[dict]:
+        if self.retry_after is None:
+            return None
+        return {"Retry-After": str(max(1, math.ceil(self.retry_after)))}
+
+
+class TokenBucket:
+    """Compute-seconds that refill at `rate` per second up to `capacity`."""
+
+    def __init__(self, capacity: float, rate: float, now: float):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity
+        self.updated = now
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_for(self, amount: float) -> float:
+        """Seconds until `amount` tokens are available (0 if they are now)."""
+        if amount <= self.tokens:
+            return 0.0
+        return (amount - self.tokens) / self.rate if self.rate > 0 else math.inf
+
+
+class AdmissionTicket:
+    """An admitted request's share of in-flight work, released when it finishes."""
+
+    def __init__(
+        self, controller: "AdmissionController", client: str, cost_seconds: float, wall_seconds: float,
+        deadline: bool, memory_mb: float = 0.0,
+    ):
+        self.controller = controller
+        self.client = client
+        self.cost_seconds = cost_seconds
+        self.wall_seconds = wall_seconds
+        self.deadline = deadline
+        self.memory_mb = memory_mb
+        self._released = False
+
+    def release(self, refund: bool = False) -> None:
+        """Mark the work finished; refund=True also returns its tokens (it never ran)."""
+        if not self._released:
+            self._released = True
+            self.controller._finish(self, refund)
+
+    def __enter__(self) -> "AdmissionTicket":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        max_seconds: float = ADMISSION_MAX_SECONDS,
+        client_burst: float = ADMISSION_CLIENT_BURST_SECONDS,
+        client_rate: float = ADMISSION_CLIENT_RATE,
+        global_burst: float = ADMISSION_GLOBAL_BURST_SECONDS,
+        global_rate: float = ADMISSION_GLOBAL_RATE,
+        seconds_per_run: Optional[float] = None,
+        max_memory_mb: float = ADMISSION_MAX_MEMORY_MB,
+    ):
+        self.max_seconds = max_seconds
+        self.max_memory_mb = max_memory_mb
+        self.client_burst = client_burst
+        self.client_rate = client_rate
+        self.seconds_per_run = seconds_per_run
+        self.global_bucket = TokenBucket(global_burst, global_rate, time.monotonic())
+        self._clients: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        # Admitted, unfinished wall time: synchronous work queued on the offload
+        # pool, and background jobs on the job pool
+        self.inflight_wall_seconds = 0.0
+        self.background_wall_seconds = 0.0
+        self.inflight_memory_mb = 0.0
+        self.admitted = 0
+        self.rejected = {"budget": 0, "busy": 0, "too_large": 0}
+        self._lock = threading.Lock()
+
+    def calibrate(self) -> float:
+        """Measure seconds per run of the serial engine (best of 3 on one block)."""
+        from core.estimation import calculate_base_effort
+        from core.monte_carlo import run_monte_carlo
+
+        request = SimulationRequest(
+            project_name="calibration", description="", scope_size="medium", complexity=3, stack="",
+            deadline_weeks=12, team_junior=1, team_mid=2, team_senior=1, integrations=2,
+            scope_volatility=30, num_simulations=CALIBRATION_RUNS, seed=0,
+        )
+        base_effort = calculate_base_effort(request)
+        best = math.inf
+        for _ in range(3):
+            start = time.perf_counter()
+            run_monte_carlo(request, base_effort)
+            best = min(best, time.perf_counter() - start)
+        self.seconds_per_run = best / CALIBRATION_RUNS
+        print(f"[Admission] {self.seconds_per_run * 1e9:.0f} ns per run")
+        return self.seconds_per_run
+
+    def estimate(self, request: SimulationRequest) -> tuple[float, float]:
+        """Compute-seconds and wall-clock seconds the request is expected to take."""
+        from core.parallel import should_run_parallel, worker_count
+
+        if self.seconds_per_run is None:
+            self.calibrate()
+        cost = request.num_simulations * self.seconds_per_run * SAMPLING_COST[request.sampling]
+        if request.adaptive and request.max_seconds is not None:
+            cost = min(cost, request.max_seconds)
+        wall = cost / worker_count() if not request.adaptive and should_run_parallel(request) else cost
+        return cost + REQUEST_OVERHEAD_SECONDS, wall + REQUEST_OVERHEAD_SECONDS
+
+    def estimate_runs(self, runs: int) -> tuple[float, float]:
+        """Compute-seconds and wall-clock seconds of `runs` serial run-equivalents of other work."""
+        if self.seconds_per_run is None:
+            self.calibrate()
+        cost = runs * self.seconds_per_run + REQUEST_OVERHEAD_SECONDS
+        return cost, cost
+
+    @staticmethod
+    def estimate_memory_mb(request: SimulationRequest) -> float:
+        """Peak array memory of the request run on its own, as the engine accounts it."""
+        from core.monte_carlo import BLOCK_SIZE, peak_memory_mb, use_streaming
+
+        return peak_memory_mb(request, request.num_simulations, BLOCK_SIZE, keep_samples=not use_streaming(request))
+
+    def admit(
+        self,
+        client: str,
+        requests: list[SimulationRequest],
+        deadline: bool = True,
+        memory_mb: Optional[float] = None,
+        runs: int = 0,
+    ) -> AdmissionTicket:
+        """
+        Charge the requests' estimated cost to the client and global budgets,
+        or raise AdmissionRejected. With deadline=False (background jobs) the
+        ADMISSION_MAX_SECONDS check is skipped. memory_mb overrides the
+        memory estimate (the sum of the requests' own); runs adds that many
+        run-equivalents of other work.
+        """
+        from core.offload import get_offload_executor
+
+        estimates = [self.estimate(request) for request in requests]
+        if runs:
+            estimates.append(self.estimate_runs(runs))
+        cost = sum(c for c, _ in estimates)
+        wall = sum(w for _, w in estimates)
+        if memory_mb is None:
+            memory_mb = sum(self.estimate_memory_mb(request) for request in requests)
+        now = time.monotonic()
+        with self._lock:
+            if memory_mb > self.max_memory_mb:
+                self.rejected["too_large"] += 1
+                raise AdmissionRejected(
+                    422, f"Estimated {memory_mb:.0f} MiB of simulation arrays exceeds the "
+                         f"{self.max_memory_mb:g} MiB limit; lower num_simulations",
+                )
+
+            if cost > min(self.client_burst, self.global_bucket.capacity) or (deadline and wall > self.max_seconds):
+                self.rejected["too_large"] += 1
+                limit = f"{self.max_seconds:g} s limit" if deadline and wall > self.max_seconds else "compute budget"
+                raise AdmissionRejected(
+                    422, f"Estimated {wall:.1f} s ({cost:.1f} compute-s) exceeds the {limit}; "
+                         "lower num_simulations or use adaptive mode with max_seconds",
+                )
+
+            bucket = self._client_bucket(client, now)
+            self.global_bucket.refill(now)
+            retry_after = max(bucket.wait_for(cost), self.global_bucket.wait_for(cost))
+            if retry_after > 0:
+                self.rejected["budget"] += 1
+                raise AdmissionRejected(429, "Simulation compute budget exhausted; retry later", retry_after)
+
+            if deadline:
+                workers = max(1, get_offload_executor().max_workers)
+                queue_wait = self.inflight_wall_seconds / workers
+                if queue_wait + wall > self.max_seconds:
+                    self.rejected["busy"] += 1
+                    raise AdmissionRejected(
+                        503, "Too much simulation work queued to finish this request in time", queue_wait
+                    )
+            if self.inflight_memory_mb + memory_mb > self.max_memory_mb:
+                self.rejected["busy"] += 1
+                workers = max(1, get_offload_executor().max_workers)
+                raise AdmissionRejected(
+                    503, "Too much simulation memory in use to start this request",
+                    max(1.0, self.inflight_wall_seconds / workers),
+                )
+
+            bucket.tokens -= cost
+            self.global_bucket.tokens -= cost
+            if deadline:
+                self.inflight_wall_seconds += wall
+            else:
+                self.background_wall_seconds += wall
+            self.inflight_memory_mb += memory_mb
+            self.admitted += 1
+            return AdmissionTicket(self, client, cost, wall, deadline, memory_mb)
+
+    def _client_bucket(self, client: str, now: float) -> TokenBucket:
+        bucket = self._clients.get(client)
+        if bucket is None:
+            bucket = TokenBucket(self.client_burst, self.client_rate, now)
+            self._clients[client] = bucket
+            if len(self._clients) > ADMISSION_MAX_CLIENTS:
+                self._clients.popitem(last=False)
+        else:
+            self._clients.move_to_end(client)
+            bucket.refill(now)
+        return bucket
+
+    def _finish(self, ticket: AdmissionTicket, refund: bool) -> None:
+        with self._lock:
+            if ticket.deadline:
+                self.inflight_wall_seconds = max(0.0, self.inflight_wall_seconds - ticket.wall_seconds)
+            else:
+                self.background_wall_seconds = max(0.0, self.background_wall_seconds - ticket.wall_seconds)
+            self.inflight_memory_mb = max(0.0, self.inflight_memory_mb - ticket.memory_mb)
+            if refund:
+                self.global_bucket.tokens = min(self.global_bucket.capacity, self.global_bucket.tokens + ticket.cost_seconds)
+                bucket = self._clients.get(ticket.client)
+                if bucket is not None:
+                    bucket.tokens = min(bucket.capacity, bucket.tokens + ticket.cost_seconds)
+
+    def stats(self) -> dict:
+        with self._lock:
+            self.global_bucket.refill(time.monotonic())
+            return {
+                "admitted": self.admitted,
+                "rejected_budget": self.rejected["budget"],
+                "rejected_busy": self.rejected["busy"],
+                "rejected_too_large": self.rejected["too_large"],
+                "inflight_seconds": round(self.inflight_wall_seconds, 3),
+                "background_seconds": round(self.background_wall_seconds, 3),
+                "inflight_memory_mb": round(self.inflight_memory_mb, 2),
+                "global_budget_seconds": round(self.global_bucket.tokens, 3),
+                "ns_per_run": round(self.seconds_per_run * 1e9, 1) if self.seconds_per_run else None,
+            }
+
+
+_controller: Optional[AdmissionController] = None
+
+
+def get_admission_controller() -> AdmissionController:
+    """Process-wide admission controller, created on first use."""
+    global _controller
+    if _controller is None:
+        _controller = AdmissionController()
+    return _controller
+
+
+def client_key(headers, client_host: Optional[str]) -> str:
+    """Who a request is charged to: ADMISSION_CLIENT_HEADER if set and present, else the client address."""
+    if ADMISSION_CLIENT_HEADER and headers.get(ADMISSION_CLIENT_HEADER):
+        return f"header:{headers[ADMISSION_CLIENT_HEADER]}"
+    return f"addr:{client_host or 'unknown'}"
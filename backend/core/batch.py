@@ -0,0 +1,68 @@
+"""
+Batch Monte Carlo: many projects evaluated as one (projects x runs) array program.
+"""
+
+import numpy as np
+
+from core.monte_carlo import (
+    N_FACTORS,
+    completion_weeks_from_normals,
+    draw_normals,
+    kernel_params,
+    root_seed_sequence,
+    summarize_completion_weeks,
+    use_streaming,
+)
+from models.schemas import SimulationRequest
+
+
+# Cap on projects x runs per matrix pass, keeping temporaries to a few tens of MB
+BATCH_MAX_ELEMENTS = 2_000_000
+
+
+def stack_kernel_params(params_list: list[dict], dtype: np.dtype = np.float64) -> dict:
+    """Stack per-project kernel params into (P, 1) columns that broadcast over runs."""
+    return {key: np.array([params[key] for params in params_list], dtype=dtype)[:, None] for key in params_list[0]}
+
+
+def can_batch(request: SimulationRequest) -> bool:
+    """Whether a request fits the matrix path (fixed run count, samples held in memory)."""
+    return not request.adaptive and not use_streaming(request)
+
+
+def run_monte_carlo_batch(requests: list[SimulationRequest], base_efforts: list[dict]) -> list[dict]:
+    """
+    Run the Monte Carlo step for many projects at once.
+
+    Projects with the same run count, sampling strategy, factor correlation
+    and precision share one (projects x runs) matrix: draws come from each
+    project's own seeded stream, so a seeded project gets exactly the results
+    run_monte_carlo would give it alone, while the kernel runs once per matrix. Returns one
+    results dict per request, in order, without completion_samples.
+    """
+    results: list[dict] = [{} for _ in requests]
+
+    groups: dict[tuple, list[int]] = {}
+    for index, request in enumerate(requests):
+        key = (request.num_simulations, request.sampling, request.correlation, request.precision)
+        groups.setdefault(key, []).append(index)
+
+    for (n_simulations, sampling, correlation, precision), indices in groups.items():
+        rows_per_pass = max(1, BATCH_MAX_ELEMENTS // n_simulations)
+        for start in range(0, len(indices), rows_per_pass):
+            rows = indices[start:start + rows_per_pass]
+
+            z = np.empty((N_FACTORS, len(rows), n_simulations), dtype=precision)
+            for row, index in enumerate(rows):
+                z[:, row, :] = draw_normals(
+                    root_seed_sequence(requests[index].seed), n_simulations, sampling, correlation, precision
+                )
+
+            params = stack_kernel_params([kernel_params(requests[i], base_efforts[i]) for i in rows], precision)
+            weeks = completion_weeks_from_normals(params, z)
+            del z
+
+            for row, index in enumerate(rows):
+                results[index] = summarize_completion_weeks(weeks[row], requests[index])
+
+    return results
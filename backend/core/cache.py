@@ -0,0 +1,103 @@
+"""
+In-process result cache for /simulate.
+
+Entries are keyed by a fingerprint of the request fields that affect the
+result, so renaming a project or editing its description still hits. The
+cache is bounded by entry count (least recently used entries go first) and
+by age (entries expire ttl_seconds after they were stored).
+
+Unseeded requests are cached too: a repeat of the same inputs gets the same
+draw back, which keeps reloaded dashboards stable. Set bypass_cache on a
+request to force a fresh simulation; its result replaces the cached one.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from pydantic import BaseModel
+
+from models.schemas import SimulationRequest
+
+
+# Fields that label a request but do not change its result
+FINGERPRINT_EXCLUDED_FIELDS = {"project_name", "description", "bypass_cache"}
+
+SIMULATION_CACHE_SIZE = int(os.getenv("SIMULATION_CACHE_SIZE", "256"))
+SIMULATION_CACHE_TTL_SECONDS = float(os.getenv("SIMULATION_CACHE_TTL_SECONDS", "600"))
+
+
+def request_fingerprint(request: BaseModel) -> str:
+    """
+    Stable hash of the result-relevant simulation inputs of a request.
+    Fields added by SimulationRequest subclasses are ignored, so a request
+    that extends the inputs (e.g. with prior results) maps to the same key.
+    """
+    included = set(SimulationRequest.model_fields) - FINGERPRINT_EXCLUDED_FIELDS
+    fields = request.model_dump(include=included)
+    canonical = json.dumps(fields, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class ResultCache:
+    """Thread-safe LRU cache with a per-entry time to live and hit/miss/eviction counters."""
+
+    def __init__(self, max_entries: int = SIMULATION_CACHE_SIZE, ttl_seconds: float = SIMULATION_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        # key -> (expiry time, value), least recently used first
+        self._entries: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, value: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+simulation_cache = ResultCache()
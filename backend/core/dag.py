@@ -0,0 +1,228 @@
+"""
+Task-graph Monte Carlo: project completion as the longest path through a
+dependency DAG of tasks with uncertain durations.
+
+Tasks are laid out as rows in topological order and every run is a column,
+so one pass over the rows computes earliest finish times for all runs at
+once: a task starts when the latest of its predecessors finishes. A backward
+pass then marks, per run, which tasks lie on a critical (longest) path; the
+fraction of runs in which a task is critical is its criticality index. Tied
+paths are all counted as critical.
+"""
+
+import os
+from typing import Optional
+
+import numpy as np
+
+from core.monte_carlo import SimulationAccumulator, block_generator, root_seed_sequence
+from models.schemas import DagTask, ExecutionPlanResponse
+
+
+# Cap on tasks x runs per pass; each pass holds a few arrays of this size
+DAG_MAX_ELEMENTS = int(os.getenv("DAG_MAX_ELEMENTS", "4000000"))
+
+# Three-point estimates for execution-plan tasks, as multiples of the phase length
+PLAN_OPTIMISTIC_FACTOR = 0.75
+PLAN_PESSIMISTIC_FACTOR = 1.5
+PLAN_RISK_PESSIMISTIC_FACTOR = 2.0
+
+
+def tasks_from_execution_plan(plan: ExecutionPlanResponse) -> list[DagTask]:
+    """
+    Task graph implied by an execution plan: the tasks of a phase run in
+    parallel, each taking about the phase's length, and start once every task
+    of the previous phase is done. Risk-flagged tasks get a longer tail.
+    A phase without tasks becomes a single task of its own.
+    """
+    tasks: list[DagTask] = []
+    previous: list[str] = []
+    for phase_number, phase in enumerate(plan.phases, start=1):
+        likely = float(max(1, phase.week_end - phase.week_start + 1))
+        entries = [(t.title, t.risk_flag) for t in phase.tasks] or [(phase.name, None)]
+
+        current = []
+        for task_number, (title, risk_flag) in enumerate(entries, start=1):
+            task_id = f"{phase_number}.{task_number}" if phase.tasks else str(phase_number)
+            pessimistic = PLAN_RISK_PESSIMISTIC_FACTOR if risk_flag else PLAN_PESSIMISTIC_FACTOR
+            tasks.append(DagTask(
+                id=task_id,
+                name=title,
+                optimistic_weeks=likely * PLAN_OPTIMISTIC_FACTOR,
+                likely_weeks=likely,
+                pessimistic_weeks=likely * pessimistic,
+                depends_on=previous,
+            ))
+            current.append(task_id)
+        previous = current
+    return tasks
+
+
+def topological_order(tasks: list[DagTask]) -> tuple[list[DagTask], list[list[int]]]:
+    """
+    Tasks sorted so every task comes after its dependencies, plus each task's
+    predecessors as row indices into that order. Raises ValueError for
+    duplicate ids, unknown dependencies and cycles.
+    """
+    by_id = {task.id: task for task in tasks}
+    if len(by_id) != len(tasks):
+        raise ValueError("Task ids must be unique")
+    for task in tasks:
+        unknown = [dep for dep in task.depends_on if dep not in by_id]
+        if unknown:
+            raise ValueError(f"Task {task.id!r} depends on unknown task(s): {', '.join(unknown)}")
+
+    remaining = {task.id: len(set(task.depends_on)) for task in tasks}
+    successors: dict[str, list[str]] = {task.id: [] for task in tasks}
+    for task in tasks:
+        for dep in set(task.depends_on):
+            successors[dep].append(task.id)
+
+    ready = [task.id for task in tasks if remaining[task.id] == 0]
+    ordered: list[str] = []
+    while ready:
+        task_id = ready.pop(0)
+        ordered.append(task_id)
+        for successor in successors[task_id]:
+            remaining[successor] -= 1
+            if remaining[successor] == 0:
+                ready.append(successor)
+    if len(ordered) != len(tasks):
+        raise ValueError("Task dependencies contain a cycle")
+
+    row = {task_id: i for i, task_id in enumerate(ordered)}
+    predecessors = [sorted(row[dep] for dep in set(by_id[task_id].depends_on)) for task_id in ordered]
+    return [by_id[task_id] for task_id in ordered], predecessors
+
+
+def draw_durations(tasks: list[DagTask], rng: np.random.Generator, size: int) -> np.ndarray:
+    """Task durations in weeks, shape (tasks, size): PERT (scaled beta) or triangular."""
+    low = np.array([t.optimistic_weeks for t in tasks])[:, None]
+    mode = np.array([t.likely_weeks for t in tasks])[:, None]
+    high = np.array([t.pessimistic_weeks for t in tasks])[:, None]
+    span = high - low
+    # Degenerate estimates (low == high) give a fixed duration of `low`
+    safe_span = np.where(span > 0, span, 1.0)
+    peak = (mode - low) / safe_span
+
+    durations = np.empty((len(tasks), size))
+    pert = np.array([t.distribution == "pert" for t in tasks])
+    if pert.any():
+        alpha = 1 + 4 * peak[pert]
+        beta = 1 + 4 * (1 - peak[pert])
+        durations[pert] = low[pert] + span[pert] * rng.beta(alpha, beta, size=(int(pert.sum()), size))
+    if (~pert).any():
+        u = rng.random((int((~pert).sum()), size))
+        c = peak[~pert]
+        # Inverse CDF of the triangular distribution on [0, 1] with mode c
+        unit = np.where(u < c, np.sqrt(u * c), 1 - np.sqrt((1 - u) * (1 - c)))
+        durations[~pert] = low[~pert] + span[~pert] * unit
+    return durations
+
+
+def _latest_finish(finish: np.ndarray, rows: list[int]) -> np.ndarray:
+    """Elementwise latest finish over the given task rows."""
+    if len(rows) == 1:
+        return finish[rows[0]]
+    return np.max(finish[rows], axis=0)
+
+
+def simulate_dag_block(
+    tasks: list[DagTask], predecessors: list[list[int]], rng: np.random.Generator, size: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    One block of runs over a topologically sorted graph.
+    Returns project completion weeks (size,), and per-task sums over the
+    block of durations, finish times and critical-path membership.
+    """
+    finish = draw_durations(tasks, rng, size)
+    duration_sums = finish.sum(axis=1)
+
+    # Forward pass: earliest finish = latest predecessor finish + own duration
+    for row, preds in enumerate(predecessors):
+        if preds:
+            finish[row] += _latest_finish(finish, preds)
+    completion = finish.max(axis=0)
+
+    # Backward pass: a predecessor is critical where a critical task starts the
+    # moment it finishes. Start times are recomputed with the same max, so the
+    # equality is exact.
+    critical = finish == completion
+    for row in range(len(tasks) - 1, -1, -1):
+        preds = predecessors[row]
+        if not preds:
+            continue
+        start = _latest_finish(finish, preds)
+        for pred in preds:
+            critical[pred] |= critical[row] & (finish[pred] == start)
+
+    return completion, duration_sums, finish.sum(axis=1), critical.sum(axis=1)
+
+
+def dag_memory_mb(n_tasks: int, num_simulations: int) -> float:
+    """
+    Accounted peak size of a task-graph run's arrays, in MiB: one block of
+    finish times with the draw temporaries and critical-path mask, plus the
+    retained completion times.
+    """
+    block_size = min(num_simulations, max(1024, DAG_MAX_ELEMENTS // n_tasks))
+    working = n_tasks * block_size * (3 * 8 + 1)
+    retained = 2 * num_simulations * 8
+    return round((working + retained) / 2 ** 20, 2)
+
+
+def run_dag_monte_carlo(
+    tasks: list[DagTask], num_simulations: int, deadline_weeks: Optional[float] = None, seed: Optional[int] = None
+) -> dict:
+    """
+    Simulate a task graph and return completion percentiles, on-time
+    probability (when a deadline is given), a weekly histogram and per-task
+    criticality indices, most critical first.
+    Runs are processed in blocks of at most DAG_MAX_ELEMENTS task-runs, each
+    drawn from its own seeded stream.
+    """
+    ordered, predecessors = topological_order(tasks)
+    root = root_seed_sequence(seed)
+    block_size = max(1024, DAG_MAX_ELEMENTS // len(ordered))
+
+    accumulator = SimulationAccumulator(deadline_weeks if deadline_weeks is not None else np.inf)
+    duration_sums = np.zeros(len(ordered))
+    finish_sums = np.zeros(len(ordered))
+    critical_counts = np.zeros(len(ordered), dtype=np.int64)
+    completion_sum = 0.0
+
+    for block_index, start in enumerate(range(0, num_simulations, block_size)):
+        size = min(block_size, num_simulations - start)
+        completion, durations, finishes, critical = simulate_dag_block(
+            ordered, predecessors, block_generator(root, block_index), size
+        )
+        accumulator.add(completion)
+        completion_sum += float(completion.sum())
+        duration_sums += durations
+        finish_sums += finishes
+        critical_counts += critical
+
+    summary = accumulator.summary()
+    p50, p80, p90 = accumulator.quantiles([0.5, 0.8, 0.9])
+    task_results = [
+        {
+            "id": task.id,
+            "name": task.name,
+            "criticality_index": round(float(critical_counts[i]) / num_simulations, 3),
+            "mean_duration_weeks": round(float(duration_sums[i]) / num_simulations, 2),
+            "mean_finish_weeks": round(float(finish_sums[i]) / num_simulations, 2),
+        }
+        for i, task in enumerate(ordered)
+    ]
+    task_results.sort(key=lambda result: result["criticality_index"], reverse=True)
+
+    return {
+        "p50_weeks": round(float(p50), 1),
+        "p80_weeks": round(float(p80), 1),
+        "p90_weeks": round(float(p90), 1),
+        "mean_weeks": round(completion_sum / num_simulations, 1),
+        "on_time_probability": summary["on_time_probability"] if deadline_weeks is not None else None,
+        "histogram": summary["histogram"],
+        "tasks": task_results,
+        "seed": seed,
+    }
@@ -0,0 +1,148 @@
+"""
+Load shedding for /simulate: serve a cheaper forecast instead of timing out.
+
+Fidelity levels, from best to cheapest:
+- full:    the request as sent
+- reduced: a quarter of the runs (never below MIN_REDUCED_RUNS)
+- minimal: MINIMAL_RUNS runs in float32, without fan bands
+
+For the default 1,000 runs that is 500 and 250 runs. A request a level
+would leave unchanged (e.g. already this small) is served, and labelled, as
+full.
+
+The controller watches the latency of simulated /simulate responses (the
+FIDELITY_WINDOW most recent) and the offload queue depth. It steps down one
+level when the p95 latency exceeds FIDELITY_SLO_SECONDS or the queue holds
+FIDELITY_QUEUE_LIMIT or more simulations, at most once per
+FIDELITY_STEP_DOWN_SECONDS. It steps back up one level once p95 is under
+half the SLO, nothing is queued and FIDELITY_COOLDOWN_SECONDS have passed
+since the last change. Latencies are judged afresh after every change, so
+each level is measured on its own traffic.
+
+Degraded results are cached under their own (degraded) inputs and their
+level, so they are never served for a later full-fidelity request.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+import numpy as np
+
+from models.schemas import SimulationRequest
+
+
+FIDELITY_LEVELS = ("full", "reduced", "minimal")
+
+FIDELITY_SLO_SECONDS = float(os.getenv("FIDELITY_SLO_SECONDS", "2.0"))
+FIDELITY_QUEUE_LIMIT = int(os.getenv("FIDELITY_QUEUE_LIMIT", "4"))
+FIDELITY_STEP_DOWN_SECONDS = float(os.getenv("FIDELITY_STEP_DOWN_SECONDS", "1.0"))
+FIDELITY_COOLDOWN_SECONDS = float(os.getenv("FIDELITY_COOLDOWN_SECONDS", "10.0"))
+FIDELITY_WINDOW = 50
+# Latency samples needed before p95 is trusted at a level
+FIDELITY_MIN_SAMPLES = 5
+
+REDUCED_RUN_FRACTION = 0.25
+MIN_REDUCED_RUNS = 500
+MINIMAL_RUNS = 250
+
+
+def degrade(request: SimulationRequest, level: str) -> SimulationRequest:
+    """The request as it is simulated at the given fidelity level."""
+    if level == "full":
+        return request
+    if level == "reduced":
+        runs = max(min(request.num_simulations, MIN_REDUCED_RUNS), int(request.num_simulations * REDUCED_RUN_FRACTION))
+        return request.model_copy(update={"num_simulations": runs})
+    return request.model_copy(update={
+        "num_simulations": min(request.num_simulations, MINIMAL_RUNS),
+        "precision": "float32",
+        "include_fan_bands": False,
+    })
+
+
+class FidelityController:
+    def __init__(
+        self,
+        slo_seconds: float = FIDELITY_SLO_SECONDS,
+        queue_limit: int = FIDELITY_QUEUE_LIMIT,
+        step_down_seconds: float = FIDELITY_STEP_DOWN_SECONDS,
+        cooldown_seconds: float = FIDELITY_COOLDOWN_SECONDS,
+    ):
+        self.slo_seconds = slo_seconds
+        self.queue_limit = queue_limit
+        self.step_down_seconds = step_down_seconds
+        self.cooldown_seconds = cooldown_seconds
+        self.index = 0
+        self.last_change = -float("inf")
+        self.served = {level: 0 for level in FIDELITY_LEVELS}
+        self.step_downs = 0
+        self.step_ups = 0
+        self._latencies: deque = deque(maxlen=FIDELITY_WINDOW)
+        self._queue_depth = 0
+        self._lock = threading.Lock()
+
+    def _p95(self) -> Optional[float]:
+        if len(self._latencies) < FIDELITY_MIN_SAMPLES:
+            return None
+        return float(np.percentile(self._latencies, 95))
+
+    def level(self, queue_depth: int) -> str:
+        """Re-evaluate the pressure and return the level to serve the next request at."""
+        now = time.monotonic()
+        with self._lock:
+            self._queue_depth = queue_depth
+            p95 = self._p95()
+            overloaded = queue_depth >= self.queue_limit or (p95 is not None and p95 > self.slo_seconds)
+            relaxed = queue_depth == 0 and (p95 is None or p95 < self.slo_seconds / 2)
+            if overloaded and self.index < len(FIDELITY_LEVELS) - 1 and now - self.last_change >= self.step_down_seconds:
+                self._change(+1, now)
+                self.step_downs += 1
+                latency = "n/a" if p95 is None else f"{p95:.2f} s"
+                print(f"[Fidelity] Under pressure (p95 {latency}, queue {queue_depth}); serving {FIDELITY_LEVELS[self.index]}")
+            elif relaxed and self.index > 0 and now - self.last_change >= self.cooldown_seconds:
+                self._change(-1, now)
+                self.step_ups += 1
+                print(f"[Fidelity] Pressure cleared; serving {FIDELITY_LEVELS[self.index]}")
+            return FIDELITY_LEVELS[self.index]
+
+    def _change(self, step: int, now: float) -> None:
+        self.index += step
+        self.last_change = now
+        self._latencies.clear()
+
+    def record(self, level: str, latency_seconds: Optional[float] = None) -> None:
+        """
+        Count a response served at `level`, and how long it took when it was
+        simulated (cache hits are counted but do not move the latency).
+        """
+        with self._lock:
+            self.served[level] += 1
+            if latency_seconds is not None and level == FIDELITY_LEVELS[self.index]:
+                self._latencies.append(latency_seconds)
+
+    def stats(self) -> dict:
+        with self._lock:
+            p95 = self._p95()
+            return {
+                "level": FIDELITY_LEVELS[self.index],
+                "served": dict(self.served),
+                "step_downs": self.step_downs,
+                "step_ups": self.step_ups,
+                "latency_p95_ms": round(p95 * 1e3, 1) if p95 is not None else None,
+                "queue_depth": self._queue_depth,
+                "slo_ms": round(self.slo_seconds * 1e3, 1),
+            }
+
+
+_controller: Optional[FidelityController] = None
+
+
+def get_fidelity_controller() -> FidelityController:
+    """Process-wide fidelity controller, created on first use."""
+    global _controller
+    if _controller is None:
+        _controller = FidelityController()
+    return _controller
@@ -0,0 +1,178 @@
+"""
+Asynchronous simulation jobs on a bounded in-process worker pool.
+
+A job wraps a task that takes a progress callback. The task reports runs
+completed through it after every block, and the callback raises JobCancelled
+once the job has been cancelled, which stops the engine at the next block
+boundary. Queued jobs are cancelled before they start.
+
+Bounds (no external broker involved):
+- SIMULATION_JOB_WORKERS jobs run at once; the rest wait in FIFO order
+- at most SIMULATION_JOB_MAX_PENDING jobs are queued or running; further
+  submissions raise JobQueueFull
+- finished jobs are kept for SIMULATION_JOB_RETENTION_SECONDS, and only the
+  SIMULATION_JOB_MAX_RETAINED most recent of them
+"""
+
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+
+SIMULATION_JOB_WORKERS = int(os.getenv("SIMULATION_JOB_WORKERS", "2"))
+SIMULATION_JOB_MAX_PENDING = int(os.getenv("SIMULATION_JOB_MAX_PENDING", "32"))
+SIMULATION_JOB_RETENTION_SECONDS = float(os.getenv("SIMULATION_JOB_RETENTION_SECONDS", "900"))
+SIMULATION_JOB_MAX_RETAINED = int(os.getenv("SIMULATION_JOB_MAX_RETAINED", "256"))
+
+FINISHED_STATUSES = ("succeeded", "failed", "cancelled")
+
+# A job's task: called with a progress callback taking runs completed so far
+JobTask = Callable[[Callable[[int], None]], Any]
+
+
+class JobCancelled(Exception):
+    """Raised from a cancelled job's progress callback to stop its task."""
+
+
+class JobQueueFull(Exception):
+    """Raised on submit when SIMULATION_JOB_MAX_PENDING jobs are already queued or running."""
+
+
+class SimulationJob:
+    """State of one job; updated by the worker thread, read by the API."""
+
+    def __init__(self, runs_total: int):
+        self.job_id = uuid.uuid4().hex
+        self.status = "queued"
+        self.runs_total = runs_total
+        self.runs_completed = 0
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.cancel_requested = threading.Event()
+        self.future = None
+
+    def report(self, runs_completed: int) -> None:
+        if self.cancel_requested.is_set():
+            raise JobCancelled()
+        self.runs_completed = runs_completed
+
+    def snapshot(self) -> dict:
+        done = self.status == "succeeded"
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "runs_completed": self.runs_total if done else self.runs_completed,
+            "runs_total": self.runs_total,
+            "progress": 1.0 if done else round(min(1.0, self.runs_completed / self.runs_total), 4),
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class JobManager:
+    """Submits, tracks, cancels and expires jobs."""
+
+    def __init__(
+        self,
+        max_workers: int = SIMULATION_JOB_WORKERS,
+        max_pending: int = SIMULATION_JOB_MAX_PENDING,
+        retention_seconds: float = SIMULATION_JOB_RETENTION_SECONDS,
+        max_retained: int = SIMULATION_JOB_MAX_RETAINED,
+    ):
+        self.max_pending = max_pending
+        self.retention_seconds = retention_seconds
+        self.max_retained = max_retained
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="simulation-job")
+        # job_id -> job, in submission order
+        self._jobs: "OrderedDict[str, SimulationJob]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, task: JobTask, runs_total: int) -> SimulationJob:
+        job = SimulationJob(runs_total)
+        with self._lock:
+            self._prune()
+            active = sum(1 for j in self._jobs.values() if j.status not in FINISHED_STATUSES)
+            if active >= self.max_pending:
+                raise JobQueueFull(f"{active} simulation jobs are already queued or running")
+            self._jobs[job.job_id] = job
+            job.future = self._executor.submit(self._run, job, task)
+        return job
+
+    def _run(self, job: SimulationJob, task: JobTask) -> None:
+        with self._lock:
+            if job.cancel_requested.is_set():
+                return
+            job.status = "running"
+        try:
+            result = task(job.report)
+        except JobCancelled:
+            status, result, error = "cancelled", None, None
+        except Exception as e:
+            print(f"[Jobs] Job {job.job_id} failed: {e}")
+            status, result, error = "failed", None, str(e) or type(e).__name__
+        else:
+            status, error = "succeeded", None
+        with self._lock:
+            # Status last, so a reader never sees "succeeded" without the result
+            job.result, job.error, job.finished_at = result, error, time.time()
+            job.status = status
+
+    def get(self, job_id: str) -> Optional[SimulationJob]:
+        with self._lock:
+            self._prune()
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[SimulationJob]:
+        """
+        Cancel a job: a queued job is cancelled at once, a running one stops
+        at its next progress report. Finished jobs are left as they are.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status in FINISHED_STATUSES:
+                return job
+            job.cancel_requested.set()
+            if job.status == "queued":
+                job.future.cancel()
+                job.status = "cancelled"
+                job.finished_at = time.time()
+            return job
+
+    def _prune(self) -> None:
+        """Drop finished jobs past their retention time or beyond max_retained (caller holds the lock)."""
+        cutoff = time.time() - self.retention_seconds
+        finished = [j for j in self._jobs.values() if j.status in FINISHED_STATUSES]
+        excess = len(finished) - self.max_retained
+        for index, job in enumerate(sorted(finished, key=lambda j: j.finished_at)):
+            if index < excess or job.finished_at <= cutoff:
+                del self._jobs[job.job_id]
+
+    def shutdown(self) -> None:
+        for job_id in list(self._jobs):
+            self.cancel(job_id)
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+_manager: Optional[JobManager] = None
+
+
+def get_job_manager() -> JobManager:
+    """Process-wide job manager, created on first use."""
+    global _manager
+    if _manager is None:
+        _manager = JobManager()
+    return _manager
+
+
+def shutdown_job_manager() -> None:
+    """Cancel outstanding jobs and stop the workers (called on application shutdown)."""
+    global _manager
+    if _manager is not None:
+        _manager.shutdown()
+        _manager = None
@@ -0,0 +1,182 @@
+"""
+Interchangeable backends for the per-run simulation kernel.
+
+Every backend maps a (4, N) block of standard normals and scalar kernel
+params to N completion times, with the same operations in the same order as
+completion_weeks_from_normals:
+
+- numpy: the vectorised kernel, rewritten to work in place in two buffers
+         instead of allocating temporaries for every factor
+- numba: one fused, multi-threaded (prange) loop; used only when Numba is
+         installed
+
+SIMULATION_KERNEL picks a backend by name, or "auto" (default) to time
+each available backend on one run block at startup and keep the fastest.
+Auto-selection only considers backends whose output on that block is
+bit-identical to numpy's (a libm exp may differ from NumPy's in the last
+bit), so a seed gives the same results whichever backend is picked. A
+backend named explicitly gets the same check; one that fails it, or is
+unavailable or unknown, falls back to numpy.
+"""
+
+import os
+import time
+from functools import lru_cache
+from typing import Callable, Optional
+
+import numpy as np
+
+
+KERNEL_BENCHMARK_RUNS = 65_536
+KERNEL_BENCHMARK_REPEATS = 5
+
+Kernel = Callable[[dict, np.ndarray], np.ndarray]
+
+_selected: Optional[str] = None
+
+
+def numpy_kernel(params: dict, z: np.ndarray) -> np.ndarray:
+    """Completion weeks for scalar params, computed in place in two buffers."""
+    weeks = np.multiply(z[0], params["scope_std"])
+    weeks += 1.0
+    np.clip(weeks, 0.8, 1.5, out=weeks)
+    weeks *= params["base_days"]
+
+    factor = np.multiply(z[1], params["integration_std"])
+    np.exp(factor, out=factor)
+    np.minimum(factor, 1.5, out=factor)
+    weeks *= factor
+
+    np.multiply(z[2], params["experience_std"], out=factor)
+    factor += 1.0
+    np.clip(factor, 0.7, 1.4, out=factor)
+    weeks *= factor
+
+    np.multiply(z[3], params["unexpected_std"], out=factor)
+    np.exp(factor, out=factor)
+    np.minimum(factor, 1.3, out=factor)
+    weeks *= factor
+
+    weeks /= params["team_size"]
+    weeks /= 5.0
+    return weeks
+
+
+def _build_numba_kernel() -> Optional[Kernel]:
+    """JIT-compile the fused-loop kernel, or None when Numba is not installed."""
+    try:
+        import numba
+    except ImportError:
+        return None
+
+    # The kernel is called from offload and job threads at once. Prefer OpenMP
+    # over TBB, whose pool can hang the interpreter at exit after such use;
+    # NUMBA_THREADING_LAYER / NUMBA_THREADING_LAYER_PRIORITY still override this.
+    if "NUMBA_THREADING_LAYER" not in os.environ and "NUMBA_THREADING_LAYER_PRIORITY" not in os.environ:
+        numba.config.THREADING_LAYER_PRIORITY = ["omp", "tbb", "workqueue"]
+
+    # Params and constants arrive in z's dtype, so float32 blocks are computed
+    # in float32 throughout, as NumPy does, rather than promoted to float64
+    @numba.njit(parallel=True, cache=True)
+    def fused(z, p, c):
+        n = z.shape[1]
+        weeks = np.empty(n, dtype=z.dtype)
+        for i in numba.prange(n):
+            scope_growth = min(max(c[0] + p[2] * z[0, i], c[1]), c[2])
+            integration_delay = min(np.exp(p[3] * z[1, i]), c[2])
+            experience_variance = min(max(c[0] + p[4] * z[2, i], c[3]), c[4])
+            unexpected = min(np.exp(p[5] * z[3, i]), c[5])
+            effort_days = p[0] * scope_growth * integration_delay * experience_variance * unexpected
+            weeks[i] = effort_days / p[1] / c[6]
+        return weeks
+
+    def numba_kernel(params: dict, z: np.ndarray) -> np.ndarray:
+        p = np.array([
+            params["base_days"], params["team_size"], params["scope_std"],
+            params["integration_std"], params["experience_std"], params["unexpected_std"],
+        ], dtype=z.dtype)
+        c = np.array([1.0, 0.8, 1.5, 0.7, 1.4, 1.3, 5.0], dtype=z.dtype)
+        return fused(np.ascontiguousarray(z), p, c)
+
+    return numba_kernel
+
+
+@lru_cache(maxsize=1)
+def available_kernels() -> dict[str, Kernel]:
+    """Backends that can run in this environment, by name."""
+    kernels = {"numpy": numpy_kernel}
+    numba_kernel = _build_numba_kernel()
+    if numba_kernel is not None:
+        kernels["numba"] = numba_kernel
+    return kernels
+
+
+BENCHMARK_PARAMS = {
+    "base_days": 300.0, "team_size": 5, "scope_std": 0.14, "integration_std": 0.24,
+    "experience_std": 0.16, "unexpected_std": 0.12,
+}
+
+
+def matches_numpy(kernel: Kernel, z: np.ndarray) -> bool:
+    """Whether the kernel's output on z, in float64 and in float32, is bit-identical to the numpy backend's."""
+    for block in (z, z.astype(np.float32)):
+        result, reference = kernel(BENCHMARK_PARAMS, block), numpy_kernel(BENCHMARK_PARAMS, block)
+        if result.dtype != reference.dtype or not np.array_equal(result, reference):
+            return False
+    return True
+
+
+def benchmark_kernels(kernels: dict[str, Kernel], runs: int = KERNEL_BENCHMARK_RUNS) -> dict[str, float]:
+    """
+    Best-of-N seconds per kernel on one block of runs, after a warm-up call
+    that triggers any JIT compilation. Kernels whose output differs from the
+    numpy backend's, in float64 or float32, are left out.
+    """
+    z = np.random.default_rng(0).standard_normal((4, runs))
+    timings = {}
+    for name, kernel in kernels.items():
+        if not matches_numpy(kernel, z):
+            print(f"[Kernel] {name} results differ from numpy, skipping it")
+            continue
+        best = float("inf")
+        for _ in range(KERNEL_BENCHMARK_REPEATS):
+            start = time.perf_counter()
+            kernel(BENCHMARK_PARAMS, z)
+            best = min(best, time.perf_counter() - start)
+        timings[name] = best
+    return timings
+
+
+def select_kernel(preference: Optional[str] = None) -> str:
+    """
+    Choose the kernel backend for this process and return its name.
+    preference defaults to SIMULATION_KERNEL ("auto").
+    """
+    global _selected
+    preference = (preference or os.getenv("SIMULATION_KERNEL", "auto")).lower()
+    kernels = available_kernels()
+
+    if preference == "auto":
+        timings = benchmark_kernels(kernels) if len(kernels) > 1 else {"numpy": 0.0}
+        _selected = min(timings, key=timings.get)
+        if len(timings) > 1:
+            summary = ", ".join(f"{name} {seconds * 1e3:.2f} ms" for name, seconds in timings.items())
+            print(f"[Kernel] Selected {_selected} ({summary})")
+    elif preference in kernels:
+        _selected = preference
+        if not matches_numpy(kernels[preference], np.random.default_rng(0).standard_normal((4, KERNEL_BENCHMARK_RUNS))):
+            print(f"[Kernel] Backend {preference!r} results differ from numpy, using numpy")
+            _selected = "numpy"
+    else:
+        print(f"[Kernel] Backend {preference!r} unavailable, using numpy")
+        _selected = "numpy"
+    return _selected
+
+
+def selected_kernel_name() -> str:
+    return _selected or select_kernel()
+
+
+def get_kernel() -> Kernel:
+    """The kernel chosen for this process, selecting one on first use."""
+    return available_kernels()[selected_kernel_name()]
@@ -2,96 +2,533 @@
 Monte Carlo simulation engine for project completion estimates.
 """
 
+import os
+import time
+from typing import Callable, Optional
+
 import numpy as np
+from core.kernels import get_kernel
+from core.sampling import CorrelationMatrix, SamplingMethod, standard_normals
+from core.sketch import QuantileSketch
 from models.schemas import SimulationRequest, HistogramBucket
 
 
-def run_monte_carlo(request: SimulationRequest, base_effort: dict) -> dict:
+# Number of independent perturbation factors drawn per run:
+# scope growth, integration delay, experience variance, unexpected delay.
+N_FACTORS = 4
+
+# Runs are drawn in fixed-size blocks, each from its own child RNG stream.
+# The block layout depends only on num_simulations, so a seeded run produces
+# bit-identical samples however the blocks are later split across workers.
+BLOCK_SIZE = 65_536
+
+# From this many runs on, results are aggregated in streaming mode: percentiles
+# come from a QuantileSketch and completion_samples are not materialised.
+STREAMING_MIN_SIMULATIONS = int(os.getenv("STREAMING_MIN_SIMULATIONS", "1000000"))
+
+# Adaptive mode draws small blocks and re-checks convergence on a geometric
+# schedule, so the checks cost a constant factor of the sampling work.
+ADAPTIVE_BLOCK_SIZE = 1000
+ADAPTIVE_MIN_RUNS = 2000
+ADAPTIVE_CHECK_GROWTH = 1.25
+
+# Two-sided 95% normal quantile for confidence intervals
+CONFIDENCE_Z = 1.96
+
+# Points in the downsampled on-time probability (CDF) curve
+CDF_POINTS = 60
+
+# Progress fan chart: percentile bands, and the most weekly points returned
+FAN_PERCENTILES = (5, 10, 25, 50, 75, 90, 95)
+FAN_MAX_POINTS = 105
+
+
+def root_seed_sequence(seed: Optional[int] = None) -> np.random.SeedSequence:
+    """Root of the RNG tree for one simulation; fresh OS entropy when seed is None."""
+    return np.random.SeedSequence(seed)
+
+
+def block_layout(n_simulations: int) -> list[int]:
+    """Sizes of the consecutive run blocks that make up a simulation."""
+    full, remainder = divmod(n_simulations, BLOCK_SIZE)
+    return [BLOCK_SIZE] * full + ([remainder] if remainder else [])
+
+
+def block_generator(root: np.random.SeedSequence, block_index: int) -> np.random.Generator:
+    """
+    PCG64 generator for one run block.
+    Equivalent to root.spawn(n)[block_index], but stateless, so any worker can
+    rebuild the stream for a block from the root entropy and the block index.
+    """
+    child = np.random.SeedSequence(root.entropy, spawn_key=root.spawn_key + (block_index,))
+    return np.random.Generator(np.random.PCG64(child))
+
+
+def draw_block_normals(
+    root: np.random.SeedSequence,
+    block_index: int,
+    size: int,
+    sampling: SamplingMethod = "random",
+    correlation: Optional[CorrelationMatrix] = None,
+    dtype: np.dtype = np.float64,
+) -> np.ndarray:
+    """Standard normal draws of shape (4, size) for one run block."""
+    return standard_normals(block_generator(root, block_index), N_FACTORS, size, sampling, correlation, dtype)
+
+
+def draw_normals(
+    root: np.random.SeedSequence,
+    n_simulations: int,
+    sampling: SamplingMethod = "random",
+    correlation: Optional[CorrelationMatrix] = None,
+    dtype: np.dtype = np.float64,
+) -> np.ndarray:
+    """Standard normal draws of shape (4, N), filled block by block."""
+    z = np.empty((N_FACTORS, n_simulations), dtype=dtype)
+    start = 0
+    for block_index, size in enumerate(block_layout(n_simulations)):
+        z[:, start:start + size] = draw_block_normals(root, block_index, size, sampling, correlation, dtype)
+        start += size
+    return z
+
+
+def kernel_params(request: SimulationRequest, base_effort: dict) -> dict:
+    """
+    Resolve the per-project constants of the simulation kernel.
+    A factor that does not apply to the project gets a zero spread, which
+    makes it a constant 1.0 multiplier.
+    """
+    total_team = base_effort["total_team_size"]
+
+    # Junior-heavy teams have higher experience variance
+    experience_std = 0.0
+    if total_team > 0:
+        junior_ratio = request.team_junior / total_team
+        experience_std = 0.1 + (junior_ratio * 0.15)
+
+    return {
+        "base_days": base_effort["base_effort_days"],
+        "team_size": max(1, total_team),
+        "scope_std": 0.15 * base_effort["scope_volatility_factor"] + 0.05,
+        "integration_std": 0.08 * request.integrations,
+        "experience_std": experience_std,
+        "unexpected_std": 0.12,
+    }
+
+
+def completion_weeks_from_normals(params: dict, z: np.ndarray) -> np.ndarray:
+    """
+    Map standard normal draws of shape (4, ..., N) to completion times in weeks.
+
+    Every factor is an affine or exponential transform of one standard normal,
+    so normal(1, s) == 1 + s * z and lognormal(0, s) == exp(s * z).
+    Params may be scalars or arrays that broadcast against z[0].
+    """
+    # 1. Scope growth: normal centered at 1.0, std based on volatility
+    scope_growth = np.clip(1.0 + params["scope_std"] * z[0], 0.8, 1.5)
+
+    # 2. Integration delays: lognormal for occasional large delays
+    integration_delay = np.minimum(1.5, np.exp(params["integration_std"] * z[1]))
+
+    # 3. Experience variance: junior teams have higher variance
+    experience_variance = np.clip(1.0 + params["experience_std"] * z[2], 0.7, 1.4)
+
+    # 4. Random unexpected delays (bugs, miscommunication, etc.)
+    unexpected = np.minimum(1.3, np.exp(params["unexpected_std"] * z[3]))
+
+    # Total dev-days effort per run, converted to calendar days by dividing by
+    # team size, then to weeks (5 work days per week)
+    effort_days = params["base_days"] * scope_growth * integration_delay * experience_variance * unexpected
+    return effort_days / params["team_size"] / 5.0
+
+
+class SimulationAccumulator:
+    """
+    Mergeable running aggregate of simulated completion times.
+
+    Keeps exact on-time/overrun counters and per-week counts. Percentiles
+    come either from the raw sample blocks (exact) or, in streaming mode
+    (keep_samples=False), from a constant-size QuantileSketch, so memory no
+    longer grows with the number of runs. Folding the same blocks in the same
+    order gives bit-identical results, whether they were added directly or
+    merged in from per-block accumulators built elsewhere.
+    """
+
+    def __init__(self, deadline_weeks: float, keep_samples: bool = True):
+        self.deadline_weeks = deadline_weeks
+        self.keep_samples = keep_samples
+        self.n = 0
+        self.on_time_count = 0
+        self.late_count = 0
+        self.overrun_weeks_sum = 0.0
+        self.min_weeks = np.inf
+        self.max_weeks = -np.inf
+        # week_counts[i] counts runs finishing in week (week_offset + i)
+        self.week_offset = 0
+        self.week_counts = np.zeros(0, dtype=np.int64)
+        self.sample_blocks: list[np.ndarray] = []
+        self.sketch = None if keep_samples else QuantileSketch()
+        self._sorted_samples: Optional[np.ndarray] = None
+
+    def add(self, completion_weeks: np.ndarray) -> None:
+        """Fold one batch of completion times into the aggregate."""
+        if len(completion_weeks) == 0:
+            return
+        late = completion_weeks > self.deadline_weeks
+        late_count = int(np.count_nonzero(late))
+
+        self.n += len(completion_weeks)
+        self.late_count += late_count
+        self.on_time_count += len(completion_weeks) - late_count
+        self.overrun_weeks_sum += float(np.sum(completion_weeks[late] - self.deadline_weeks))
+        self.min_weeks = min(self.min_weeks, float(np.min(completion_weeks)))
+        self.max_weeks = max(self.max_weeks, float(np.max(completion_weeks)))
+
+        weeks = completion_weeks.astype(np.int64)
+        offset = int(weeks.min())
+        self._add_week_counts(offset, np.bincount(weeks - offset))
+        if self.keep_samples:
+            self.sample_blocks.append(completion_weeks)
+        else:
+            self.sketch.add(completion_weeks)
+
+    def merge(self, other: "SimulationAccumulator") -> None:
+        """Fold another accumulator (e.g. from a worker process) into this one."""
+        if other.n == 0:
+            return
+        self.n += other.n
+        self.late_count += other.late_count
+        self.on_time_count += other.on_time_count
+        self.overrun_weeks_sum += other.overrun_weeks_sum
+        self.min_weeks = min(self.min_weeks, other.min_weeks)
+        self.max_weeks = max(self.max_weeks, other.max_weeks)
+        self._add_week_counts(other.week_offset, other.week_counts)
+        if self.keep_samples:
+            self.sample_blocks.extend(other.sample_blocks)
+        else:
+            self.sketch.merge(other.sketch)
+
+    def _add_week_counts(self, offset: int, counts: np.ndarray) -> None:
+        if len(self.week_counts) == 0:
+            self.week_offset, self.week_counts = offset, counts.astype(np.int64)
+            return
+        lo = min(self.week_offset, offset)
+        hi = max(self.week_offset + len(self.week_counts), offset + len(counts))
+        merged = np.zeros(hi - lo, dtype=np.int64)
+        merged[self.week_offset - lo:self.week_offset - lo + len(self.week_counts)] += self.week_counts
+        merged[offset - lo:offset - lo + len(counts)] += counts
+        self.week_offset, self.week_counts = lo, merged
+
+    def samples(self) -> np.ndarray:
+        """All folded completion times, in the order they were added."""
+        if not self.keep_samples:
+            raise ValueError("Samples are not kept in streaming mode")
+        if len(self.sample_blocks) != 1:
+            self.sample_blocks = [np.concatenate(self.sample_blocks)]
+        return self.sample_blocks[0]
+
+    def quantiles(self, qs) -> np.ndarray:
+        """Completion-time quantiles for qs in [0, 1]."""
+        if self.keep_samples:
+            return np.quantile(self.samples(), qs)
+        return self.sketch.quantiles(qs)
+
+    def sorted_samples(self) -> np.ndarray:
+        """Folded completion times in ascending order, sorted once and reused."""
+        if self._sorted_samples is None or len(self._sorted_samples) != self.n:
+            self._sorted_samples = np.sort(self.samples())
+        return self._sorted_samples
+
+    def deadline_probabilities(self, deadlines) -> np.ndarray:
+        """P(completion <= d) for each deadline d, in weeks."""
+        deadlines = np.asarray(deadlines, dtype=float)
+        if self.keep_samples:
+            return np.searchsorted(self.sorted_samples(), deadlines, side="right") / self.n
+        return self.sketch.cdf(deadlines)
+
+    def summary(self) -> dict:
+        """
+        Percentiles, on-time probability, expected overrun and a weekly
+        histogram over everything folded in so far.
+        """
+        # Calculate statistics
+        p50_weeks, p90_weeks = self.quantiles([0.5, 0.9])
+
+        # On-time probability
+        on_time_probability = self.on_time_count / self.n
+
+        # Expected overrun (only for late runs)
+        if self.late_count > 0:
+            expected_overrun_days = self.overrun_weeks_sum / self.late_count * 5
+        else:
+            expected_overrun_days = 0.0
+
+        # Build histogram (buckets by week), with one empty bucket either side
+        min_week = max(0, int(self.min_weeks) - 1)
+        max_week = int(self.max_weeks) + 2
+
+        histogram = []
+        for week in range(min_week, max_week):
+            index = week - self.week_offset
+            count = self.week_counts[index] if 0 <= index < len(self.week_counts) else 0
+            histogram.append(HistogramBucket(
+                bucket_center_weeks=round(week + 0.5, 1),
+                count=int(count)
+            ))
+
+        return {
+            "p50_weeks": round(float(p50_weeks), 1),
+            "p90_weeks": round(float(p90_weeks), 1),
+            "on_time_probability": round(on_time_probability, 3),
+            "expected_overrun_days": round(expected_overrun_days, 1),
+            "histogram": histogram,
+        }
+
+
+def add_deadline_curve(results: dict, accumulator: SimulationAccumulator, request: SimulationRequest) -> dict:
+    """
+    Attach the on-time probability curve when the request asks for it:
+    "cdf" is P(finish <= week) on an evenly spaced grid of CDF_POINTS weeks
+    spanning the simulated range, and "deadline_probabilities" answers each
+    of request.cdf_deadlines. Both come from one sort of the samples.
+    """
+    if request.include_cdf:
+        grid = np.linspace(accumulator.min_weeks, accumulator.max_weeks, CDF_POINTS)
+        results["cdf"] = [
+            {"weeks": round(float(week), 2), "probability": round(float(p), 4)}
+            for week, p in zip(grid, accumulator.deadline_probabilities(grid))
+        ]
+    if request.cdf_deadlines:
+        probabilities = accumulator.deadline_probabilities(request.cdf_deadlines)
+        results["deadline_probabilities"] = [
+            {"weeks": float(week), "probability": round(float(p), 4)}
+            for week, p in zip(request.cdf_deadlines, probabilities)
+        ]
+    return results
+
+
+def progress_s_curve(fraction: np.ndarray) -> np.ndarray:
+    """Share of work done at a given share of a run's duration (slow start, fast middle, slow finish)."""
+    fraction = np.clip(fraction, 0.0, 1.0)
+    return fraction * fraction * (3.0 - 2.0 * fraction)
+
+
+def fan_chart_bands(accumulator: SimulationAccumulator) -> list[dict]:
+    """
+    Percentile bands of % work complete per week, across all runs.
+
+    Run i progresses along an S-curve that reaches 100% at its completion
+    time T_i, so progress at week t is S(t / T_i). That is decreasing in T_i,
+    which means the q-th percentile of progress at every week is S(t / T)
+    at the (1 - q)-th percentile of T. The bands therefore come straight from
+    completion-time quantiles: exact, the same size for any num_simulations,
+    and available in streaming mode too.
+    """
+    completion_quantiles = accumulator.quantiles([1 - p / 100 for p in FAN_PERCENTILES])
+    horizon = int(np.ceil(completion_quantiles[0])) + 1
+    step = max(1, int(np.ceil(horizon / (FAN_MAX_POINTS - 1))))
+    weeks = np.arange(0, horizon + step, step, dtype=float)
+
+    progress = 100.0 * progress_s_curve(weeks[:, None] / completion_quantiles[None, :])
+    return [
+        {"week": int(week), **{f"p{p}": round(float(v), 1) for p, v in zip(FAN_PERCENTILES, row)}}
+        for week, row in zip(weeks, progress)
+    ]
+
+
+def add_optional_outputs(results: dict, accumulator: SimulationAccumulator, request: SimulationRequest) -> dict:
+    """Attach the extra views of the distribution that the request asked for."""
+    add_deadline_curve(results, accumulator, request)
+    if request.include_fan_bands:
+        results["fan_bands"] = fan_chart_bands(accumulator)
+    return results
+
+
+def summarize_completion_weeks(completion_weeks: np.ndarray, request: SimulationRequest) -> dict:
+    """
+    Aggregate simulated completion times into percentiles, on-time probability,
+    expected overrun and a weekly histogram.
+    """
+    accumulator = SimulationAccumulator(request.deadline_weeks)
+    accumulator.add(completion_weeks)
+    results = add_optional_outputs(accumulator.summary(), accumulator, request)
+    # Accounted as the equivalent standalone run, so batch and scenario results match /simulate
+    results["peak_memory_mb"] = peak_memory_mb(request, accumulator.n, BLOCK_SIZE, keep_samples=True)
+    return results
+
+
+def peak_memory_mb(request: SimulationRequest, n_runs: int, block_size: int, keep_samples: bool) -> float:
+    """
+    Accounted peak size of the simulation's arrays, in MiB: the working set
+    of one block (draws, kernel buffers, week indices and late mask) plus
+    either the retained samples or the quantile sketch.
+    With samples kept, the peak is reached while they are concatenated or
+    partitioned for percentiles, with one more copy when the CDF needs them sorted.
+    """
+    itemsize = np.dtype(request.precision).itemsize
+    block = min(block_size, n_runs)
+    working = block * ((N_FACTORS + 2) * itemsize + np.dtype(np.int64).itemsize + 1)
+    if not keep_samples:
+        total = working + QuantileSketch().max_buckets * np.dtype(np.int64).itemsize
+    else:
+        samples = n_runs * itemsize
+        copies = 3 if request.include_cdf or request.cdf_deadlines else 2
+        total = max(samples + working, copies * samples)
+    return round(total / 2 ** 20, 2)
+
+
+def simulate_block(
+    params: dict,
+    root: np.random.SeedSequence,
+    block_index: int,
+    size: int,
+    sampling: SamplingMethod = "random",
+    correlation: Optional[CorrelationMatrix] = None,
+    dtype: np.dtype = np.float64,
+) -> np.ndarray:
+    """
+    Completion times in weeks for one run block, drawn from that block's own
+    stream and mapped by the selected kernel backend.
+    """
+    return get_kernel()(params, draw_block_normals(root, block_index, size, sampling, correlation, dtype))
+
+
+# Called with the running accumulator after each block of runs
+ProgressCallback = Callable[[SimulationAccumulator], None]
+
+
+def use_streaming(request: SimulationRequest) -> bool:
+    return request.num_simulations >= STREAMING_MIN_SIMULATIONS
+
+
+def run_monte_carlo(
+    request: SimulationRequest,
+    base_effort: dict,
+    streaming: Optional[bool] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> dict:
     """
     Run N Monte Carlo simulations and return aggregated results.
     Returns dict with p50_weeks, p90_weeks, on_time_probability, histogram, etc.
+
+    Each block of runs is drawn in one vectorized call: a (4, block) matrix of
+    standard normals is mapped through each factor's distribution and clamps.
+    Draws come from seeded PCG64 streams, so the same request.seed always
+    reproduces the same results. With request.precision == "float32" draws,
+    kernel and retained samples are all float32, halving memory traffic.
+
+    In streaming mode (default from STREAMING_MIN_SIMULATIONS runs) only one
+    block is held in memory at a time and completion_samples is omitted.
+
+    progress, if given, is called with the accumulator after every block;
+    an exception raised from it stops the run.
     """
-    n_simulations = request.num_simulations
-    base_days = base_effort["base_effort_days"]
-    scope_volatility = base_effort["scope_volatility_factor"]
-    team_size = max(1, base_effort["total_team_size"])
-
-    # Initialize results array
-    completion_days = np.zeros(n_simulations)
-    
-    for i in range(n_simulations):
-        # Sample perturbations from distributions
-        
-        # 1. Scope growth: normal distribution centered at 1.0, std based on volatility
-        scope_growth = np.random.normal(1.0, 0.15 * scope_volatility + 0.05)
-        scope_growth = max(0.8, min(1.5, scope_growth))
-        
-        # 2. Integration delays: lognormal for occasional large delays
-        integration_delay_factor = 1.0
-        if request.integrations > 0:
-            # Lognormal: mean near 1.0, with right-skew for rare big delays
-            mean_log = 0.0
-            std_log = 0.08 * request.integrations
-            integration_delay_factor = np.random.lognormal(mean_log, std_log)
-            integration_delay_factor = min(1.5, integration_delay_factor)
-        
-        # 3. Experience variance: junior teams have higher variance
-        experience_variance = 1.0
-        if base_effort["total_team_size"] > 0:
-            junior_ratio = request.team_junior / base_effort["total_team_size"]
-            variance_std = 0.1 + (junior_ratio * 0.15)
-            experience_variance = np.random.normal(1.0, variance_std)
-            experience_variance = max(0.7, min(1.4, experience_variance))
-        
-        # 4. Random unexpected delays (bugs, miscommunication, etc.)
-        # Lognormal centered near 1.0 with occasional spikes
-        unexpected_factor = np.random.lognormal(0.0, 0.12)
-        unexpected_factor = min(1.3, unexpected_factor)
-        
-        # Compute this run's total dev-days effort, then convert to calendar days
-        # by dividing by team_size (how many people work in parallel).
-        effort_days = base_days * scope_growth * integration_delay_factor * experience_variance * unexpected_factor
-        calendar_days = effort_days / team_size
-        completion_days[i] = calendar_days
-
-    
-    # Convert days to weeks (5 work days per week)
-    completion_weeks = completion_days / 5.0
-    
-    # Calculate statistics
-    p50_weeks = float(np.percentile(completion_weeks, 50))
-    p90_weeks = float(np.percentile(completion_weeks, 90))
-    
-    # On-time probability
-    deadline_weeks = request.deadline_weeks
-    on_time_count = np.sum(completion_weeks <= deadline_weeks)
-    on_time_probability = float(on_time_count / n_simulations)
-    
-    # Expected overrun (only for late runs)
-    late_runs = completion_weeks[completion_weeks > deadline_weeks]
-    if len(late_runs) > 0:
-        expected_overrun_days = float(np.mean(late_runs - deadline_weeks) * 5)
-    else:
-        expected_overrun_days = 0.0
-    
-    # Build histogram (buckets by week)
-    min_week = max(0, int(np.min(completion_weeks)) - 1)
-    max_week = int(np.max(completion_weeks)) + 2
-    hist, bin_edges = np.histogram(completion_weeks, bins=range(min_week, max_week + 1))
-    
-    histogram = []
-    for i in range(len(hist)):
-        bucket_center = (bin_edges[i] + bin_edges[i + 1]) / 2.0
-        histogram.append(HistogramBucket(
-            bucket_center_weeks=round(bucket_center, 1),
-            count=int(hist[i])
+    if streaming is None:
+        streaming = use_streaming(request)
+    params = kernel_params(request, base_effort)
+    root = root_seed_sequence(request.seed)
+
+    accumulator = SimulationAccumulator(request.deadline_weeks, keep_samples=not streaming)
+    for block_index, size in enumerate(block_layout(request.num_simulations)):
+        accumulator.add(simulate_block(
+            params, root, block_index, size, request.sampling, request.correlation, request.precision
         ))
-    
+        if progress is not None:
+            progress(accumulator)
+
+    results = add_optional_outputs(accumulator.summary(), accumulator, request)
+    results["peak_memory_mb"] = peak_memory_mb(request, accumulator.n, BLOCK_SIZE, not streaming)
+    if not streaming:
+        results["completion_samples"] = accumulator.samples()
+    return results
+
+
+def confidence_half_widths(accumulator: SimulationAccumulator, z: float = CONFIDENCE_Z) -> dict:
+    """
+    Half-widths of the confidence intervals on P50, P90 and on-time probability.
+
+    Percentile intervals are distribution-free: the order statistics at
+    ranks n*p -/+ z*sqrt(n*p*(1-p)). The on-time interval is Agresti-Coull,
+    which stays honest when the probability is at or near 0 or 1.
+    """
+    n = accumulator.n
+    bounds = []
+    for p in (0.5, 0.9):
+        spread = z * np.sqrt(p * (1 - p) / n)
+        bounds.extend([max(0.0, p - spread), min(1.0, p + spread)])
+    p50_lo, p50_hi, p90_lo, p90_hi = accumulator.quantiles(bounds)
+
+    n_adjusted = n + z ** 2
+    p_adjusted = (accumulator.on_time_count + z ** 2 / 2) / n_adjusted
+    on_time_half_width = z * np.sqrt(p_adjusted * (1 - p_adjusted) / n_adjusted)
+
     return {
-        "p50_weeks": round(p50_weeks, 1),
-        "p90_weeks": round(p90_weeks, 1),
-        "on_time_probability": round(on_time_probability, 3),
-        "expected_overrun_days": round(expected_overrun_days, 1),
-        "histogram": histogram,
-        "completion_samples": completion_weeks.tolist(),
+        "p50_weeks": float(p50_hi - p50_lo) / 2,
+        "p90_weeks": float(p90_hi - p90_lo) / 2,
+        "on_time_probability": float(on_time_half_width),
+    }
+
+
+def run_monte_carlo_adaptive(
+    request: SimulationRequest,
+    base_effort: dict,
+    tolerance_weeks: float = 0.1,
+    tolerance_probability: float = 0.01,
+    max_seconds: Optional[float] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> dict:
+    """
+    Run Monte Carlo batches until the 95% confidence intervals on P50 and P90
+    (in weeks) and on-time probability are within the requested half-widths,
+    request.num_simulations runs have been used, or max_seconds has elapsed.
+
+    Returns the run_monte_carlo aggregates plus runs_used and precision (the
+    achieved half-widths and whether they met the tolerances). Seeded runs are
+    reproducible, but draw from a finer block layout than run_monte_carlo.
+    progress works as in run_monte_carlo.
+    """
+    params = kernel_params(request, base_effort)
+    root = root_seed_sequence(request.seed)
+    max_runs = request.num_simulations
+    deadline = None if max_seconds is None else time.perf_counter() + max_seconds
+    keep_samples = not use_streaming(request)
+
+    accumulator = SimulationAccumulator(request.deadline_weeks, keep_samples=keep_samples)
+    block_index = 0
+    next_check = ADAPTIVE_MIN_RUNS
+    while True:
+        size = min(ADAPTIVE_BLOCK_SIZE, max_runs - accumulator.n)
+        accumulator.add(simulate_block(
+            params, root, block_index, size, request.sampling, request.correlation, request.precision
+        ))
+        block_index += 1
+        if progress is not None:
+            progress(accumulator)
+
+        out_of_budget = accumulator.n >= max_runs or (deadline is not None and time.perf_counter() >= deadline)
+        if accumulator.n < next_check and not out_of_budget:
+            continue
+
+        precision = confidence_half_widths(accumulator)
+        converged = (
+            precision["p50_weeks"] <= tolerance_weeks
+            and precision["p90_weeks"] <= tolerance_weeks
+            and precision["on_time_probability"] <= tolerance_probability
+        )
+        if converged or out_of_budget:
+            break
+        next_check = int(accumulator.n * ADAPTIVE_CHECK_GROWTH)
+
+    results = add_optional_outputs(accumulator.summary(), accumulator, request)
+    results["peak_memory_mb"] = peak_memory_mb(request, accumulator.n, ADAPTIVE_BLOCK_SIZE, keep_samples)
+    if keep_samples:
+        results["completion_samples"] = accumulator.samples()
+    results["runs_used"] = accumulator.n
+    results["precision"] = {
+        "p50_weeks": round(precision["p50_weeks"], 3),
+        "p90_weeks": round(precision["p90_weeks"], 3),
+        "on_time_probability": round(precision["on_time_probability"], 4),
+        "confidence_level": 0.95,
+        "converged": converged,
     }
+    return results
@@ -0,0 +1,119 @@
+"""
+Bounded thread pool for CPU-bound engine work called from async routes.
+
+Routes await run_cpu_bound(fn, ...) instead of calling the engine directly,
+so a long simulation no longer stalls the event loop (and with it /health and
+every other in-flight request on the worker). Threads rather than processes:
+the array kernels that dominate a run release the GIL, the result cache and
+session store stay shared in-process, and requests and results need no
+pickling. Very large runs still fan out to the process pool in core.parallel.
+
+SIMULATION_OFFLOAD_WORKERS sets the pool size (0 runs work inline on the
+event loop, as before). Work beyond that waits in FIFO order; the queue depth
+and how long work waited for a thread are reported by stats().
+"""
+
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+import numpy as np
+
+
+SIMULATION_OFFLOAD_WORKERS = int(os.getenv("SIMULATION_OFFLOAD_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+# Number of most recent waits the wait-time statistics are computed over
+OFFLOAD_WAIT_WINDOW = 1024
+
+T = TypeVar("T")
+
+
+class OffloadExecutor:
+    """Thread pool with queue-depth and wait-time accounting."""
+
+    def __init__(self, max_workers: int = SIMULATION_OFFLOAD_WORKERS):
+        self.max_workers = max(0, max_workers)
+        self._executor = (
+            ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="simulation-offload")
+            if self.max_workers else None
+        )
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self._waits: deque = deque(maxlen=OFFLOAD_WAIT_WINDOW)
+        self._lock = threading.Lock()
+
+    async def run(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        """Run fn(*args, **kwargs) on the pool and wait for it without blocking the loop."""
+        submitted = time.perf_counter()
+        with self._lock:
+            self.queued += 1
+
+        def call():
+            with self._lock:
+                self.queued -= 1
+                self.running += 1
+                self._waits.append(time.perf_counter() - submitted)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self.running -= 1
+                    self.completed += 1
+
+        if self._executor is None:
+            return call()
+        future = self._executor.submit(call)
+        future.add_done_callback(self._forget_cancelled)
+        return await asyncio.wrap_future(future)
+
+    def _forget_cancelled(self, future) -> None:
+        # Work cancelled before it started never ran call(), so never left the queue
+        if future.cancelled():
+            with self._lock:
+                self.queued -= 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            waits_ms = np.array(self._waits) * 1e3
+            return {
+                "workers": self.max_workers,
+                "queued": self.queued,
+                "running": self.running,
+                "completed": self.completed,
+                "wait_ms_mean": round(float(waits_ms.mean()), 3) if len(waits_ms) else 0.0,
+                "wait_ms_p99": round(float(np.percentile(waits_ms, 99)), 3) if len(waits_ms) else 0.0,
+                "wait_ms_max": round(float(waits_ms.max()), 3) if len(waits_ms) else 0.0,
+            }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+_offload: Optional[OffloadExecutor] = None
+
+
+def get_offload_executor() -> OffloadExecutor:
+    """Process-wide offload pool, created on first use."""
+    global _offload
+    if _offload is None:
+        _offload = OffloadExecutor()
+    return _offload
+
+
+def shutdown_offload_executor() -> None:
+    """Stop the offload threads (called on application shutdown)."""
+    global _offload
+    if _offload is not None:
+        _offload.shutdown()
+        _offload = None
+
+
+async def run_cpu_bound(fn: Callable[..., T], *args, **kwargs) -> T:
+    """Await fn(*args, **kwargs) on the process-wide offload pool."""
+    return await get_offload_executor().run(fn, *args, **kwargs)
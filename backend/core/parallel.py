@@ -0,0 +1,150 @@
+"""
+Process-pool execution of very large Monte Carlo runs.
+
+The run is cut into the same fixed-size blocks the serial engine uses, and
+each worker rebuilds a block's RNG stream from the root seed entropy and the
+block index. Workers send back one compact streaming SimulationAccumulator
+per block (counters plus a fixed-size quantile sketch, never the block's
+samples), which the parent folds in block order, so the merged result is
+bit-identical to run_monte_carlo in streaming mode for the same seed. Below
+STREAMING_MIN_SIMULATIONS that differs from the exact serial result only
+within the sketch's error, which is below the API's rounding.
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import numpy as np
+
+from core.kernels import select_kernel, selected_kernel_name
+from core.monte_carlo import (
+    BLOCK_SIZE,
+    ProgressCallback,
+    SimulationAccumulator,
+    add_optional_outputs,
+    block_layout,
+    kernel_params,
+    peak_memory_mb,
+    root_seed_sequence,
+    simulate_block,
+)
+from core.sampling import CorrelationMatrix
+from models.schemas import SimulationRequest
+
+
+# Below this many runs the pool's dispatch overhead outweighs the speed-up
+PARALLEL_MIN_SIMULATIONS = int(os.getenv("PARALLEL_MIN_SIMULATIONS", "500000"))
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def worker_count() -> int:
+    """Number of simulation worker processes (SIMULATION_WORKERS, default: all cores)."""
+    return max(1, int(os.getenv("SIMULATION_WORKERS", str(os.cpu_count() or 1))))
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """
+    Persistent process pool, created on first use and reused across requests.
+
+    First use is usually on an offload thread while the event loop and other
+    threads run, so workers are started by a forkserver rather than forked
+    from this (multi-threaded) process, where a lock held by another thread
+    could deadlock the child.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # Workers use the parent's kernel backend instead of re-benchmarking
+            _executor = ProcessPoolExecutor(
+                max_workers=worker_count(),
+                mp_context=multiprocessing.get_context("forkserver"),
+                initializer=select_kernel,
+                initargs=(selected_kernel_name(),),
+            )
+        return _executor
+
+
+def shutdown_executor() -> None:
+    """Stop the worker processes (called on application shutdown)."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True, cancel_futures=True)
+            _executor = None
+
+
+def should_run_parallel(request: SimulationRequest) -> bool:
+    return worker_count() > 1 and request.num_simulations >= PARALLEL_MIN_SIMULATIONS
+
+
+def _simulate_chunk(
+    params: dict,
+    deadline_weeks: float,
+    entropy: int,
+    spawn_key: tuple,
+    blocks: list[tuple[int, int]],
+    sampling: str,
+    correlation: Optional[CorrelationMatrix] = None,
+    dtype: str = "float64",
+) -> list[SimulationAccumulator]:
+    """Worker task: simulate a run of (block_index, size) blocks, one accumulator per block."""
+    root = np.random.SeedSequence(entropy, spawn_key=spawn_key)
+    partials = []
+    for block_index, size in blocks:
+        partial = SimulationAccumulator(deadline_weeks, keep_samples=False)
+        partial.add(simulate_block(params, root, block_index, size, sampling, correlation, dtype))
+        partials.append(partial)
+    return partials
+
+
+def run_monte_carlo_parallel(
+    request: SimulationRequest,
+    base_effort: dict,
+    executor: Optional[ProcessPoolExecutor] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> dict:
+    """
+    Run a Monte Carlo simulation across the process pool.
+    Returns the same aggregates as run_monte_carlo in streaming mode (so
+    without completion_samples).
+    progress is called after each chunk is folded in; if it raises, chunks
+    not yet started are cancelled.
+    """
+    executor = executor or get_executor()
+    params = kernel_params(request, base_effort)
+    root = root_seed_sequence(request.seed)
+
+    blocks = list(enumerate(block_layout(request.num_simulations)))
+    # A couple of contiguous chunks per worker keeps every core busy until the end
+    n_chunks = min(len(blocks), 2 * worker_count())
+    bounds = np.linspace(0, len(blocks), n_chunks + 1).astype(int)
+    chunks = [blocks[lo:hi] for lo, hi in zip(bounds[:-1], bounds[1:])]
+
+    futures = [
+        executor.submit(
+            _simulate_chunk, params, request.deadline_weeks, root.entropy, root.spawn_key,
+            chunk, request.sampling, request.correlation, request.precision,
+        )
+        for chunk in chunks
+    ]
+    # Fold in block order so floating-point sums match the serial engine
+    accumulator = SimulationAccumulator(request.deadline_weeks, keep_samples=False)
+    try:
+        for future in futures:
+            for partial in future.result():
+                accumulator.merge(partial)
+            if progress is not None:
+                progress(accumulator)
+    except BaseException:
+        for future in futures:
+            future.cancel()
+        raise
+    results = add_optional_outputs(accumulator.summary(), accumulator, request)
+    # Accounted for this process; each worker holds one more block working set
+    results["peak_memory_mb"] = peak_memory_mb(request, accumulator.n, BLOCK_SIZE, keep_samples=False)
+    return results
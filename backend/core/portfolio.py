@@ -0,0 +1,201 @@
+"""
+Portfolio Monte Carlo: concurrent projects drawing on one shared staff pool.
+
+Each project asks for its own team (team_junior/mid/senior). When the pool
+cannot cover everyone, every project is staffed with the same fraction of its
+requested team, set by the scarcest role, so teams keep their mix and a
+project at fraction s progresses at s times its standalone pace.
+
+Because all active projects then advance at the same relative pace, they
+finish in the order of their standalone completion times. Per run, sorting
+those times gives the finishing order, and each gap between consecutive
+finishes is stretched by 1 / s for the set of projects still running. That
+makes the whole portfolio a sort plus cumulative sums over a
+(projects x runs) array, with no loop over runs or events.
+
+Runs are processed one engine run block at a time (in passes of at most
+PORTFOLIO_MAX_ELEMENTS projects x runs for the sort), each project drawn
+and mapped by the selected kernel in its own precision, and every block is
+folded into per-project accumulators. Those keep exact samples while the
+whole portfolio fits PORTFOLIO_MAX_ELEMENTS and quantile sketches beyond
+it, so memory no longer grows with projects x runs.
+
+Policies:
+- shared: staff freed by finished projects go to the ones still running
+- fixed:  every project keeps the share it was given at the start
+"""
+
+import numpy as np
+
+from core.estimation import calculate_base_effort
+from core.kernels import get_kernel
+from core.monte_carlo import (
+    BLOCK_SIZE,
+    SimulationAccumulator,
+    block_layout,
+    draw_block_normals,
+    kernel_params,
+    root_seed_sequence,
+)
+from core.sketch import QuantileSketch
+from models.schemas import PortfolioRequest
+
+
+ROLES = ("junior", "mid", "senior")
+
+# Cap on projects x runs per pass, keeping the sort and its temporaries small
+PORTFOLIO_MAX_ELEMENTS = 2_000_000
+
+
+def team_demand(request: PortfolioRequest) -> np.ndarray:
+    """Requested headcount per project and role, shape (projects, 3)."""
+    demand = np.array(
+        [[p.team_junior, p.team_mid, p.team_senior] for p in request.projects], dtype=float
+    )
+    for project, row in zip(request.projects, demand):
+        if row.sum() == 0:
+            raise ValueError(f"Project {project.project_name!r} requests no staff")
+    pool = np.array([getattr(request.pool, role) for role in ROLES], dtype=float)
+    missing = [role for role, needed, available in zip(ROLES, demand.sum(axis=0), pool) if needed and not available]
+    if missing:
+        raise ValueError(f"The staff pool has no {', '.join(missing)} developers but projects need them")
+    return demand
+
+
+def staffing_share(pool: np.ndarray, active_demand: np.ndarray) -> np.ndarray:
+    """
+    Fraction of its requested team every active project gets, given the
+    active demand per role (..., 3): the scarcest role sets it, capped at 1.
+    """
+    with np.errstate(divide="ignore"):
+        ratios = np.where(active_demand > 0, pool / active_demand, np.inf)
+    return np.minimum(1.0, ratios.min(axis=-1))
+
+
+def project_streams(request: PortfolioRequest) -> list[np.random.SeedSequence]:
+    """Each project's own RNG stream, spawned from the portfolio seed."""
+    root = root_seed_sequence(request.seed)
+    return [
+        np.random.SeedSequence(root.entropy, spawn_key=root.spawn_key + (index,))
+        for index in range(len(request.projects))
+    ]
+
+
+def standalone_weeks(
+    request: PortfolioRequest,
+    streams: list[np.random.SeedSequence],
+    params: list[dict],
+    block_index: int,
+    size: int,
+) -> np.ndarray:
+    """Completion weeks of every project with its full requested team for one run block, shape (projects, size)."""
+    kernel = get_kernel()
+    weeks = np.empty((len(request.projects), size))
+    for index, (project, stream) in enumerate(zip(request.projects, streams)):
+        z = draw_block_normals(stream, block_index, size, project.sampling, project.correlation, project.precision)
+        weeks[index] = kernel(params[index], z)
+    return weeks
+
+
+def shared_completion_weeks(standalone: np.ndarray, demand: np.ndarray, pool: np.ndarray) -> np.ndarray:
+    """Completion weeks when freed staff are redistributed, for a (projects, runs) block."""
+    order = np.argsort(standalone, axis=0)
+    sorted_weeks = np.take_along_axis(standalone, order, axis=0)
+
+    # Demand of the projects still running while the k-th one (in finishing
+    # order) is the next to finish: a reverse cumulative sum, one role at a
+    # time so no (projects, runs, roles) array is built
+    share = np.ones(standalone.shape)
+    for role, available in enumerate(pool):
+        active_demand = np.cumsum(demand[order[::-1], role], axis=0)[::-1]
+        with np.errstate(divide="ignore"):
+            np.minimum(share, np.where(active_demand > 0, available / active_demand, np.inf), out=share)
+
+    gaps = np.diff(sorted_weeks, axis=0, prepend=0.0)
+    finish = np.empty_like(standalone)
+    np.put_along_axis(finish, order, np.cumsum(gaps / share, axis=0), axis=0)
+    return finish
+
+
+def portfolio_memory_mb(request: PortfolioRequest) -> float:
+    """
+    Accounted peak size of a portfolio run's arrays, in MiB: one run block of
+    standalone weeks, the temporaries of one shared-pool pass, and per project
+    the retained samples (or sketches) of its standalone and shared finishes.
+    """
+    n_projects, n_runs = len(request.projects), request.num_simulations
+    block = n_projects * min(BLOCK_SIZE, n_runs) * 8
+    # The sort, its indices and the staffing arrays: about ten (projects x pass) arrays
+    passes = 10 * min(PORTFOLIO_MAX_ELEMENTS, n_projects * n_runs) * 8
+    if n_projects * n_runs <= PORTFOLIO_MAX_ELEMENTS:
+        retained = 2 * n_projects * n_runs * 8
+    else:
+        retained = 2 * n_projects * QuantileSketch().max_buckets * 8
+    return round((block + passes + retained + n_runs * 8) / 2 ** 20, 2)
+
+
+def run_portfolio(request: PortfolioRequest) -> dict:
+    """
+    Simulate all projects together against the shared pool and return
+    per-project and portfolio-level completion distributions.
+    """
+    demand = team_demand(request)
+    pool = np.array([getattr(request.pool, role) for role in ROLES], dtype=float)
+    initial_share = staffing_share(pool, demand.sum(axis=0))
+    streams = project_streams(request)
+    params = [kernel_params(project, calculate_base_effort(project)) for project in request.projects]
+
+    n_projects = len(request.projects)
+    keep_samples = n_projects * request.num_simulations <= PORTFOLIO_MAX_ELEMENTS
+    finishes = [SimulationAccumulator(p.deadline_weeks, keep_samples=keep_samples) for p in request.projects]
+    standalones = [SimulationAccumulator(np.inf, keep_samples=keep_samples) for _ in request.projects]
+    makespan = SimulationAccumulator(np.inf)
+    deadlines = np.array([p.deadline_weeks for p in request.projects], dtype=float)[:, None]
+    all_on_time = projects_on_time = 0
+
+    runs_per_pass = max(1, PORTFOLIO_MAX_ELEMENTS // n_projects)
+    for block_index, size in enumerate(block_layout(request.num_simulations)):
+        standalone = standalone_weeks(request, streams, params, block_index, size)
+        for index in range(n_projects):
+            standalones[index].add(standalone[index])
+
+        for start in range(0, size, runs_per_pass):
+            runs = standalone[:, start:start + runs_per_pass]
+            if request.policy == "fixed":
+                finish = runs / initial_share
+            else:
+                finish = shared_completion_weeks(runs, demand, pool)
+            for index in range(n_projects):
+                finishes[index].add(finish[index])
+            makespan.add(finish.max(axis=0))
+            on_time = finish <= deadlines
+            all_on_time += int(np.count_nonzero(on_time.all(axis=0)))
+            projects_on_time += int(np.count_nonzero(on_time))
+
+    projects = []
+    for project, finished, alone in zip(request.projects, finishes, standalones):
+        p50, p90 = finished.quantiles([0.5, 0.9])
+        standalone_p50, standalone_p90 = alone.quantiles([0.5, 0.9])
+        projects.append({
+            "project_name": project.project_name,
+            "p50_weeks": round(float(p50), 1),
+            "p90_weeks": round(float(p90), 1),
+            "on_time_probability": round(finished.on_time_count / finished.n, 3),
+            "expected_overrun_days": round(finished.overrun_weeks_sum / max(1, finished.late_count) * 5, 1),
+            "standalone_p50_weeks": round(float(standalone_p50), 1),
+            "standalone_p90_weeks": round(float(standalone_p90), 1),
+        })
+
+    summary = makespan.summary()
+    return {
+        "projects": projects,
+        "portfolio": {
+            "p50_weeks": summary["p50_weeks"],
+            "p90_weeks": summary["p90_weeks"],
+            "all_on_time_probability": round(all_on_time / request.num_simulations, 3),
+            "expected_projects_on_time": round(projects_on_time / request.num_simulations, 2),
+            "initial_staffing_share": round(float(initial_share), 3),
+            "histogram": summary["histogram"],
+        },
+        "seed": request.seed,
+    }
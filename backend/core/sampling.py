@@ -0,0 +1,173 @@
+"""
+Sampling strategies for the standard normal draws behind each simulation run.
+
+- random:      plain pseudo-random draws
+- antithetic:  each draw z is paired with -z
+- lhs:         Latin hypercube; every factor gets exactly one draw per 1/N stratum
+- sobol:       scrambled Sobol low-discrepancy points
+
+LHS and Sobol points are uniforms mapped through the normal inverse CDF; the
+kernel then maps normals to lognormals with exp(), which is the lognormal
+inverse CDF. Every strategy draws a block from that block's own RNG stream,
+so results stay reproducible per seed and independent across blocks.
+
+Correlated factors use a Gaussian copula: the independent draws are mixed by
+the Cholesky factor L of the correlation matrix (z -> L z) before the kernel
+applies each factor's marginal, so every marginal is unchanged while the
+factors move together. L is computed once per distinct matrix and cached.
+"""
+
+from functools import lru_cache
+from typing import Literal, Optional
+
+import numpy as np
+
+
+SamplingMethod = Literal["random", "antithetic", "lhs", "sobol"]
+
+# Coefficients of Acklam's rational approximation to the normal inverse CDF
+_A = (-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02,
+      1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00)
+_B = (-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02,
+      6.680131188771972e+01, -1.328068155288572e+01)
+_C = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00,
+      -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00)
+_D = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00,
+      3.754408661907416e+00)
+_P_LOW = 0.02425
+
+# Sobol direction-number seeds (Joe & Kuo) for dimensions 2-4:
+# (degree s, coefficient a, initial m values). Dimension 1 is van der Corput.
+_SOBOL_PARAMS = ((1, 0, (1,)), (2, 1, (1, 3)), (3, 1, (1, 3, 1)))
+_SOBOL_BITS = 32
+
+# Diagonal jitter that lets positive semidefinite (e.g. perfectly correlated)
+# matrices through the Cholesky factorisation
+_CHOLESKY_JITTER = 1e-10
+
+# Correlation matrices are passed around as nested tuples so they can key caches
+CorrelationMatrix = tuple[tuple[float, ...], ...]
+
+
+def norm_ppf(u: np.ndarray) -> np.ndarray:
+    """Standard normal inverse CDF for u in (0, 1), relative error below 1.2e-9."""
+    u = np.asarray(u, dtype=float)
+    z = np.empty_like(u)
+
+    low = u < _P_LOW
+    high = u > 1 - _P_LOW
+    central = ~(low | high)
+
+    q = u[central] - 0.5
+    r = q * q
+    z[central] = (
+        (((((_A[0] * r + _A[1]) * r + _A[2]) * r + _A[3]) * r + _A[4]) * r + _A[5]) * q
+        / (((((_B[0] * r + _B[1]) * r + _B[2]) * r + _B[3]) * r + _B[4]) * r + 1)
+    )
+
+    for mask, sign, p in ((low, 1.0, u[low]), (high, -1.0, 1 - u[high])):
+        q = np.sqrt(-2 * np.log(p))
+        z[mask] = sign * (
+            (((((_C[0] * q + _C[1]) * q + _C[2]) * q + _C[3]) * q + _C[4]) * q + _C[5])
+            / ((((_D[0] * q + _D[1]) * q + _D[2]) * q + _D[3]) * q + 1)
+        )
+    return z
+
+
+def _sobol_direction_numbers(n_dims: int) -> np.ndarray:
+    """Direction numbers V[dim, bit] as 32-bit integers, most significant digit first."""
+    v = np.zeros((n_dims, _SOBOL_BITS), dtype=np.uint64)
+    v[0] = [1 << (_SOBOL_BITS - 1 - j) for j in range(_SOBOL_BITS)]
+    for dim, (s, a, m_init) in enumerate(_SOBOL_PARAMS[:n_dims - 1], start=1):
+        m = list(m_init)
+        for j in range(s, _SOBOL_BITS):
+            value = m[j - s] ^ (m[j - s] << s)
+            for k in range(1, s):
+                if (a >> (s - 1 - k)) & 1:
+                    value ^= m[j - k] << k
+            m.append(value)
+        v[dim] = [m[j] << (_SOBOL_BITS - 1 - j) for j in range(_SOBOL_BITS)]
+    return v
+
+
+_SOBOL_V = _sobol_direction_numbers(len(_SOBOL_PARAMS) + 1)
+
+
+def _scrambled_sobol(rng: np.random.Generator, n_dims: int, size: int) -> np.ndarray:
+    """
+    First `size` points of a Sobol sequence in [0, 1)^n_dims with a random
+    linear matrix scramble and digital shift (Owen-style randomised QMC).
+    """
+    if n_dims > len(_SOBOL_V):
+        raise ValueError(f"Sobol sampling supports at most {len(_SOBOL_V)} dimensions")
+    bits = np.arange(_SOBOL_BITS, dtype=np.uint64)
+    # Row k of a random lower-triangular binary matrix with unit diagonal, as a
+    # mask over the k most significant digits
+    upper_digits = np.uint64((1 << _SOBOL_BITS) - 1) << (np.uint64(_SOBOL_BITS) - bits - np.uint64(1))
+    row_bits = np.uint64(1) << (np.uint64(_SOBOL_BITS - 1) - bits)
+
+    index = np.arange(size, dtype=np.uint64)
+    points = np.empty((n_dims, size))
+    for dim in range(n_dims):
+        random_bits = rng.integers(0, 1 << _SOBOL_BITS, size=_SOBOL_BITS, dtype=np.uint64)
+        rows = (random_bits & upper_digits & np.uint64((1 << _SOBOL_BITS) - 1)) | row_bits
+        # Scrambled direction number j has digit k = parity(row_k & V_j)
+        parity = np.bitwise_count(rows[:, None] & _SOBOL_V[dim][None, :]) & np.uint8(1)
+        scrambled = (parity.astype(np.uint64) << (np.uint64(_SOBOL_BITS - 1) - bits)[:, None]).sum(axis=0)
+
+        x = np.full(size, rng.integers(0, 1 << _SOBOL_BITS, dtype=np.uint64), dtype=np.uint64)
+        for j in range(max(1, int(size - 1).bit_length())):
+            x ^= np.where((index >> np.uint64(j)) & np.uint64(1), scrambled[j], np.uint64(0))
+        points[dim] = (x.astype(float) + 0.5) / float(1 << _SOBOL_BITS)
+    return points
+
+
+@lru_cache(maxsize=64)
+def cholesky_factor(correlation: CorrelationMatrix) -> np.ndarray:
+    """Lower-triangular L with L @ L.T == correlation (read-only, cached per matrix)."""
+    matrix = np.array(correlation, dtype=float)
+    try:
+        factor = np.linalg.cholesky(matrix)
+    except np.linalg.LinAlgError:
+        try:
+            factor = np.linalg.cholesky(matrix + _CHOLESKY_JITTER * np.eye(len(matrix)))
+        except np.linalg.LinAlgError:
+            raise ValueError("Correlation matrix must be positive semidefinite") from None
+    factor.flags.writeable = False
+    return factor
+
+
+def _independent_normals(
+    rng: np.random.Generator, n_dims: int, size: int, method: SamplingMethod, dtype: np.dtype
+) -> np.ndarray:
+    if method == "random":
+        return rng.standard_normal((n_dims, size), dtype=dtype)
+    if method == "antithetic":
+        half = rng.standard_normal((n_dims, (size + 1) // 2), dtype=dtype)
+        return np.concatenate([half, -half], axis=1)[:, :size]
+    if method == "lhs":
+        strata = np.argsort(rng.random((n_dims, size)), axis=1)
+        return norm_ppf((strata + rng.random((n_dims, size))) / size).astype(dtype, copy=False)
+    if method == "sobol":
+        return norm_ppf(_scrambled_sobol(rng, n_dims, size)).astype(dtype, copy=False)
+    raise ValueError(f"Unknown sampling method: {method}")
+
+
+def standard_normals(
+    rng: np.random.Generator,
+    n_dims: int,
+    size: int,
+    method: SamplingMethod = "random",
+    correlation: Optional[CorrelationMatrix] = None,
+    dtype: np.dtype = np.float64,
+) -> np.ndarray:
+    """
+    Standard normal draws of shape (n_dims, size) using the given strategy,
+    correlated across dimensions when a correlation matrix is given.
+    float32 draws come from the generator's native float32 path, so they are
+    a different (but equally reproducible) stream from the float64 draws.
+    """
+    z = _independent_normals(rng, n_dims, size, method, dtype)
+    if correlation is None:
+        return z
+    return cholesky_factor(correlation).astype(z.dtype, copy=False) @ z
@@ -0,0 +1,117 @@
+"""
+What-if scenarios evaluated with common random numbers.
+
+A scenario and its baseline are run through the kernel on the very same
+standard normal draws, so the difference between them reflects the change
+in inputs rather than sampling noise. Draws are cached per seed (and
+precision), so moving a what-if slider re-evaluates the kernel without
+re-sampling. Draws, params and kernel all follow the request's precision,
+so a float32 baseline matches float32 /simulate.
+"""
+
+import hashlib
+import json
+from functools import lru_cache
+from typing import Iterator, Optional
+
+import numpy as np
+
+from core.batch import stack_kernel_params
+from core.monte_carlo import (
+    block_layout,
+    completion_weeks_from_normals,
+    draw_block_normals,
+    draw_normals,
+    kernel_params,
+    root_seed_sequence,
+    summarize_completion_weeks,
+)
+from core.sampling import CorrelationMatrix
+from models.schemas import SimulationRequest
+
+
+# Larger runs are re-drawn from their seed instead of being cached
+CRN_CACHE_MAX_RUNS = 200_000
+
+
+@lru_cache(maxsize=16)
+def _cached_normals(
+    seed: int, n_simulations: int, sampling: str, correlation: Optional[CorrelationMatrix], precision: str
+) -> np.ndarray:
+    z = draw_normals(root_seed_sequence(seed), n_simulations, sampling, correlation, precision)
+    z.flags.writeable = False
+    return z
+
+
+def common_normals(
+    seed: int,
+    n_simulations: int,
+    sampling: str = "random",
+    correlation: Optional[CorrelationMatrix] = None,
+    precision: str = "float64",
+) -> np.ndarray:
+    """The (4, N) standard normal draws for a seed, shared across scenarios."""
+    if n_simulations > CRN_CACHE_MAX_RUNS:
+        return draw_normals(root_seed_sequence(seed), n_simulations, sampling, correlation, precision)
+    return _cached_normals(seed, n_simulations, sampling, correlation, precision)
+
+
+def common_normal_blocks(
+    seed: int,
+    n_simulations: int,
+    sampling: str = "random",
+    correlation: Optional[CorrelationMatrix] = None,
+    precision: str = "float64",
+) -> Iterator[np.ndarray]:
+    """
+    The same draws as common_normals, one (4, block) run block at a time:
+    slices of the cached draws for small runs, drawn block by block otherwise,
+    so large runs never hold all of them at once.
+    """
+    if n_simulations <= CRN_CACHE_MAX_RUNS:
+        z = _cached_normals(seed, n_simulations, sampling, correlation, precision)
+        start = 0
+        for size in block_layout(n_simulations):
+            yield z[:, start:start + size]
+            start += size
+        return
+    root = root_seed_sequence(seed)
+    for block_index, size in enumerate(block_layout(n_simulations)):
+        yield draw_block_normals(root, block_index, size, sampling, correlation, precision)
+
+
+def scenario_seed(request: SimulationRequest) -> int:
+    """
+    The request's own seed, or a stable one derived from its inputs, so every
+    what-if built on an unseeded baseline still reuses the same draws.
+    """
+    if request.seed is not None:
+        return request.seed
+    canonical = json.dumps(request.model_dump(), sort_keys=True)
+    return int.from_bytes(hashlib.sha256(canonical.encode()).digest()[:8], "big")
+
+
+def apply_scenario_deltas(
+    baseline: SimulationRequest, senior_delta: int, integrations_delta: int, deadline_delta: int
+) -> SimulationRequest:
+    """Baseline request with the what-if deltas applied (clamped to valid values)."""
+    return baseline.model_copy(update={
+        "team_senior": max(0, baseline.team_senior + senior_delta),
+        "integrations": max(0, baseline.integrations + integrations_delta),
+        "deadline_weeks": max(1, baseline.deadline_weeks + deadline_delta),
+    })
+
+
+def run_monte_carlo_scenarios(
+    requests: list[SimulationRequest], base_efforts: list[dict], seed: int
+) -> list[dict]:
+    """
+    Run several variants of one project on common random numbers.
+    All variants must share num_simulations, sampling, correlation and
+    precision; they are evaluated as one stacked (variants x runs) kernel pass.
+    """
+    request = requests[0]
+    z = common_normals(seed, request.num_simulations, request.sampling, request.correlation, request.precision)
+    params = stack_kernel_params([kernel_params(r, b) for r, b in zip(requests, base_efforts)], request.precision)
+    weeks = completion_weeks_from_normals(params, z[:, None, :])
+    return [summarize_completion_weeks(weeks[i], r) for i, r in enumerate(requests)]
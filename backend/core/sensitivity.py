@@ -0,0 +1,150 @@
+"""
+One-at-a-time (tornado) sensitivity analysis on common random numbers.
+
+Each input is nudged down and up by one step while everything else stays at
+the baseline. All variants share one set of standard normal draws, so the
+ranking reflects the inputs rather than sampling noise. Runs are evaluated a
+block at a time, all variants stacked into (variants x block) kernel passes of
+at most BATCH_MAX_ELEMENTS, and folded into one accumulator per variant: exact
+samples, or a constant-size quantile sketch from STREAMING_MIN_SIMULATIONS
+runs on. Memory therefore never holds a (variants x runs) matrix.
+"""
+
+import numpy as np
+
+from core.batch import BATCH_MAX_ELEMENTS, stack_kernel_params
+from core.estimation import calculate_base_effort
+from core.monte_carlo import (
+    BLOCK_SIZE,
+    N_FACTORS,
+    SimulationAccumulator,
+    completion_weeks_from_normals,
+    kernel_params,
+    use_streaming,
+)
+from core.scenario import common_normal_blocks, scenario_seed
+from core.sketch import QuantileSketch
+from models.schemas import SimulationRequest
+
+
+# Step applied in each direction, and the valid range of each input
+SENSITIVITY_STEPS = {
+    "team_senior": (1, 0, None),
+    "team_mid": (1, 0, None),
+    "team_junior": (1, 0, None),
+    "integrations": (1, 0, None),
+    "complexity": (1, 1, 5),
+    "scope_volatility": (10, 0, 100),
+    "deadline_weeks": (1, 1, None),
+    "wsci": (0.1, 0.5, None),
+}
+
+METRICS = ("p50_weeks", "p90_weeks", "on_time_probability")
+
+# The baseline plus a down and an up variant per input, at most
+MAX_VARIANTS = 1 + 2 * len(SENSITIVITY_STEPS)
+
+
+def _variant(request: SimulationRequest, field: str, value) -> tuple[SimulationRequest, dict]:
+    """Request and base effort with one input changed."""
+    if field != "wsci":
+        variant = request.model_copy(update={field: value})
+        return variant, calculate_base_effort(variant)
+
+    # WSCI comes from the stack name; scale effort as if the stack's index were `value`
+    base_effort = dict(calculate_base_effort(request))
+    base_effort["base_effort_days"] = base_effort["base_effort_days"] * value / base_effort["wsci"]
+    base_effort["wsci"] = value
+    return request, base_effort
+
+
+def sensitivity_memory_mb(request: SimulationRequest, n_variants: int = MAX_VARIANTS) -> float:
+    """
+    Accounted peak size of a sensitivity run's arrays, in MiB: one block of
+    draws, one kernel pass with its temporaries, and per variant either the
+    retained samples or a quantile sketch.
+    """
+    itemsize = np.dtype(request.precision).itemsize
+    block = min(BLOCK_SIZE, request.num_simulations)
+    rows = min(n_variants, max(1, BATCH_MAX_ELEMENTS // block))
+    # The stacked kernel holds about seven (rows x block) temporaries at its peak
+    working = N_FACTORS * block * itemsize + 7 * rows * block * itemsize
+    if use_streaming(request):
+        retained = n_variants * QuantileSketch().max_buckets * np.dtype(np.int64).itemsize
+    else:
+        retained = n_variants * request.num_simulations * itemsize
+    return round((working + retained) / 2 ** 20, 2)
+
+
+def _stacked_metrics(requests: list[SimulationRequest], base_efforts: list[dict], seed: int) -> np.ndarray:
+    """P50, P90 and on-time probability for every variant, shape (variants, 3)."""
+    request = requests[0]
+    keep_samples = not use_streaming(request)
+    accumulators = [SimulationAccumulator(r.deadline_weeks, keep_samples=keep_samples) for r in requests]
+    params = stack_kernel_params([kernel_params(r, b) for r, b in zip(requests, base_efforts)], request.precision)
+    rows_per_pass = max(1, BATCH_MAX_ELEMENTS // min(BLOCK_SIZE, request.num_simulations))
+
+    blocks = common_normal_blocks(
+        seed, request.num_simulations, request.sampling, request.correlation, request.precision
+    )
+    for z in blocks:
+        for start in range(0, len(requests), rows_per_pass):
+            rows = slice(start, start + rows_per_pass)
+            weeks = completion_weeks_from_normals({k: v[rows] for k, v in params.items()}, z[:, None, :])
+            for accumulator, row in zip(accumulators[rows], weeks):
+                accumulator.add(row)
+
+    return np.array([
+        [*accumulator.quantiles([0.5, 0.9]), accumulator.on_time_count / accumulator.n]
+        for accumulator in accumulators
+    ])
+
+
+def run_sensitivity(request: SimulationRequest) -> dict:
+    """
+    Tornado analysis: impact of a one-step change in each input on P50, P90
+    and on-time probability, ranked by the P90 swing between the down and up
+    variants. Inputs already at a bound are only moved in the open direction.
+    """
+    seed = scenario_seed(request)
+
+    baseline_effort = calculate_base_effort(request)
+    requests, base_efforts, labels = [request], [baseline_effort], [None]
+    for field, (step, low, high) in SENSITIVITY_STEPS.items():
+        current = baseline_effort["wsci"] if field == "wsci" else getattr(request, field)
+        for direction, value in (("down", current - step), ("up", current + step)):
+            if value < low or (high is not None and value > high):
+                continue
+            variant, effort = _variant(request, field, round(value, 2))
+            requests.append(variant)
+            base_efforts.append(effort)
+            labels.append((field, direction))
+
+    metrics = _stacked_metrics(requests, base_efforts, seed)
+    baseline = metrics[0]
+
+    impacts = {
+        field: {"input": field, "step": step, "down": None, "up": None}
+        for field, (step, _, _) in SENSITIVITY_STEPS.items()
+    }
+    for (field, direction), row in zip(labels[1:], metrics[1:]):
+        impacts[field][direction] = {
+            metric: round(float(row[i] - baseline[i]), 3) for i, metric in enumerate(METRICS)
+        }
+
+    for impact in impacts.values():
+        for metric in METRICS:
+            down = (impact["down"] or {}).get(metric, 0.0)
+            up = (impact["up"] or {}).get(metric, 0.0)
+            impact[f"swing_{metric}"] = round(abs(up - down), 3)
+
+    ranked = sorted(
+        impacts.values(),
+        key=lambda impact: (impact["swing_p90_weeks"], impact["swing_on_time_probability"]),
+        reverse=True,
+    )
+    return {
+        "baseline": {metric: round(float(baseline[i]), 3) for i, metric in enumerate(METRICS)},
+        "impacts": ranked,
+        "seed": seed,
+    }
@@ -0,0 +1,168 @@
+"""
+Server-side store of /simulate results, addressed by simulation_id.
+
+A session holds the simulation's inputs, its response and its completion
+samples, so follow-up endpoints (/executive-summary, /task-breakdown,
+/execution-plan, /failure-forecast) can take just the id instead of the
+whole project context, and questions such as "P(finish by week X)" can be
+answered from the stored samples without simulating again.
+
+Samples are kept sorted as float32. Beyond SIMULATION_SESSION_MAX_SAMPLES
+runs an evenly spaced subset of the order statistics is kept instead, which
+bounds memory per session while preserving the distribution's shape.
+Simulations that do not materialise samples (streaming, parallel) store none.
+
+Backends, chosen with SIMULATION_SESSION_STORE:
+- memory: in-process LRU with a time to live (default)
+- sqlite: the same bounds in an on-disk SQLite file (SIMULATION_SESSION_DB),
+          which survives restarts and is shared by workers on one host
+"""
+
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from core.cache import ResultCache
+from models.schemas import SimulationRequest, SimulationResponse
+
+
+SIMULATION_SESSION_STORE = os.getenv("SIMULATION_SESSION_STORE", "memory")
+SIMULATION_SESSION_DB = os.getenv("SIMULATION_SESSION_DB", "simulation_sessions.db")
+SIMULATION_SESSION_SIZE = int(os.getenv("SIMULATION_SESSION_SIZE", "512"))
+SIMULATION_SESSION_TTL_SECONDS = float(os.getenv("SIMULATION_SESSION_TTL_SECONDS", "3600"))
+SIMULATION_SESSION_MAX_SAMPLES = int(os.getenv("SIMULATION_SESSION_MAX_SAMPLES", "100000"))
+
+
+class SimulationSession(NamedTuple):
+    request: SimulationRequest
+    response: SimulationResponse
+    samples: Optional[np.ndarray]  # sorted completion weeks, float32
+
+
+def stored_samples(completion_samples) -> Optional[np.ndarray]:
+    """Sorted float32 copy of the samples, thinned to at most SIMULATION_SESSION_MAX_SAMPLES."""
+    if completion_samples is None:
+        return None
+    samples = np.sort(np.asarray(completion_samples, dtype=np.float32))
+    if len(samples) > SIMULATION_SESSION_MAX_SAMPLES:
+        samples = samples[np.linspace(0, len(samples) - 1, SIMULATION_SESSION_MAX_SAMPLES).astype(np.int64)]
+    return samples
+
+
+def session_fields(session: SimulationSession) -> dict:
+    """
+    Flat view of a session under the field names the follow-up requests use.
+    on_time_probability is a percentage (0-100), as the frontend sends it.
+    """
+    response = session.response
+    return {
+        **session.request.model_dump(),
+        "p50_weeks": response.p50_weeks,
+        "p90_weeks": response.p90_weeks,
+        "on_time_probability": response.on_time_probability * 100,
+        "p50_cost": response.p50_cost,
+        "p90_cost": response.p90_cost,
+        "currency": response.currency,
+        "risk_scores": response.risk_scores.model_dump(),
+        "role_allocation": response.role_allocation,
+    }
+
+
+class MemorySessionStore:
+    """Sessions in process memory, bounded by count (LRU) and age."""
+
+    def __init__(self, max_entries: int = SIMULATION_SESSION_SIZE, ttl_seconds: float = SIMULATION_SESSION_TTL_SECONDS):
+        self._entries = ResultCache(max_entries, ttl_seconds)
+
+    def save(self, request: SimulationRequest, response: SimulationResponse, samples: Optional[np.ndarray]) -> str:
+        simulation_id = uuid.uuid4().hex
+        self._entries.put(simulation_id, SimulationSession(request, response, samples))
+        return simulation_id
+
+    def get(self, simulation_id: str) -> Optional[SimulationSession]:
+        return self._entries.get(simulation_id)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class SqliteSessionStore:
+    """
+    Sessions in a SQLite file with the same bounds as the memory store:
+    expired rows are dropped on access and the least recently used rows
+    beyond max_entries are deleted on save.
+    """
+
+    def __init__(
+        self,
+        path: str = SIMULATION_SESSION_DB,
+        max_entries: int = SIMULATION_SESSION_SIZE,
+        ttl_seconds: float = SIMULATION_SESSION_TTL_SECONDS,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "id TEXT PRIMARY KEY, expires REAL, last_used REAL, request TEXT, response TEXT, samples BLOB)"
+        )
+        self._db.commit()
+
+    def save(self, request: SimulationRequest, response: SimulationResponse, samples: Optional[np.ndarray]) -> str:
+        if self.max_entries <= 0:
+            return uuid.uuid4().hex
+        simulation_id = uuid.uuid4().hex
+        now = time.time()
+        blob = None if samples is None else samples.astype(np.float32).tobytes()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO sessions VALUES (?, ?, ?, ?, ?, ?)",
+                (simulation_id, now + self.ttl_seconds, now, request.model_dump_json(), response.model_dump_json(), blob),
+            )
+            self._db.execute(
+                "DELETE FROM sessions WHERE id IN ("
+                "SELECT id FROM sessions ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._db.commit()
+        return simulation_id
+
+    def get(self, simulation_id: str) -> Optional[SimulationSession]:
+        now = time.time()
+        with self._lock:
+            self._db.execute("DELETE FROM sessions WHERE expires <= ?", (now,))
+            row = self._db.execute(
+                "SELECT request, response, samples FROM sessions WHERE id = ?", (simulation_id,)
+            ).fetchone()
+            if row is not None:
+                self._db.execute("UPDATE sessions SET last_used = ? WHERE id = ?", (now, simulation_id))
+            self._db.commit()
+        if row is None:
+            return None
+        request, response, blob = row
+        return SimulationSession(
+            SimulationRequest.model_validate_json(request),
+            SimulationResponse.model_validate_json(response),
+            None if blob is None else np.frombuffer(blob, dtype=np.float32),
+        )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM sessions")
+            self._db.commit()
+
+
+@lru_cache(maxsize=1)
+def get_session_store():
+    """The process-wide session store, created on first use."""
+    if SIMULATION_SESSION_STORE == "sqlite":
+        print(f"[Sessions] Storing simulations in {SIMULATION_SESSION_DB}")
+        return SqliteSessionStore()
+    return MemorySessionStore()
@@ -0,0 +1,118 @@
+"""
+Mergeable, bounded-memory quantile sketch for streaming simulation results.
+
+Values are counted in logarithmically spaced buckets (DDSketch-style): bucket
+k covers (gamma^(k-1), gamma^k] with gamma = (1 + alpha) / (1 - alpha), and is
+represented by 2 * gamma^k / (gamma + 1). Every value in a bucket is within a
+relative error alpha of that representative.
+
+Error bound: while no buckets have been collapsed, quantile(q) is within
+alpha * x of x, where x is the exact linearly-interpolated percentile that
+np.percentile would return over the same values. With the defaults
+(alpha = 0.05%) a 30-week P90 is accurate to about +/-0.015 weeks, well below
+the 0.1-week rounding of the API.
+
+Memory is bounded by max_buckets: when the value range would need more, the
+lowest buckets are merged into one, which only degrades the lowest quantiles.
+The default of 8192 buckets (64 KB) spans a max/min ratio of about 3500 before
+that happens; simulated completion times span well under 10x.
+
+Merging adds bucket counts, so merged sketches are exact regardless of how
+the values were split between them, and the result is deterministic.
+"""
+
+import numpy as np
+
+
+class QuantileSketch:
+    """Relative-error quantile sketch over positive values."""
+
+    def __init__(self, relative_accuracy: float = 0.0005, max_buckets: int = 8192):
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._inv_log_gamma = 1.0 / np.log(self.gamma)
+        self.count = 0
+        # Non-positive values cannot be log-indexed; they are counted at 0.0
+        self.zero_count = 0
+        # counts[i] is the number of values in bucket (key_offset + i)
+        self.key_offset = 0
+        self.counts = np.zeros(0, dtype=np.int64)
+
+    @property
+    def nbytes(self) -> int:
+        return self.counts.nbytes
+
+    def add(self, values: np.ndarray) -> None:
+        """Count a batch of values."""
+        positive = values[values > 0]
+        self.zero_count += len(values) - len(positive)
+        self.count += len(values)
+        if len(positive) == 0:
+            return
+        keys = np.ceil(np.log(positive) * self._inv_log_gamma).astype(np.int64)
+        offset = int(keys.min())
+        self._add_counts(offset, np.bincount(keys - offset))
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Fold another sketch with the same accuracy into this one."""
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        self.count += other.count
+        self.zero_count += other.zero_count
+        if len(other.counts):
+            self._add_counts(other.key_offset, other.counts)
+
+    def _add_counts(self, offset: int, counts: np.ndarray) -> None:
+        if len(self.counts) == 0:
+            self.key_offset, self.counts = offset, counts.astype(np.int64)
+        else:
+            lo = min(self.key_offset, offset)
+            hi = max(self.key_offset + len(self.counts), offset + len(counts))
+            merged = np.zeros(hi - lo, dtype=np.int64)
+            merged[self.key_offset - lo:self.key_offset - lo + len(self.counts)] += self.counts
+            merged[offset - lo:offset - lo + len(counts)] += counts
+            self.key_offset, self.counts = lo, merged
+
+        # Collapse the lowest buckets to stay within the memory bound
+        excess = len(self.counts) - self.max_buckets
+        if excess > 0:
+            self.counts[excess] += self.counts[:excess].sum()
+            self.counts = self.counts[excess:]
+            self.key_offset += excess
+
+    def _value_at_ranks(self, ranks: np.ndarray) -> np.ndarray:
+        """Representative value of the items at the given 0-based ranks."""
+        cumulative = self.zero_count + np.cumsum(self.counts)
+        buckets = np.searchsorted(cumulative, ranks, side="right")
+        buckets = np.minimum(buckets, len(self.counts) - 1)
+        values = 2.0 * self.gamma ** (self.key_offset + buckets) / (self.gamma + 1.0)
+        return np.where(ranks < self.zero_count, 0.0, values)
+
+    def quantiles(self, qs) -> np.ndarray:
+        """
+        Estimated quantiles for qs in [0, 1], interpolated between neighbouring
+        ranks like np.percentile's default method.
+        """
+        if self.count == 0:
+            raise ValueError("Cannot compute quantiles of an empty sketch")
+        positions = np.asarray(qs, dtype=float) * (self.count - 1)
+        lower = np.floor(positions)
+        upper = np.minimum(lower + 1, self.count - 1)
+        fraction = positions - lower
+        return (1 - fraction) * self._value_at_ranks(lower) + fraction * self._value_at_ranks(upper)
+
+    def cdf(self, values) -> np.ndarray:
+        """
+        Estimated fraction of values <= each of `values`. Exact except for the
+        bucket a value falls in, which is counted as entirely below it.
+        """
+        values = np.asarray(values, dtype=float)
+        cumulative = np.concatenate([[0], np.cumsum(self.counts)])
+        keys = np.ceil(np.log(np.maximum(values, np.finfo(float).tiny)) * self._inv_log_gamma).astype(np.int64)
+        index = np.clip(keys - self.key_offset + 1, 0, len(self.counts))
+        below = self.zero_count + cumulative[index]
+        return np.where(values < 0, 0.0, below / self.count)
+
+    def quantile(self, q: float) -> float:
+        return float(self.quantiles([q])[0])
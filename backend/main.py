@@ -1,20 +1,41 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import Body, Depends, FastAPI, HTTPException, Query, Request
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 import os
 from dotenv import load_dotenv
+from typing import Optional
 
 # Load .env BEFORE any os.getenv() calls anywhere in the app
 load_dotenv()
 from models.schemas import (
     SimulationRequest,
     SimulationResponse,
+    SimulationJobResponse,
+    SimulationSnapshot,
+    BatchSimulationRequest,
+    BatchSimulationResponse,
+    ScenarioRequest,
+    ScenarioResponse,
+    SensitivityResponse,
+    DagSimulationRequest,
+    DagSimulationResponse,
+    PortfolioRequest,
+    PortfolioResponse,
     HealthResponse,
+    CacheStatsResponse,
+    ExecutorStatsResponse,
+    AdmissionStatsResponse,
+    FidelityStatsResponse,
+    FailureForecastRequest,
     FailureForecastResponse,
     ExecutiveSummaryRequest,
     ExecutiveSummaryResponse,
     TaskBreakdownRequest,
     TaskBreakdownResponse,
     HistogramBucket,
+    CdfPoint,
     RiskScores,
     ExecutionPlanRequest,
     ExecutionPlanResponse,
@@ -22,7 +43,44 @@ from models.schemas import (
     ExecutionPlanTask,
 )
 
-app = FastAPI(title="PlanSight API", version="1.0.0")
+
+# Startup never waits on the LLM warm-up; it is given up after this long
+LLM_WARM_UP_TIMEOUT_SECONDS = float(os.getenv("LLM_WARM_UP_TIMEOUT_SECONDS", "5"))
+
+
+async def _warm_up_llm(llm_client) -> None:
+    """Warm the LLM connection in the background, logging a timeout or failure."""
+    try:
+        await asyncio.wait_for(asyncio.to_thread(llm_client.warm_up), LLM_WARM_UP_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        print(f"[LLM] Warning: warm-up timed out after {LLM_WARM_UP_TIMEOUT_SECONDS:g}s")
+    except Exception as e:
+        print(f"[LLM] Warning: warm-up failed: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    from core.admission import get_admission_controller
+    from core.kernels import select_kernel
+    from services.llm_client import LLMClient
+    from services.ollama_client import OllamaClient
+    select_kernel()
+    get_admission_controller().calibrate()
+    # One long-lived client per provider, shared by every request
+    app.state.llm_client = LLMClient()
+    app.state.ollama_client = OllamaClient(app.state.llm_client)
+    warm_up = asyncio.create_task(_warm_up_llm(app.state.llm_client))
+    yield
+    warm_up.cancel()
+    from core.jobs import shutdown_job_manager
+    from core.offload import shutdown_offload_executor
+    from core.parallel import shutdown_executor
+    shutdown_job_manager()
+    shutdown_offload_executor()
+    shutdown_executor()
+
+
+app = FastAPI(title="PlanSight API", version="1.0.0", lifespan=lifespan)
 
 # CORS configuration
 origins = os.getenv("CORS_ORIGINS", "http://localhost:3000,http://localhost:5173").split(",")
@@ -41,23 +99,34 @@ async def health_check():
     return HealthResponse(status="ok")
 
 
-@app.post("/simulate", response_model=SimulationResponse)
-async def simulate(request: SimulationRequest):
-    """
-    Run full project simulation with Monte Carlo, risk analysis, and cost estimation.
-    """
-    from core.estimation import calculate_base_effort
-    from core.monte_carlo import run_monte_carlo
+def _run_monte_carlo(request: SimulationRequest, base_effort: dict, progress=None) -> dict:
+    """Run the Monte Carlo step in the mode the request asks for, reporting progress per block."""
+    from core.monte_carlo import run_monte_carlo, run_monte_carlo_adaptive
+    from core.parallel import run_monte_carlo_parallel, should_run_parallel
+
+    if request.adaptive:
+        return run_monte_carlo_adaptive(
+            request,
+            base_effort,
+            tolerance_weeks=request.tolerance_weeks,
+            tolerance_probability=request.tolerance_probability,
+            max_seconds=request.max_seconds,
+            progress=progress,
+        )
+    if should_run_parallel(request):
+        return run_monte_carlo_parallel(request, base_effort, progress=progress)
+    return run_monte_carlo(request, base_effort, progress=progress)
+
+
+def _build_simulation_response(request: SimulationRequest, base_effort: dict, mc_results: dict) -> SimulationResponse:
+    """Add risk, stress, allocation and cost to Monte Carlo results."""
     from core.risk import (
         calculate_risk_scores,
         calculate_team_stress_index,
         calculate_role_allocation,
         calculate_cost,
     )
-    
-    # Phase 2: Real estimation + Monte Carlo + risk
-    base_effort = calculate_base_effort(request)
-    mc_results = run_monte_carlo(request, base_effort)
+
     risk_scores = calculate_risk_scores(request, base_effort)
     team_stress = calculate_team_stress_index(request, base_effort, mc_results)
     
@@ -87,24 +156,498 @@ async def simulate(request: SimulationRequest):
             "integration_multiplier": base_effort["integration_multiplier"],
             "experience_factor": base_effort["experience_factor"],
         },
+        seed=request.seed,
+        runs_used=mc_results.get("runs_used", request.num_simulations),
+        precision=mc_results.get("precision"),
+        cdf=mc_results.get("cdf"),
+        deadline_probabilities=mc_results.get("deadline_probabilities"),
+        fan_bands=mc_results.get("fan_bands"),
+        peak_memory_mb=mc_results.get("peak_memory_mb"),
     )
 
 
-@app.post("/failure-forecast", response_model=FailureForecastResponse)
-async def failure_forecast(request: SimulationRequest):
+def _cache_key(request: SimulationRequest, fidelity: str = "full") -> str:
+    """Result cache key: the inputs' fingerprint, plus the level for degraded results."""
+    from core.cache import request_fingerprint
+
+    key = request_fingerprint(request)
+    return key if fidelity == "full" else f"{key}:{fidelity}"
+
+
+def _cached_simulation(request: SimulationRequest, fidelity: str = "full"):
     """
-    Generate failure forecast with narrative and mitigations using LLM.
+    The cached (response, samples) for these inputs, or None. Repeat
+    requests (same inputs, any name/description) are served from cache.
     """
+    from core.cache import simulation_cache
+
+    if request.bypass_cache:
+        return None
+    return simulation_cache.get(_cache_key(request, fidelity))
+
+
+def _simulate_and_cache(request: SimulationRequest, progress=None, fidelity: str = "full"):
+    """
+    Run the full simulation and cache it. Returns the response and its
+    stored (sorted, possibly thinned) samples.
+    """
+    from core.cache import simulation_cache
     from core.estimation import calculate_base_effort
-    from core.monte_carlo import run_monte_carlo
-    from core.risk import calculate_risk_scores
-    from services.llm_client import LLMClient
-    
-    # Run simulation to get worst-case data
+    from core.sessions import stored_samples
+
+    # Phase 2: Real estimation + Monte Carlo + risk
     base_effort = calculate_base_effort(request)
-    mc_results = run_monte_carlo(request, base_effort)
-    risk_scores = calculate_risk_scores(request, base_effort)
-    
+    mc_results = _run_monte_carlo(request, base_effort, progress)
+    response = _build_simulation_response(request, base_effort, mc_results)
+    response.fidelity = fidelity
+    result = (response, stored_samples(mc_results.get("completion_samples")))
+    simulation_cache.put(_cache_key(request, fidelity), result)
+    return result
+
+
+def _simulate_cached(request: SimulationRequest, progress=None):
+    """Full simulation, served from the result cache for repeated inputs."""
+    return _cached_simulation(request) or _simulate_and_cache(request, progress)
+
+
+def _admit(
+    http_request: Request,
+    requests: list[SimulationRequest],
+    deadline: bool = True,
+    memory_mb: Optional[float] = None,
+    runs: int = 0,
+):
+    """Admission ticket for the requests' (or runs') estimated cost and memory; 422/429/503 when refused."""
+    from core.admission import AdmissionRejected, client_key, get_admission_controller
+
+    client = client_key(http_request.headers, http_request.client.host if http_request.client else None)
+    try:
+        return get_admission_controller().admit(client, requests, deadline, memory_mb, runs)
+    except AdmissionRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail, headers=e.headers())
+
+
+async def _simulate_offloaded(request: SimulationRequest, http_request: Request, shed_load: bool = False):
+    """
+    _simulate_cached for async routes: cache hits inline, anything else
+    admitted against the compute budgets and run on the offload pool.
+    With shed_load, the run is degraded to the fidelity level the load allows.
+    """
+    import time
+
+    from core.fidelity import degrade, get_fidelity_controller
+    from core.offload import get_offload_executor, run_cpu_bound
+
+    fidelity = get_fidelity_controller()
+    cached = _cached_simulation(request)
+    if cached is not None:
+        if shed_load:
+            fidelity.record(cached[0].fidelity)
+        return cached
+
+    level = fidelity.level(get_offload_executor().queued) if shed_load else "full"
+    degraded = degrade(request, level)
+    if degraded == request:
+        level = "full"  # nothing to shed: the request is already this cheap
+    elif (cached := _cached_simulation(degraded, level)) is not None:
+        fidelity.record(level)
+        return cached
+    request = degraded
+    start = time.perf_counter()
+    with _admit(http_request, [request]):
+        result = await run_cpu_bound(_simulate_and_cache, request, None, level)
+    if shed_load:
+        fidelity.record(level, time.perf_counter() - start)
+    return result
+
+
+@app.post("/simulate", response_model=SimulationResponse)
+async def simulate(request: SimulationRequest, http_request: Request):
+    """
+    Run full project simulation with Monte Carlo, risk analysis, and cost estimation.
+    The returned simulation_id lets follow-up endpoints reuse this result.
+    Under load fewer runs may be used; the response's fidelity says so.
+    """
+    from core.fidelity import degrade
+    from core.sessions import get_session_store
+
+    response, samples = await _simulate_offloaded(request, http_request, shed_load=True)
+    # The session keeps the request that was actually simulated, so follow-ups
+    # re-running it get this response's fidelity rather than the full one
+    simulated = degrade(request, response.fidelity)
+    simulation_id = get_session_store().save(simulated, response, samples)
+    return response.model_copy(update={"simulation_id": simulation_id})
+
+
+def _sse(event: str, data: str) -> str:
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+@app.post("/simulate/stream")
+async def simulate_stream(request: SimulationRequest, http_request: Request):
+    """
+    /simulate as Server-Sent Events: a "snapshot" event with the running
+    P50/P90, on-time probability and histogram after every block of runs,
+    then a "complete" event carrying the full response (or an "error"
+    event). Disconnecting stops the simulation after its current block.
+    """
+    import asyncio
+    import json
+    import threading
+
+    from fastapi.responses import StreamingResponse
+
+    from core.jobs import JobCancelled
+    from core.offload import run_cpu_bound
+    from core.sessions import get_session_store
+
+    cached = _cached_simulation(request)
+    ticket = _admit(http_request, [request]) if cached is None else None
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+    disconnected = threading.Event()
+
+    def progress(accumulator):
+        if disconnected.is_set():
+            raise JobCancelled()
+        snapshot = SimulationSnapshot(
+            runs_completed=accumulator.n, runs_total=request.num_simulations, **accumulator.summary()
+        )
+        loop.call_soon_threadsafe(events.put_nowait, ("snapshot", snapshot.model_dump_json()))
+
+    def run():
+        response, samples = cached or _simulate_and_cache(request, progress)
+        simulation_id = get_session_store().save(request, response, samples)
+        return response.model_copy(update={"simulation_id": simulation_id})
+
+    async def stream():
+        task = asyncio.ensure_future(run_cpu_bound(run))
+        # Consume the outcome even when the client has gone, and wake the reader below
+        task.add_done_callback(lambda done: done.cancelled() or done.exception())
+        task.add_done_callback(lambda done: events.put_nowait(None))
+        try:
+            while (event := await events.get()) is not None:
+                yield _sse(*event)
+            response = await task
+            yield _sse("complete", response.model_dump_json())
+        except Exception as e:
+            yield _sse("error", json.dumps({"detail": str(e) or type(e).__name__}))
+        finally:
+            disconnected.set()
+            if ticket is not None:
+                ticket.release()
+
+    return StreamingResponse(
+        stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.post("/simulate/jobs", response_model=SimulationJobResponse, status_code=202)
+async def submit_simulation_job(request: SimulationRequest, http_request: Request):
+    """
+    Queue a simulation on the background worker pool and return its job id
+    at once. Poll GET /simulate/jobs/{job_id} for progress and the result.
+    """
+    from core.jobs import JobQueueFull, get_job_manager
+    from core.sessions import get_session_store
+
+    # Jobs are charged to the compute budgets but not held to the request deadline
+    cached = _cached_simulation(request)
+    ticket = _admit(http_request, [request], deadline=False) if cached is None else None
+
+    def task(report):
+        response, samples = cached or _simulate_and_cache(request, progress=lambda accumulator: report(accumulator.n))
+        simulation_id = get_session_store().save(request, response, samples)
+        return response.model_copy(update={"simulation_id": simulation_id})
+
+    try:
+        job = get_job_manager().submit(task, runs_total=request.num_simulations)
+    except JobQueueFull as e:
+        if ticket is not None:
+            ticket.release(refund=True)
+        raise HTTPException(status_code=503, detail=str(e))
+    if ticket is not None:
+        # Jobs cancelled before they started get their budget back
+        job.future.add_done_callback(lambda future: ticket.release(refund=future.cancelled()))
+    return SimulationJobResponse(**job.snapshot())
+
+
+def _get_job(job_id: str):
+    from core.jobs import get_job_manager
+
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job_id")
+    return job
+
+
+@app.get("/simulate/jobs/{job_id}", response_model=SimulationJobResponse)
+async def get_simulation_job(job_id: str):
+    """Status and progress of a job, with the simulation result once it has succeeded."""
+    return SimulationJobResponse(**_get_job(job_id).snapshot())
+
+
+@app.delete("/simulate/jobs/{job_id}", response_model=SimulationJobResponse)
+async def cancel_simulation_job(job_id: str):
+    """Cancel a queued or running job; a running job stops after its current block."""
+    from core.jobs import get_job_manager
+
+    _get_job(job_id)
+    return SimulationJobResponse(**get_job_manager().cancel(job_id).snapshot())
+
+
+def _get_session(simulation_id: str):
+    from core.sessions import get_session_store
+
+    session = get_session_store().get(simulation_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired simulation_id")
+    return session
+
+
+def _follow_up(model):
+    """
+    Dependency parsing a SessionFollowUp body: given a simulation_id, fields
+    left out are filled in from that stored simulation (404 if unknown) before
+    the body is validated as `model`. Being sync, it runs in FastAPI's thread
+    pool, off the event loop, as the session store may query SQLite.
+    """
+    from pydantic import ValidationError
+    from core.sessions import session_fields
+
+    def resolve(body: dict = Body(...)):
+        if body.get("simulation_id"):
+            body = {**session_fields(_get_session(body["simulation_id"])), **body}
+        try:
+            return model.model_validate(body)
+        except ValidationError as e:
+            raise RequestValidationError([{**error, "loc": ("body", *error["loc"])} for error in e.errors()])
+
+    return resolve
+
+
+@app.get("/simulations/{simulation_id}", response_model=SimulationResponse)
+async def get_simulation(simulation_id: str):
+    """A stored /simulate result."""
+    session = _get_session(simulation_id)
+    return session.response.model_copy(update={"simulation_id": simulation_id})
+
+
+@app.get("/simulations/{simulation_id}/deadline-probabilities", response_model=list[CdfPoint])
+async def simulation_deadline_probabilities(simulation_id: str, weeks: list[float] = Query(..., max_length=500)):
+    """P(finish <= w) for each deadline w, answered from the stored samples."""
+    import numpy as np
+
+    session = _get_session(simulation_id)
+    if session.samples is None:
+        raise HTTPException(status_code=409, detail="Samples were not kept for this simulation")
+    probabilities = np.searchsorted(session.samples, np.asarray(weeks, dtype=np.float32), side="right") / len(session.samples)
+    return [CdfPoint(weeks=w, probability=round(float(p), 4)) for w, p in zip(weeks, probabilities)]
+
+
+@app.get("/cache/stats", response_model=CacheStatsResponse)
+async def cache_stats():
+    """Hit, miss and eviction counters of the /simulate result cache."""
+    from core.cache import simulation_cache
+
+    return CacheStatsResponse(**simulation_cache.stats())
+
+
+@app.get("/admission/stats", response_model=AdmissionStatsResponse)
+async def admission_stats():
+    """Admitted and refused simulation requests and the remaining global compute budget."""
+    from core.admission import get_admission_controller
+
+    return AdmissionStatsResponse(**get_admission_controller().stats())
+
+
+@app.get("/fidelity/stats", response_model=FidelityStatsResponse)
+async def fidelity_stats():
+    """Fidelity level /simulate is serving at, and how often each level was used."""
+    from core.fidelity import get_fidelity_controller
+
+    return FidelityStatsResponse(**get_fidelity_controller().stats())
+
+
+@app.get("/executor/stats", response_model=ExecutorStatsResponse)
+async def executor_stats():
+    """Queue depth and wait times of the pool that runs simulations off the event loop."""
+    from core.offload import get_offload_executor
+
+    return ExecutorStatsResponse(**get_offload_executor().stats())
+
+
+@app.post("/simulate/batch", response_model=BatchSimulationResponse)
+async def simulate_batch(request: BatchSimulationRequest, http_request: Request):
+    """
+    Simulate many projects in one call. Fixed-size runs are evaluated together
+    as a (projects x runs) matrix; adaptive and streaming runs fall back to
+    the single-project engine. Results are returned in request order.
+    """
+    from core.offload import run_cpu_bound
+
+    with _admit(http_request, request.projects):
+        return await run_cpu_bound(_simulate_batch, request)
+
+
+def _simulate_batch(request: BatchSimulationRequest) -> BatchSimulationResponse:
+    from core.batch import can_batch, run_monte_carlo_batch
+    from core.estimation import calculate_base_effort
+
+    projects = request.projects
+    base_efforts = [calculate_base_effort(project) for project in projects]
+
+    batched = [i for i, project in enumerate(projects) if can_batch(project)]
+    mc_results = dict(zip(batched, run_monte_carlo_batch(
+        [projects[i] for i in batched],
+        [base_efforts[i] for i in batched],
+    )))
+    for i, project in enumerate(projects):
+        if i not in mc_results:
+            mc_results[i] = _run_monte_carlo(project, base_efforts[i])
+
+    return BatchSimulationResponse(results=[
+        _build_simulation_response(project, base_efforts[i], mc_results[i])
+        for i, project in enumerate(projects)
+    ])
+
+
+@app.post("/scenario", response_model=ScenarioResponse)
+async def scenario(request: ScenarioRequest, http_request: Request):
+    """
+    Evaluate a what-if scenario against its baseline using common random
+    numbers: both run on the same cached draws, so the deltas show the effect
+    of the change without sampling noise.
+    """
+    from core.offload import run_cpu_bound
+
+    with _admit(http_request, [request.baseline] * 2):
+        return await run_cpu_bound(_run_scenario, request)
+
+
+def _run_scenario(request: ScenarioRequest) -> ScenarioResponse:
+    from core.estimation import calculate_base_effort
+    from core.scenario import apply_scenario_deltas, run_monte_carlo_scenarios, scenario_seed
+
+    seed = scenario_seed(request.baseline)
+    baseline = request.baseline.model_copy(update={"seed": seed})
+    variant = apply_scenario_deltas(
+        baseline, request.senior_delta, request.integrations_delta, request.deadline_delta
+    )
+
+    base_efforts = [calculate_base_effort(baseline), calculate_base_effort(variant)]
+    baseline_mc, variant_mc = run_monte_carlo_scenarios([baseline, variant], base_efforts, seed)
+    baseline_result = _build_simulation_response(baseline, base_efforts[0], baseline_mc)
+    variant_result = _build_simulation_response(variant, base_efforts[1], variant_mc)
+
+    delta_fields = ("p50_weeks", "p90_weeks", "on_time_probability", "expected_overrun_days", "p50_cost", "p90_cost")
+    return ScenarioResponse(
+        baseline=baseline_result,
+        scenario=variant_result,
+        delta={
+            field: round(getattr(variant_result, field) - getattr(baseline_result, field), 3)
+            for field in delta_fields
+        },
+    )
+
+
+@app.post("/sensitivity", response_model=SensitivityResponse)
+async def sensitivity(request: SimulationRequest, http_request: Request):
+    """
+    Rank which inputs move the deadline most: each input is nudged down and up
+    and all variants are evaluated in one pass over shared random draws.
+    """
+    from core.offload import run_cpu_bound
+    from core.sensitivity import MAX_VARIANTS, run_sensitivity, sensitivity_memory_mb
+
+    # The baseline plus a down and an up variant per input, each held in memory
+    with _admit(http_request, [request] * MAX_VARIANTS, memory_mb=sensitivity_memory_mb(request)):
+        return SensitivityResponse(**await run_cpu_bound(run_sensitivity, request))
+
+
+@app.post("/simulate/dag", response_model=DagSimulationResponse)
+async def simulate_dag(request: DagSimulationRequest, http_request: Request):
+    """
+    Simulate a task dependency graph, given directly or derived from an
+    execution plan: completion percentiles from the longest path of every run
+    and how often each task was on the critical path.
+    """
+    from core.dag import dag_memory_mb, run_dag_monte_carlo, tasks_from_execution_plan
+    from core.offload import run_cpu_bound
+
+    tasks = request.tasks if request.tasks is not None else tasks_from_execution_plan(request.execution_plan)
+    if not tasks:
+        raise HTTPException(status_code=422, detail="The execution plan has no phases")
+    try:
+        # Every task is drawn and passed over once per run
+        with _admit(
+            http_request, [], memory_mb=dag_memory_mb(len(tasks), request.num_simulations),
+            runs=len(tasks) * request.num_simulations,
+        ):
+            results = await run_cpu_bound(
+                run_dag_monte_carlo, tasks, request.num_simulations, request.deadline_weeks, request.seed
+            )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return DagSimulationResponse(**results)
+
+
+@app.post("/simulate/portfolio", response_model=PortfolioResponse)
+async def simulate_portfolio(request: PortfolioRequest, http_request: Request):
+    """
+    Simulate concurrent projects that share one pool of developers, with
+    per-project delays from contention and portfolio-level completion.
+    """
+    from core.offload import run_cpu_bound
+    from core.portfolio import portfolio_memory_mb, run_portfolio
+
+    try:
+        # Every project runs the kernel once per portfolio run
+        with _admit(
+            http_request, [], memory_mb=portfolio_memory_mb(request),
+            runs=len(request.projects) * request.num_simulations,
+        ):
+            return PortfolioResponse(**await run_cpu_bound(run_portfolio, request))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+def get_llm_client(request: Request):
+    """The application's shared Gemini client (created in lifespan; on first use otherwise)."""
+    if getattr(request.app.state, "llm_client", None) is None:
+        from services.llm_client import LLMClient
+        request.app.state.llm_client = LLMClient()
+    return request.app.state.llm_client
+
+
+def get_ollama_client(request: Request):
+    """The application's shared Ollama client, falling back to the shared Gemini client."""
+    if getattr(request.app.state, "ollama_client", None) is None:
+        from services.ollama_client import OllamaClient
+        request.app.state.ollama_client = OllamaClient(get_llm_client(request))
+    return request.app.state.ollama_client
+
+
+@app.post("/failure-forecast", response_model=FailureForecastResponse)
+async def failure_forecast(
+    http_request: Request,
+    request: FailureForecastRequest = Depends(_follow_up(FailureForecastRequest)),
+    llm_client=Depends(get_llm_client),
+):
+    """
+    Generate failure forecast with narrative and mitigations using LLM.
+
+    Pass the p90_weeks and risk_scores from /simulate to skip simulation
+    entirely; without them the /simulate result for the same inputs is
+    reused (from cache when it was recently computed).
+    """
+    if request.p90_weeks is not None and request.risk_scores is not None:
+        p90_weeks, risk_scores = request.p90_weeks, request.risk_scores
+    else:
+        simulation, _ = await _simulate_offloaded(request, http_request)
+        p90_weeks = request.p90_weeks if request.p90_weeks is not None else simulation.p90_weeks
+        risk_scores = request.risk_scores or simulation.risk_scores
+
     # Prepare context for LLM
     project_context = {
         "project_name": request.project_name,
@@ -118,7 +661,7 @@ async def failure_forecast(request: SimulationRequest):
     }
     
     worst_runs = {
-        "p90_weeks": mc_results["p90_weeks"],
+        "p90_weeks": p90_weeks,
     }
     
     risk_data = {
@@ -129,8 +672,7 @@ async def failure_forecast(request: SimulationRequest):
     }
     
     # Generate forecast using LLM
-    llm_client = LLMClient()
-    result = llm_client.generate_failure_forecast(project_context, worst_runs, risk_data)
+    result = await asyncio.to_thread(llm_client.generate_failure_forecast, project_context, worst_runs, risk_data)
     
     return FailureForecastResponse(
         failure_story=result["failure_story"],
@@ -139,12 +681,13 @@ async def failure_forecast(request: SimulationRequest):
 
 
 @app.post("/executive-summary", response_model=ExecutiveSummaryResponse)
-async def executive_summary(request: ExecutiveSummaryRequest):
+async def executive_summary(
+    request: ExecutiveSummaryRequest = Depends(_follow_up(ExecutiveSummaryRequest)),
+    llm_client=Depends(get_llm_client),
+):
     """
     Generate executive summary for leadership using LLM.
     """
-    from services.llm_client import LLMClient
-
     project_context = {
         "project_name": request.project_name,
         "description": request.description,
@@ -171,18 +714,19 @@ async def executive_summary(request: ExecutiveSummaryRequest):
         },
     }
 
-    llm_client = LLMClient()
-    summary_text = llm_client.generate_executive_summary(project_context, metrics)
+    summary_text = await asyncio.to_thread(llm_client.generate_executive_summary, project_context, metrics)
 
     return ExecutiveSummaryResponse(summary_text=summary_text)
 
 
 @app.post("/task-breakdown", response_model=TaskBreakdownResponse)
-async def task_breakdown(request: TaskBreakdownRequest):
+async def task_breakdown(
+    request: TaskBreakdownRequest = Depends(_follow_up(TaskBreakdownRequest)),
+    llm_client=Depends(get_llm_client),
+):
     """
     Generate AI task breakdown with role and risk tags using LLM.
     """
-    from services.llm_client import LLMClient
     from models.schemas import TaskItem
     
     project_context = {
@@ -199,8 +743,7 @@ async def task_breakdown(request: TaskBreakdownRequest):
         "learning_curve": request.risk_scores.learning_curve,
     }
     
-    llm_client = LLMClient()
-    tasks_data = llm_client.generate_task_breakdown(project_context, risks)
+    tasks_data = await asyncio.to_thread(llm_client.generate_task_breakdown, project_context, risks)
     
     # Convert to TaskItem objects
     tasks = [
@@ -216,13 +759,14 @@ async def task_breakdown(request: TaskBreakdownRequest):
 
 
 @app.post("/execution-plan", response_model=ExecutionPlanResponse)
-async def execution_plan(request: ExecutionPlanRequest):
+async def execution_plan(
+    request: ExecutionPlanRequest = Depends(_follow_up(ExecutionPlanRequest)),
+    client=Depends(get_ollama_client),
+):
     """
     Generate a phased execution plan using local Ollama (gemini-3-flash-preview),
     with automatic fallback to Gemini cloud API and finally a static plan.
     """
-    from services.ollama_client import OllamaClient
-
     project_context = {
         "project_name": request.project_name,
         "description": request.description,
@@ -248,8 +792,7 @@ async def execution_plan(request: ExecutionPlanRequest):
         },
     }
 
-    client = OllamaClient()
-    result = client.generate_execution_plan(project_context, simulation_data)
+    result = await asyncio.to_thread(client.generate_execution_plan, project_context, simulation_data)
 
     # Coerce raw dicts into validated Pydantic models
     phases = [
@@ -1,5 +1,7 @@
 from typing import Optional, Literal
-from pydantic import BaseModel, Field
+
+import numpy as np
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 
 class SimulationRequest(BaseModel):
@@ -16,6 +18,48 @@ class SimulationRequest(BaseModel):
     integrations: int = Field(..., ge=0, description="Number of integrations (0-6+)")
     scope_volatility: int = Field(..., ge=0, le=100, description="Scope volatility 0-100")
     num_simulations: int = Field(1000, gt=0, description="Number of Monte Carlo runs")
+    seed: Optional[int] = Field(None, ge=0, description="RNG seed for reproducible results")
+    sampling: Literal["random", "antithetic", "lhs", "sobol"] = Field(
+        "random", description="Sampling strategy: random, antithetic, lhs (Latin hypercube) or sobol (scrambled QMC)"
+    )
+    # Adaptive mode: num_simulations becomes the run budget and the simulation
+    # stops as soon as the 95% confidence intervals are this tight
+    adaptive: bool = Field(False, description="Stop early once estimates have converged")
+    tolerance_weeks: float = Field(0.1, gt=0, description="Target CI half-width for P50/P90 (weeks)")
+    tolerance_probability: float = Field(0.01, gt=0, description="Target CI half-width for on-time probability")
+    max_seconds: Optional[float] = Field(None, gt=0, description="Wall-clock budget for adaptive runs")
+    # On-time probability curve, answered from one sort of the samples
+    include_cdf: bool = Field(False, description="Return P(finish <= week) over the simulated range")
+    cdf_deadlines: Optional[list[float]] = Field(
+        None, max_length=500, description="Deadlines (weeks) to return on-time probabilities for"
+    )
+    include_fan_bands: bool = Field(False, description="Return weekly P5-P95 bands of % work complete")
+    precision: Literal["float64", "float32"] = Field(
+        "float64", description="Floating-point type of the simulation arrays; float32 halves memory"
+    )
+    bypass_cache: bool = Field(False, description="Skip the /simulate result cache and refresh its entry")
+    # Gaussian copula over the four risk factors, in the order scope growth,
+    # integration delay, experience variance, unexpected delay
+    correlation: Optional[tuple[tuple[float, ...], ...]] = Field(
+        None, description="4x4 correlation matrix of the risk factors (None = independent)"
+    )
+
+    @field_validator("correlation")
+    @classmethod
+    def check_correlation(cls, value):
+        if value is None:
+            return value
+        if len(value) != 4 or any(len(row) != 4 for row in value):
+            raise ValueError("correlation must be a 4x4 matrix")
+        for i in range(4):
+            if value[i][i] != 1:
+                raise ValueError("correlation must have a unit diagonal")
+            for j in range(4):
+                if value[i][j] != value[j][i] or not -1 <= value[i][j] <= 1:
+                    raise ValueError("correlation must be symmetric with entries in [-1, 1]")
+        if np.linalg.eigvalsh(np.array(value, dtype=float)).min() < -1e-9:
+            raise ValueError("correlation must be positive semidefinite")
+        return value
 
 
 class HistogramBucket(BaseModel):
@@ -36,6 +80,33 @@ class RiskScores(BaseModel):
     learning_curve_uplift: Optional[str] = None
 
 
+class CdfPoint(BaseModel):
+    """Probability of finishing within the given number of weeks."""
+    weeks: float
+    probability: float = Field(..., ge=0, le=1)
+
+
+class FanBand(BaseModel):
+    """Percentiles of % work complete at one week of the project timeline."""
+    week: int
+    p5: float
+    p10: float
+    p25: float
+    p50: float
+    p75: float
+    p90: float
+    p95: float
+
+
+class SimulationPrecision(BaseModel):
+    """Achieved 95% confidence-interval half-widths of an adaptive simulation."""
+    p50_weeks: float
+    p90_weeks: float
+    on_time_probability: float
+    confidence_level: float
+    converged: bool
+
+
 class SimulationResponse(BaseModel):
     """Full simulation result with timeline, risks, costs, and allocation."""
     on_time_probability: float = Field(..., ge=0, le=1)
@@ -50,6 +121,102 @@ class SimulationResponse(BaseModel):
     currency: str
     role_allocation: dict[str, float]
     baseline_metrics: Optional[dict] = None
+    seed: Optional[int] = None
+    runs_used: Optional[int] = None
+    precision: Optional[SimulationPrecision] = None
+    cdf: Optional[list[CdfPoint]] = None
+    deadline_probabilities: Optional[list[CdfPoint]] = None
+    fan_bands: Optional[list[FanBand]] = None
+    peak_memory_mb: Optional[float] = Field(None, description="Accounted peak size of the simulation arrays (MiB)")
+    simulation_id: Optional[str] = Field(None, description="Handle for follow-up requests on this result")
+    fidelity: Literal["full", "reduced", "minimal"] = Field(
+        "full", description="Fidelity the result was computed at; lowered by /simulate under load"
+    )
+
+
+class BatchSimulationRequest(BaseModel):
+    """Many projects simulated in one call."""
+    projects: list[SimulationRequest] = Field(..., min_length=1, max_length=1000)
+
+
+class BatchSimulationResponse(BaseModel):
+    """Per-project simulation results, in request order."""
+    results: list[SimulationResponse]
+
+
+class ScenarioRequest(BaseModel):
+    """What-if scenario: a baseline project plus changes to evaluate."""
+    baseline: SimulationRequest
+    senior_delta: int = Field(0, description="Senior developers added (negative to remove)")
+    integrations_delta: int = Field(0, description="Integrations added (negative to remove)")
+    deadline_delta: int = Field(0, description="Weeks added to the deadline (negative to shorten)")
+
+
+class ScenarioResponse(BaseModel):
+    """Baseline and scenario results computed on the same random draws."""
+    baseline: SimulationResponse
+    scenario: SimulationResponse
+    delta: dict[str, float]
+
+
+class SensitivityImpact(BaseModel):
+    """Effect of moving one input a step down and up, relative to the baseline."""
+    input: str
+    step: float
+    down: Optional[dict[str, float]] = None  # None when the input is already at its lower bound
+    up: Optional[dict[str, float]] = None
+    swing_p50_weeks: float
+    swing_p90_weeks: float
+    swing_on_time_probability: float
+
+
+class SensitivityResponse(BaseModel):
+    """Tornado analysis, inputs ranked by their P90 swing."""
+    baseline: dict[str, float]
+    impacts: list[SensitivityImpact]
+    seed: int
+
+
+class SimulationSnapshot(BaseModel):
+    """Running aggregates of a streamed simulation after some of its runs."""
+    runs_completed: int
+    runs_total: int
+    p50_weeks: float
+    p90_weeks: float
+    on_time_probability: float = Field(..., ge=0, le=1)
+    expected_overrun_days: float = Field(..., ge=0)
+    histogram: list[HistogramBucket]
+
+
+class SimulationJobResponse(BaseModel):
+    """Status of an asynchronous /simulate job, with its result once it has succeeded."""
+    job_id: str
+    status: Literal["queued", "running", "succeeded", "failed", "cancelled"]
+    runs_completed: int
+    runs_total: int
+    progress: float = Field(..., ge=0, le=1)
+    result: Optional[SimulationResponse] = None
+    error: Optional[str] = None
+
+
+class SessionFollowUp(BaseModel):
+    """
+    Base for requests that build on a /simulate result. Given a
+    simulation_id, every field left out is filled in from that stored
+    simulation's inputs and results (by the route, before validation).
+    """
+    simulation_id: Optional[str] = Field(None, description="Id returned by /simulate")
+
+
+class FailureForecastRequest(SessionFollowUp, SimulationRequest):
+    """
+    Project inputs plus, optionally, the results /simulate already returned
+    for them, either as a simulation_id or as p90_weeks and risk_scores. With
+    those the forecast needs no simulation; otherwise a cached /simulate
+    result is reused when available.
+    """
+    p90_weeks: Optional[float] = Field(None, gt=0)
+    risk_scores: Optional[RiskScores] = None
 
 
 class FailureForecastResponse(BaseModel):
@@ -58,7 +225,7 @@ class FailureForecastResponse(BaseModel):
     mitigations: list[str] = Field(..., description="Top 3 mitigation recommendations")
 
 
-class ExecutiveSummaryRequest(BaseModel):
+class ExecutiveSummaryRequest(SessionFollowUp):
     """Request for executive summary generation."""
     project_name: str
     description: str
@@ -91,7 +258,7 @@ class TaskItem(BaseModel):
     risk_flag: Optional[str] = Field(None, description="e.g., 'High Risk', 'Dependency Bottleneck'")
 
 
-class TaskBreakdownRequest(BaseModel):
+class TaskBreakdownRequest(SessionFollowUp):
     """Request for AI task breakdown."""
     project_name: str
     description: str
@@ -111,9 +278,56 @@ class HealthResponse(BaseModel):
     status: str
 
 
+class CacheStatsResponse(BaseModel):
+    """Counters of the /simulate result cache."""
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    size: int
+    max_entries: int
+    ttl_seconds: float
+    hit_rate: float
+
+
+class ExecutorStatsResponse(BaseModel):
+    """Load on the thread pool that runs simulations off the event loop."""
+    workers: int
+    queued: int
+    running: int
+    completed: int
+    wait_ms_mean: float = Field(..., description="Mean time work waited for a thread, over recent work")
+    wait_ms_p99: float
+    wait_ms_max: float
+
+
+class AdmissionStatsResponse(BaseModel):
+    """Counters of the simulation admission controller."""
+    admitted: int
+    rejected_budget: int = Field(..., description="Refused with 429: client or global budget exhausted")
+    rejected_busy: int = Field(..., description="Refused with 503: queued work would push it past its deadline")
+    rejected_too_large: int = Field(..., description="Refused with 422: could never fit the deadline or budget")
+    inflight_seconds: float = Field(..., description="Estimated wall time of admitted, unfinished synchronous work")
+    background_seconds: float = Field(..., description="Estimated wall time of admitted, unfinished background jobs")
+    inflight_memory_mb: float = Field(..., description="Estimated peak array memory of admitted, unfinished work")
+    global_budget_seconds: float
+    ns_per_run: Optional[float] = None
+
+
+class FidelityStatsResponse(BaseModel):
+    """Current /simulate fidelity level and how often each level was served."""
+    level: Literal["full", "reduced", "minimal"]
+    served: dict[str, int]
+    step_downs: int
+    step_ups: int
+    latency_p95_ms: Optional[float] = None
+    queue_depth: int
+    slo_ms: float
+
+
 # ── Execution Plan ─────────────────────────────────────────────────────────
 
-class ExecutionPlanRequest(BaseModel):
+class ExecutionPlanRequest(SessionFollowUp):
     """Request for AI-generated execution plan."""
     # Project form fields
     project_name: str
@@ -155,3 +369,106 @@ class ExecutionPlanResponse(BaseModel):
     phases: list[ExecutionPlanPhase]
     go_no_go_checkpoints: list[dict]  # [{week: int, condition: str}]
     critical_path_note: str
+
+
+# ── Task-graph simulation ──────────────────────────────────────────────────
+
+class DagTask(BaseModel):
+    """One task in a dependency graph, with a three-point duration estimate."""
+    id: str
+    name: Optional[str] = None
+    optimistic_weeks: float = Field(..., ge=0)
+    likely_weeks: float = Field(..., ge=0)
+    pessimistic_weeks: float = Field(..., ge=0)
+    distribution: Literal["pert", "triangular"] = "pert"
+    depends_on: list[str] = Field(default_factory=list, description="Ids of tasks that must finish first")
+
+    @model_validator(mode="after")
+    def check_estimates(self):
+        if not self.optimistic_weeks <= self.likely_weeks <= self.pessimistic_weeks:
+            raise ValueError("Estimates must satisfy optimistic <= likely <= pessimistic")
+        return self
+
+
+class DagSimulationRequest(BaseModel):
+    """Monte Carlo over a task graph, given directly or derived from an execution plan."""
+    tasks: Optional[list[DagTask]] = Field(None, min_length=1, max_length=2000)
+    execution_plan: Optional[ExecutionPlanResponse] = None
+    deadline_weeks: Optional[float] = Field(None, gt=0)
+    num_simulations: int = Field(10000, gt=0, le=1_000_000)
+    seed: Optional[int] = Field(None, ge=0)
+
+    @model_validator(mode="after")
+    def check_graph_source(self):
+        if (self.tasks is None) == (self.execution_plan is None):
+            raise ValueError("Provide exactly one of tasks or execution_plan")
+        return self
+
+
+class DagTaskResult(BaseModel):
+    """Per-task outcome: how often the task was on the critical path."""
+    id: str
+    name: Optional[str] = None
+    criticality_index: float = Field(..., ge=0, le=1)
+    mean_duration_weeks: float
+    mean_finish_weeks: float
+
+
+class DagSimulationResponse(BaseModel):
+    """Project completion distribution and per-task criticality, ranked most critical first."""
+    p50_weeks: float
+    p80_weeks: float
+    p90_weeks: float
+    mean_weeks: float
+    on_time_probability: Optional[float] = None
+    histogram: list[HistogramBucket]
+    tasks: list[DagTaskResult]
+    seed: Optional[int] = None
+
+
+# ── Portfolio simulation ───────────────────────────────────────────────────
+
+class StaffPool(BaseModel):
+    """Developers shared by every project in a portfolio."""
+    junior: int = Field(..., ge=0)
+    mid: int = Field(..., ge=0)
+    senior: int = Field(..., ge=0)
+
+
+class PortfolioRequest(BaseModel):
+    """Concurrent projects competing for one staff pool; each project's team fields are its requested team."""
+    projects: list[SimulationRequest] = Field(..., min_length=1, max_length=200)
+    pool: StaffPool
+    policy: Literal["shared", "fixed"] = Field(
+        "shared", description="shared: freed staff move to running projects; fixed: shares set once at the start"
+    )
+    num_simulations: int = Field(10000, gt=0, le=200_000, description="Runs for the whole portfolio")
+    seed: Optional[int] = Field(None, ge=0)
+
+
+class PortfolioProjectResult(BaseModel):
+    """One project's outcome within the portfolio, next to its standalone estimate."""
+    project_name: str
+    p50_weeks: float
+    p90_weeks: float
+    on_time_probability: float = Field(..., ge=0, le=1)
+    expected_overrun_days: float = Field(..., ge=0)
+    standalone_p50_weeks: float
+    standalone_p90_weeks: float
+
+
+class PortfolioSummary(BaseModel):
+    """Portfolio-level outcome: completion of the last project and on-time counts."""
+    p50_weeks: float
+    p90_weeks: float
+    all_on_time_probability: float = Field(..., ge=0, le=1)
+    expected_projects_on_time: float
+    initial_staffing_share: float = Field(..., ge=0, le=1)
+    histogram: list[HistogramBucket]
+
+
+class PortfolioResponse(BaseModel):
+    """Per-project results in request order, plus the portfolio summary."""
+    projects: list[PortfolioProjectResult]
+    portfolio: PortfolioSummary
+    seed: Optional[int] = None
@@ -26,6 +26,21 @@ class LLMClient:
             except Exception as e:
                 print(f"[LLM] Warning: Could not initialize Gemini client: {e}")
 
+    def warm_up(self) -> bool:
+        """
+        Open the connection to the Gemini API ahead of the first request (a
+        free token count), so that request does not pay for the handshake.
+        """
+        if not self.client:
+            return False
+        try:
+            self.client.count_tokens("ping")
+            print(f"[LLM] Warmed up: {self.model_name}")
+            return True
+        except Exception as e:
+            print(f"[LLM] Warning: warm-up failed: {e}")
+            return False
+
     def _call_llm(self, prompt: str, retries: int = 2) -> Optional[str]:
         """Call Gemini with retries. Returns None if unavailable."""
         if not self.client:
@@ -120,8 +120,18 @@ class OllamaClient:
     with Gemini cloud and project-aware static fallbacks.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, llm_client: Optional[LLMClient] = None) -> None:
         self.model_name = os.getenv("OLLAMA_MODEL", "gemini-3-flash-preview")
+        # Gemini fallback; pass the application's shared client to reuse its connection
+        self.llm_client = llm_client
+        # ollama.Client is created on first use and kept, so its HTTP connections stay open
+        self._ollama = None
+
+    def _ollama_client(self):
+        if self._ollama is None:
+            from ollama import Client  # type: ignore[import]
+            self._ollama = Client()  # host from OLLAMA_HOST, as for the module-level chat()
+        return self._ollama
 
     def _call_ollama(self, prompt: str) -> Optional[str]:
         """
@@ -129,9 +139,9 @@ class OllamaClient:
         Returns model response text or None on any failure.
         """
         try:
-            from ollama import chat, ChatResponse  # type: ignore[import]
+            from ollama import ChatResponse  # type: ignore[import]
 
-            response: ChatResponse = chat(
+            response: ChatResponse = self._ollama_client().chat(
                 model=self.model_name,
                 messages=[{"role": "user", "content": prompt}],
                 options={"temperature": 0.3, "num_predict": 8192},
@@ -149,7 +159,9 @@ class OllamaClient:
     def _call_gemini(self, prompt: str) -> Optional[str]:
         """Use the existing Gemini LLMClient as a cloud fallback."""
         try:
-            llm = LLMClient()
+            if self.llm_client is None:
+                self.llm_client = LLMClient()
+            llm = self.llm_client
             if not llm.client:
                 print("[Ollama] Gemini fallback: no API client initialized")
                 return None
@@ -0,0 +1,585 @@
+"""
+In-process API tests using FastAPI's TestClient.
+"""
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from main import _simulate_cached, app
+from test_monte_carlo import make_request
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+def project_payload(**overrides) -> dict:
+    return make_request(**overrides).model_dump()
+
+
+def simulate_result(client, payload: dict) -> dict:
+    """A /simulate result with its per-call simulation_id blanked out."""
+    body = client.post("/simulate", json=payload).json()
+    assert body["simulation_id"]
+    return {**body, "simulation_id": None}
+
+
+def test_batch_matches_individual_simulations(client):
+    projects = [
+        project_payload(seed=1),
+        project_payload(seed=2, scope_size="small", integrations=0),
+        project_payload(seed=3, num_simulations=500, team_junior=4),
+        project_payload(seed=4, adaptive=True, num_simulations=3000),
+    ]
+    resp = client.post("/simulate/batch", json={"projects": projects})
+    assert resp.status_code == 200
+    results = resp.json()["results"]
+
+    assert len(results) == len(projects)
+    for project, result in zip(projects, results):
+        assert result == simulate_result(client, project)
+
+
+def test_startup_does_not_wait_for_llm_warm_up(monkeypatch, capsys):
+    import threading
+    import time
+
+    import main
+    from services.llm_client import LLMClient
+
+    release = threading.Event()
+    monkeypatch.setattr(LLMClient, "warm_up", lambda self: release.wait(5))
+    monkeypatch.setattr(main, "LLM_WARM_UP_TIMEOUT_SECONDS", 0.05)
+    start = time.perf_counter()
+    with TestClient(app) as fresh:
+        # Serving while the warm-up is still hanging
+        assert fresh.get("/health").status_code == 200
+        assert time.perf_counter() - start < 4
+        time.sleep(0.2)
+        release.set()
+    assert "warm-up timed out" in capsys.readouterr().out
+
+
+def test_batch_rejects_empty_project_list(client):
+    assert client.post("/simulate/batch", json={"projects": []}).status_code == 422
+
+
+def test_scenario_uses_common_random_numbers(client):
+    baseline = project_payload(seed=21)
+    resp = client.post("/scenario", json={"baseline": baseline, "senior_delta": 1})
+    assert resp.status_code == 200
+    body = resp.json()
+
+    # Baseline is the seeded /simulate result, and a senior dev can only help
+    assert body["baseline"] == simulate_result(client, baseline)
+    assert body["scenario"]["p50_weeks"] < body["baseline"]["p50_weeks"]
+    assert body["delta"]["p50_weeks"] == pytest.approx(
+        body["scenario"]["p50_weeks"] - body["baseline"]["p50_weeks"], abs=1e-6
+    )
+
+
+def test_float32_scenario_baseline_matches_float32_simulate(client):
+    baseline = project_payload(seed=22, precision="float32", include_cdf=True)
+    body = client.post("/scenario", json={"baseline": baseline, "senior_delta": 1}).json()
+    assert body["baseline"] == simulate_result(client, baseline)
+
+    # The CRN cache is keyed by precision, so a float64 run on the same seed is not served float32 draws
+    float64 = simulate_result(client, {**baseline, "precision": "float64"})
+    assert float64 != body["baseline"]
+    assert client.post("/scenario", json={"baseline": {**baseline, "precision": "float64"}}).json()["baseline"] == float64
+
+
+def test_scenario_deadline_change_only_moves_deadline_metrics(client):
+    baseline = project_payload()
+    body = client.post("/scenario", json={"baseline": baseline, "deadline_delta": 4}).json()
+
+    # Unseeded baselines get a stable seed, and the deadline does not touch the draws
+    assert body["delta"]["p50_weeks"] == 0
+    assert body["delta"]["p90_weeks"] == 0
+    assert body["delta"]["on_time_probability"] >= 0
+    again = client.post("/scenario", json={"baseline": baseline, "deadline_delta": 2}).json()
+    assert again["baseline"] == body["baseline"]
+
+
+def test_sensitivity_ranks_inputs_by_p90_swing(client):
+    resp = client.post("/sensitivity", json=project_payload(seed=5))
+    assert resp.status_code == 200
+    body = resp.json()
+
+    impacts = body["impacts"]
+    swings = [impact["swing_p90_weeks"] for impact in impacts]
+    assert swings == sorted(swings, reverse=True)
+    by_input = {impact["input"]: impact for impact in impacts}
+    assert by_input["team_senior"]["up"]["p90_weeks"] < 0
+    assert by_input["integrations"]["up"]["p90_weeks"] > 0
+    # The deadline changes on-time odds but not the completion distribution
+    assert by_input["deadline_weeks"]["swing_p90_weeks"] == 0
+    assert by_input["deadline_weeks"]["up"]["on_time_probability"] >= 0
+    # Complexity 4 can still go up to 5; scope volatility 60 has room both ways
+    assert by_input["complexity"]["up"] is not None
+    assert by_input["scope_volatility"]["down"] is not None
+
+
+def test_sensitivity_skips_directions_outside_bounds(client):
+    body = client.post("/sensitivity", json=project_payload(team_senior=0, complexity=5)).json()
+    by_input = {impact["input"]: impact for impact in body["impacts"]}
+    assert by_input["team_senior"]["down"] is None
+    assert by_input["complexity"]["up"] is None
+
+
+def test_dag_simulation_from_execution_plan(client):
+    plan = {
+        "phases": [
+            {"name": "Setup", "week_start": 1, "week_end": 2, "description": "", "tasks": [], "risks": [], "milestone": ""},
+            {
+                "name": "Build", "week_start": 3, "week_end": 6, "description": "", "risks": [], "milestone": "",
+                "tasks": [
+                    {"title": "API", "role": "BE", "priority": "high", "risk_flag": "High Risk"},
+                    {"title": "UI", "role": "FE", "priority": "medium"},
+                ],
+            },
+        ],
+        "go_no_go_checkpoints": [],
+        "critical_path_note": "",
+    }
+    resp = client.post("/simulate/dag", json={"execution_plan": plan, "deadline_weeks": 8, "seed": 4})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["tasks"][0]["id"] == "1" and body["tasks"][0]["criticality_index"] == 1.0
+    # The risk-flagged task has the longer tail, so it is critical more often
+    by_name = {task["name"]: task for task in body["tasks"]}
+    assert by_name["API"]["criticality_index"] > by_name["UI"]["criticality_index"]
+    assert 0 < body["on_time_probability"] < 1
+
+
+def test_dag_simulation_rejects_cycles(client):
+    tasks = [
+        {"id": "a", "optimistic_weeks": 1, "likely_weeks": 2, "pessimistic_weeks": 3, "depends_on": ["b"]},
+        {"id": "b", "optimistic_weeks": 1, "likely_weeks": 2, "pessimistic_weeks": 3, "depends_on": ["a"]},
+    ]
+    resp = client.post("/simulate/dag", json={"tasks": tasks})
+    assert resp.status_code == 422
+
+
+def test_portfolio_simulation(client):
+    projects = [project_payload(project_name=f"Project {i}", team_junior=1, team_mid=1, team_senior=1) for i in range(4)]
+    resp = client.post("/simulate/portfolio", json={
+        "projects": projects, "pool": {"junior": 2, "mid": 2, "senior": 2}, "num_simulations": 5000, "seed": 2,
+    })
+    assert resp.status_code == 200
+    body = resp.json()
+    assert [p["project_name"] for p in body["projects"]] == [p["project_name"] for p in projects]
+    assert body["portfolio"]["initial_staffing_share"] == 0.5
+    assert body["portfolio"]["p90_weeks"] >= max(p["p90_weeks"] for p in body["projects"])
+
+    resp = client.post("/simulate/portfolio", json={
+        "projects": projects, "pool": {"junior": 2, "mid": 2, "senior": 0},
+    })
+    assert resp.status_code == 422
+    assert "senior" in resp.json()["detail"]
+
+
+def test_simulate_serves_repeats_from_cache(client):
+    payload = project_payload(seed=31, deadline_weeks=13)
+    before = client.get("/cache/stats").json()
+    first = simulate_result(client, payload)
+    renamed = simulate_result(client, {**payload, "project_name": "Renamed", "description": "New text"})
+    stats = client.get("/cache/stats").json()
+
+    assert renamed == first
+    assert stats["misses"] == before["misses"] + 1
+    assert stats["hits"] == before["hits"] + 1
+
+    # Result-relevant fields are part of the key; bypass_cache forces a fresh run
+    client.post("/simulate", json={**payload, "deadline_weeks": 14})
+    bypassed = simulate_result(client, {**payload, "bypass_cache": True})
+    stats = client.get("/cache/stats").json()
+    assert bypassed == first
+    assert stats["misses"] == before["misses"] + 2
+    assert stats["hits"] == before["hits"] + 1
+
+
+def test_result_cache_evicts_least_recently_used_and_expired(monkeypatch):
+    import core.cache as cache
+
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    results = cache.ResultCache(max_entries=2, ttl_seconds=60)
+    results.put("a", 1)
+    results.put("b", 2)
+    assert results.get("a") == 1
+    results.put("c", 3)  # evicts "b", the least recently used
+    assert results.get("b") is None
+    assert results.get("a") == 1 and results.get("c") == 3
+
+    now[0] += 61
+    assert results.get("a") is None
+    stats = results.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["expirations"]) == (3, 2, 1, 1)
+    assert stats["size"] == 1
+
+
+def test_failure_forecast_reuses_simulation_results(client, monkeypatch):
+    import main
+
+    payload = project_payload(seed=37)
+    simulated = client.post("/simulate", json=payload).json()
+
+    def no_simulation(*args, **kwargs):
+        raise AssertionError("failure forecast re-ran the Monte Carlo step")
+
+    monkeypatch.setattr(main, "_run_monte_carlo", no_simulation)
+
+    # Prior results passed in; other inputs are not in the cache
+    prior = {"p90_weeks": simulated["p90_weeks"], "risk_scores": simulated["risk_scores"]}
+    resp = client.post("/failure-forecast", json={**payload, "seed": 38, **prior})
+    assert resp.status_code == 200
+    assert resp.json()["failure_story"]
+
+    # Same inputs without prior results: served from the /simulate cache
+    assert client.post("/failure-forecast", json=payload).status_code == 200
+
+
+def test_follow_up_endpoints_accept_simulation_id(client):
+    payload = project_payload(seed=41)
+    simulated = client.post("/simulate", json=payload).json()
+    simulation_id = simulated["simulation_id"]
+
+    assert client.get(f"/simulations/{simulation_id}").json() == simulated
+    for path in ("/executive-summary", "/task-breakdown", "/execution-plan", "/failure-forecast"):
+        assert client.post(path, json={"simulation_id": simulation_id}).status_code == 200
+
+    # Deadline questions are answered from the stored samples
+    resp = client.get(f"/simulations/{simulation_id}/deadline-probabilities", params={"weeks": [payload["deadline_weeks"], 1000]})
+    probabilities = [point["probability"] for point in resp.json()]
+    assert probabilities == [pytest.approx(simulated["on_time_probability"], abs=1e-3), 1.0]
+
+    assert client.get("/simulations/missing").status_code == 404
+    assert client.post("/task-breakdown", json={"simulation_id": "missing"}).status_code == 404
+
+
+def test_llm_routes_share_lifespan_clients(client, monkeypatch):
+    import services.llm_client as llm_client
+
+    assert client.app.state.ollama_client.llm_client is client.app.state.llm_client
+
+    def no_new_client(self):
+        raise AssertionError("route built a new LLM client")
+
+    monkeypatch.setattr(llm_client.LLMClient, "__init__", no_new_client)
+
+    simulation_id = client.post("/simulate", json=project_payload(seed=42)).json()["simulation_id"]
+    for path in ("/executive-summary", "/task-breakdown", "/execution-plan", "/failure-forecast"):
+        assert client.post(path, json={"simulation_id": simulation_id}).status_code == 200
+
+
+def test_sqlite_session_store_bounds(tmp_path, monkeypatch):
+    import core.sessions as sessions
+
+    request = make_request(seed=43)
+    response, samples = _simulate_cached(request)
+    store = sessions.SqliteSessionStore(str(tmp_path / "sessions.db"), max_entries=2, ttl_seconds=60)
+    first = store.save(request, response, samples)
+    second = store.save(request, response, None)
+
+    assert store.get(second).samples is None
+    session = store.get(first)
+    assert session.request == request and session.response == response
+    assert np.array_equal(session.samples, samples)
+
+    store.save(request, response, None)  # evicts second, the least recently used
+    assert store.get(second) is None and store.get(first) is not None
+
+    now = sessions.time.time()
+    monkeypatch.setattr(sessions.time, "time", lambda: now + 61)
+    assert store.get(first) is None
+
+
+def test_simulation_job_reports_progress_and_result(client):
+    import time
+
+    payload = project_payload(seed=47, num_simulations=200_000)
+    resp = client.post("/simulate/jobs", json=payload)
+    assert resp.status_code == 202
+    job = resp.json()
+    assert job["status"] in ("queued", "running", "succeeded") and job["runs_total"] == 200_000
+
+    deadline = time.monotonic() + 30
+    while job["status"] in ("queued", "running") and time.monotonic() < deadline:
+        time.sleep(0.02)
+        job = client.get(f"/simulate/jobs/{job['job_id']}").json()
+    assert job["status"] == "succeeded"
+    assert (job["runs_completed"], job["progress"]) == (200_000, 1.0)
+    assert {**job["result"], "simulation_id": None} == simulate_result(client, payload)
+    assert client.get(f"/simulations/{job['result']['simulation_id']}").status_code == 200
+
+    assert client.get("/simulate/jobs/missing").status_code == 404
+
+
+def test_job_manager_cancels_and_bounds_jobs():
+    import threading
+
+    from core.jobs import JobManager, JobQueueFull
+
+    manager = JobManager(max_workers=1, max_pending=2, retention_seconds=60, max_retained=1)
+    started = threading.Event()
+
+    def endless(report):
+        started.set()
+        runs = 0
+        while True:
+            runs += 1000
+            report(runs)
+
+    running = manager.submit(endless, runs_total=10**9)
+    queued = manager.submit(lambda report: "done", runs_total=1)
+    with pytest.raises(JobQueueFull):
+        manager.submit(lambda report: "done", runs_total=1)
+
+    started.wait(5)
+    assert manager.cancel(queued.job_id).status == "cancelled"
+    manager.cancel(running.job_id)
+    running.future.result(timeout=5)
+    assert running.status == "cancelled" and running.runs_completed > 0
+
+    # Only the most recently finished job is retained
+    finished = manager.submit(lambda report: "done", runs_total=1)
+    finished.future.result(timeout=5)
+    assert manager.get(finished.job_id).snapshot()["result"] == "done"
+    assert manager.get(running.job_id) is None and manager.get(queued.job_id) is None
+    manager.shutdown()
+
+
+def parse_sse(text: str) -> list[tuple[str, dict]]:
+    import json
+
+    events = []
+    for message in text.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in message.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def test_simulate_stream_sends_snapshots_then_result(client):
+    payload = project_payload(seed=53, num_simulations=200_000, bypass_cache=True)
+    with client.stream("POST", "/simulate/stream", json=payload) as resp:
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/event-stream")
+        events = parse_sse(resp.read().decode())
+
+    names = [name for name, _ in events]
+    assert names == ["snapshot"] * 4 + ["complete"]
+    runs = [data["runs_completed"] for _, data in events[:-1]]
+    assert runs == [65536, 131072, 196608, 200_000]
+
+    final = events[-1][1]
+    last_snapshot = events[-2][1]
+    assert final["p90_weeks"] == last_snapshot["p90_weeks"]
+    assert final["histogram"] == last_snapshot["histogram"]
+    assert {**final, "simulation_id": None} == simulate_result(client, payload)
+
+
+def test_simulations_run_on_the_offload_pool(client, monkeypatch):
+    import threading
+
+    import main
+
+    threads = []
+    simulate_and_cache = main._simulate_and_cache
+
+    def recording(*args, **kwargs):
+        threads.append(threading.current_thread().name)
+        return simulate_and_cache(*args, **kwargs)
+
+    monkeypatch.setattr(main, "_simulate_and_cache", recording)
+    before = client.get("/executor/stats").json()
+    assert client.post("/simulate", json=project_payload(seed=59, bypass_cache=True)).status_code == 200
+    stats = client.get("/executor/stats").json()
+
+    assert len(threads) == 1 and threads[0].startswith("simulation-offload")
+    assert stats["completed"] == before["completed"] + 1
+    assert stats["queued"] == stats["running"] == 0
+    assert 0 <= stats["wait_ms_mean"] <= stats["wait_ms_p99"] <= stats["wait_ms_max"]
+
+
+def test_admission_controller_budgets_and_deadline(monkeypatch):
+    from core import admission, offload
+
+    now = [100.0]
+    monkeypatch.setattr(admission.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(offload, "_offload", offload.OffloadExecutor(0))  # one queue for simulations
+    controller = admission.AdmissionController(
+        max_seconds=5, client_burst=4.5, client_rate=0.5, global_burst=10, global_rate=1, seconds_per_run=1e-6,
+    )
+    one_second = make_request(num_simulations=1_000_000)  # ~1 compute-second at 1 µs per run
+
+    def refusal(client, request):
+        with pytest.raises(admission.AdmissionRejected) as refused:
+            controller.admit(client, [request])
+        return refused.value.status_code, refused.value.headers()
+
+    assert refusal("a", make_request(num_simulations=10_000_000)) == (422, None)
+
+    # Background jobs run on their own pool, so they do not delay synchronous work
+    job = controller.admit("e", [make_request(num_simulations=4_000_000)], deadline=False)
+    controller.admit("f", [make_request(num_simulations=4_200_000)]).release(refund=True)
+    job.release(refund=True)
+
+    for _ in range(4):
+        controller.admit("a", [one_second]).release()
+    # Client "a" has ~0.5 s left and refills at 0.5 s/s
+    assert refusal("a", one_second) == (429, {"Retry-After": "2"})
+
+    # Other clients have their own budget, but must fit behind admitted work
+    held = controller.admit("b", [one_second])
+    assert refusal("c", make_request(num_simulations=4_200_000)) == (503, {"Retry-After": "2"})
+    held.release()
+    controller.admit("c", [make_request(num_simulations=4_200_000)]).release()
+
+    # The shared 10 s budget is now nearly spent
+    assert refusal("d", one_second) == (429, {"Retry-After": "1"})
+    now[0] += 2
+    controller.admit("d", [one_second]).release(refund=True)
+
+    stats = controller.stats()
+    assert (stats["admitted"], stats["rejected_budget"], stats["rejected_busy"], stats["rejected_too_large"]) == (9, 2, 1, 1)
+    assert stats["inflight_seconds"] == stats["background_seconds"] == 0
+
+
+def test_admission_charges_materialised_memory():
+    from core import admission
+    from core.sensitivity import MAX_VARIANTS, sensitivity_memory_mb
+
+    controller = admission.AdmissionController(seconds_per_run=1e-9, max_memory_mb=100)
+    exact = make_request(num_simulations=500_000)
+    assert 0 < controller.estimate_memory_mb(exact) < 20
+
+    # Sensitivity keeps every variant's samples below the streaming threshold,
+    # and only sketches above it, so big runs stay bounded
+    assert sensitivity_memory_mb(exact) > MAX_VARIANTS * controller.estimate_memory_mb(exact) / 4
+    assert sensitivity_memory_mb(make_request(num_simulations=3_000_000)) < 80
+    with pytest.raises(admission.AdmissionRejected) as refused:
+        controller.admit("a", [exact] * MAX_VARIANTS, memory_mb=sensitivity_memory_mb(exact))
+    assert refused.value.status_code == 422
+
+    held = controller.admit("a", [exact], memory_mb=60)
+    with pytest.raises(admission.AdmissionRejected) as refused:
+        controller.admit("b", [exact], memory_mb=50)
+    assert refused.value.status_code == 503
+    assert controller.stats()["inflight_memory_mb"] == 60
+    held.release()
+    controller.admit("b", [exact], memory_mb=50).release()
+    assert controller.stats()["inflight_memory_mb"] == 0
+
+
+def test_simulate_refuses_work_over_budget(client, monkeypatch):
+    from core import admission
+
+    payload = project_payload(seed=61)
+    client.post("/simulate", json=payload)
+    monkeypatch.setattr(admission, "_controller", admission.AdmissionController(
+        client_burst=0.003, client_rate=1e-3, seconds_per_run=1e-6,
+    ))
+
+    # 1,000 runs plus overhead cost 2 ms of the 3 ms budget
+    assert client.post("/simulate", json={**payload, "bypass_cache": True}).status_code == 200
+    resp = client.post("/simulate", json={**payload, "bypass_cache": True})
+    assert resp.status_code == 429
+    assert int(resp.headers["Retry-After"]) >= 1
+    # Cached results cost nothing and are still served
+    assert client.post("/simulate", json=payload).status_code == 200
+
+    resp = client.post("/simulate", json=project_payload(num_simulations=50_000_000))
+    assert resp.status_code == 422
+
+
+def test_dag_and_portfolio_are_admitted_by_their_size(client, monkeypatch):
+    from core import admission
+
+    controller = admission.AdmissionController(max_seconds=1, seconds_per_run=1e-6)
+    monkeypatch.setattr(admission, "_controller", controller)
+    tasks = [
+        {"id": str(i), "optimistic_weeks": 1, "likely_weeks": 2, "pessimistic_weeks": 3,
+         "depends_on": [str(i - 1)] if i else []}
+        for i in range(20)
+    ]
+    projects = [project_payload(project_name=f"Project {i}") for i in range(20)]
+    portfolio = {"projects": projects, "pool": {"junior": 9, "mid": 9, "senior": 9}}
+
+    # 20 tasks or projects x 10,000 runs fit in the one-second deadline, x 100,000 runs do not
+    assert client.post("/simulate/dag", json={"tasks": tasks, "num_simulations": 10_000}).status_code == 200
+    assert client.post("/simulate/dag", json={"tasks": tasks, "num_simulations": 100_000}).status_code == 422
+    assert client.post("/simulate/portfolio", json={**portfolio, "num_simulations": 10_000}).status_code == 200
+    assert client.post("/simulate/portfolio", json={**portfolio, "num_simulations": 100_000}).status_code == 422
+
+    stats = controller.stats()
+    assert (stats["admitted"], stats["rejected_too_large"]) == (2, 2)
+    assert stats["inflight_seconds"] == stats["inflight_memory_mb"] == 0
+
+
+def test_fidelity_steps_down_under_pressure_and_recovers(monkeypatch):
+    from core import fidelity
+
+    now = [0.0]
+    monkeypatch.setattr(fidelity.time, "monotonic", lambda: now[0])
+    controller = fidelity.FidelityController(slo_seconds=1.0, queue_limit=4, step_down_seconds=1, cooldown_seconds=10)
+
+    def serve(latency: float, queue_depth: int = 0, count: int = 5) -> str:
+        for _ in range(count):
+            level = controller.level(queue_depth)
+            controller.record(level, latency)
+        return controller.level(queue_depth)
+
+    assert serve(0.2) == "full"
+    assert serve(3.0) == "reduced"
+    now[0] += 1
+    assert serve(0.2, queue_depth=4) == "minimal"
+    # Fast again, but nothing moves up until the cooldown has passed
+    now[0] += 5
+    assert serve(0.2) == "minimal"
+    now[0] += 5
+    assert serve(0.2) == "reduced"
+    now[0] += 10
+    assert serve(0.2) == "full"
+
+    stats = controller.stats()
+    assert (stats["step_downs"], stats["step_ups"]) == (2, 2)
+    assert sum(stats["served"].values()) == 30
+
+    request = make_request(num_simulations=20_000, include_fan_bands=True)
+    assert fidelity.degrade(request, "reduced").num_simulations == 5000
+    minimal = fidelity.degrade(request, "minimal")
+    assert (minimal.num_simulations, minimal.precision, minimal.include_fan_bands) == (250, "float32", False)
+
+
+def test_simulate_reports_degraded_fidelity(client, monkeypatch):
+    from core import fidelity
+    from core.sessions import get_session_store
+
+    controller = fidelity.FidelityController()
+    controller.index = fidelity.FIDELITY_LEVELS.index("reduced")
+    controller.last_change = float("inf")  # hold the level for the test
+    monkeypatch.setattr(fidelity, "_controller", controller)
+
+    payload = project_payload(seed=67, num_simulations=8000)
+    body = client.post("/simulate", json=payload).json()
+    assert (body["fidelity"], body["runs_used"]) == ("reduced", 2000)
+    # Its session holds the degraded request that produced it
+    session = get_session_store().get(body["simulation_id"])
+    assert session.request.num_simulations == 2000
+    stats = client.get("/fidelity/stats").json()
+    assert stats["level"] == "reduced" and stats["served"]["reduced"] == 1
+
+    # The default 1,000 runs are halved; a request too small to shed is served as full
+    body = client.post("/simulate", json=project_payload(seed=68)).json()
+    assert (body["fidelity"], body["runs_used"]) == ("reduced", 500)
+    body = client.post("/simulate", json=project_payload(seed=68, num_simulations=400)).json()
+    assert (body["fidelity"], body["runs_used"]) == ("full", 400)
+
+    # Degraded results are never served for a full-fidelity request
+    controller.index = 0
+    body = client.post("/simulate", json=project_payload(seed=68)).json()
+    assert (body["fidelity"], body["runs_used"]) == ("full", 1000)
@@ -0,0 +1,624 @@
+"""
+Unit tests for the Monte Carlo simulation engine.
+"""
+
+import multiprocessing
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from core.estimation import calculate_base_effort
+from core.monte_carlo import (
+    BLOCK_SIZE,
+    block_generator,
+    block_layout,
+    completion_weeks_from_normals,
+    draw_block_normals,
+    draw_normals,
+    kernel_params,
+    root_seed_sequence,
+    run_monte_carlo,
+    run_monte_carlo_adaptive,
+)
+from core.parallel import run_monte_carlo_parallel
+from core.sampling import norm_ppf
+from core.sketch import QuantileSketch
+from models.schemas import SimulationRequest
+
+
+def make_request(**overrides) -> SimulationRequest:
+    fields = {
+        "project_name": "E-commerce Platform",
+        "description": "A full-stack e-commerce platform with payment integration",
+        "scope_size": "large",
+        "complexity": 4,
+        "stack": "React + Node",
+        "deadline_weeks": 12,
+        "team_junior": 2,
+        "team_mid": 2,
+        "team_senior": 1,
+        "integrations": 3,
+        "scope_volatility": 60,
+        "num_simulations": 1000,
+    }
+    fields.update(overrides)
+    return SimulationRequest(**fields)
+
+
+def reference_loop(request: SimulationRequest, base_effort: dict) -> np.ndarray:
+    """The original one-run-at-a-time sampler, kept as a statistical reference."""
+    n_simulations = request.num_simulations
+    base_days = base_effort["base_effort_days"]
+    scope_volatility = base_effort["scope_volatility_factor"]
+    team_size = max(1, base_effort["total_team_size"])
+
+    completion_days = np.zeros(n_simulations)
+    for i in range(n_simulations):
+        scope_growth = np.random.normal(1.0, 0.15 * scope_volatility + 0.05)
+        scope_growth = max(0.8, min(1.5, scope_growth))
+
+        integration_delay_factor = 1.0
+        if request.integrations > 0:
+            integration_delay_factor = np.random.lognormal(0.0, 0.08 * request.integrations)
+            integration_delay_factor = min(1.5, integration_delay_factor)
+
+        experience_variance = 1.0
+        if base_effort["total_team_size"] > 0:
+            junior_ratio = request.team_junior / base_effort["total_team_size"]
+            experience_variance = np.random.normal(1.0, 0.1 + (junior_ratio * 0.15))
+            experience_variance = max(0.7, min(1.4, experience_variance))
+
+        unexpected_factor = min(1.3, np.random.lognormal(0.0, 0.12))
+
+        effort_days = base_days * scope_growth * integration_delay_factor * experience_variance * unexpected_factor
+        completion_days[i] = effort_days / team_size
+
+    return completion_days / 5.0
+
+
+def ks_statistic(a: np.ndarray, b: np.ndarray) -> float:
+    """Two-sample Kolmogorov-Smirnov statistic."""
+    grid = np.concatenate([a, b])
+    cdf_a = np.searchsorted(np.sort(a), grid, side="right") / len(a)
+    cdf_b = np.searchsorted(np.sort(b), grid, side="right") / len(b)
+    return float(np.max(np.abs(cdf_a - cdf_b)))
+
+
+@pytest.mark.parametrize("overrides", [
+    {},
+    {"integrations": 0, "scope_volatility": 0},
+    {"team_junior": 0, "team_mid": 0, "team_senior": 0, "integrations": 7},
+])
+def test_vectorized_kernel_matches_reference_loop(overrides):
+    np.random.seed(1234)
+    request = make_request(num_simulations=20_000, seed=99, **overrides)
+    base_effort = calculate_base_effort(request)
+
+    expected = reference_loop(request, base_effort)
+    actual = np.asarray(run_monte_carlo(request, base_effort)["completion_samples"])
+
+    # KS critical value at alpha = 0.001 for two equal samples of size n
+    n = len(actual)
+    critical = 1.95 * np.sqrt(2.0 / n)
+    assert ks_statistic(actual, expected) < critical
+    assert actual.max() <= expected.max() * 1.05
+    for q in (10, 50, 90):
+        assert np.percentile(actual, q) == pytest.approx(np.percentile(expected, q), rel=0.02)
+
+
+def test_run_monte_carlo_summary_fields():
+    request = make_request()
+    results = run_monte_carlo(request, calculate_base_effort(request))
+
+    assert results["p50_weeks"] <= results["p90_weeks"]
+    assert 0.0 <= results["on_time_probability"] <= 1.0
+    assert results["expected_overrun_days"] >= 0.0
+    assert sum(b.count for b in results["histogram"]) == request.num_simulations
+    assert len(results["completion_samples"]) == request.num_simulations
+
+    samples = np.asarray(results["completion_samples"])
+    min_week = max(0, int(samples.min()) - 1)
+    hist, _ = np.histogram(samples, bins=range(min_week, int(samples.max()) + 3))
+    assert [b.count for b in results["histogram"]] == hist.tolist()
+    assert results["histogram"][0].bucket_center_weeks == min_week + 0.5
+
+
+def test_same_seed_reproduces_results():
+    request = make_request(num_simulations=5000, seed=42)
+    base_effort = calculate_base_effort(request)
+
+    first = run_monte_carlo(request, base_effort)
+    second = run_monte_carlo(request, base_effort)
+    assert np.array_equal(first.pop("completion_samples"), second.pop("completion_samples"))
+    assert first == second
+
+    other = run_monte_carlo(make_request(num_simulations=5000, seed=43), base_effort)
+    assert not np.array_equal(other["completion_samples"], run_monte_carlo(request, base_effort)["completion_samples"])
+
+
+def test_block_streams_match_seed_sequence_spawn():
+    root = root_seed_sequence(7)
+    children = root_seed_sequence(7).spawn(3)
+    for index, child in enumerate(children):
+        expected = np.random.Generator(np.random.PCG64(child)).standard_normal(8)
+        assert np.array_equal(block_generator(root, index).standard_normal(8), expected)
+
+
+def test_blocks_drawn_independently_are_bit_identical():
+    n = 2 * BLOCK_SIZE + 123
+    root = root_seed_sequence(2024)
+    z = draw_normals(root, n)
+
+    # Draw the blocks out of order, as parallel workers would
+    layout = block_layout(n)
+    starts = np.cumsum([0] + layout[:-1])
+    for block_index in reversed(range(len(layout))):
+        size = layout[block_index]
+        block = block_generator(root, block_index).standard_normal((4, size))
+        assert np.array_equal(z[:, starts[block_index]:starts[block_index] + size], block)
+
+
+def test_parallel_run_matches_serial_streaming_run():
+    request = make_request(num_simulations=3 * BLOCK_SIZE + 500, seed=11)
+    base_effort = calculate_base_effort(request)
+
+    serial = run_monte_carlo(request, base_effort, streaming=True)
+    with ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("forkserver")) as executor:
+        parallel = run_monte_carlo_parallel(request, base_effort, executor=executor)
+
+    assert parallel == serial
+
+    # Workers ship sketches, not samples; the exact percentiles agree within the API's rounding
+    exact = run_monte_carlo(request, base_effort, streaming=False)
+    assert abs(parallel["p50_weeks"] - exact["p50_weeks"]) <= 0.1
+    assert abs(parallel["p90_weeks"] - exact["p90_weeks"]) <= 0.1
+    assert parallel["on_time_probability"] == exact["on_time_probability"]
+
+
+def test_sketch_quantiles_within_relative_error_bound():
+    rng = np.random.default_rng(5)
+    values = rng.lognormal(3.0, 0.4, size=200_000)
+    qs = [0.01, 0.1, 0.5, 0.9, 0.99]
+
+    sketch = QuantileSketch()
+    for batch in np.array_split(values, 7):
+        part = QuantileSketch()
+        part.add(batch)
+        sketch.merge(part)
+
+    exact = np.percentile(values, [q * 100 for q in qs])
+    error = np.abs(sketch.quantiles(qs) - exact) / exact
+    assert sketch.count == len(values)
+    assert np.all(error <= sketch.relative_accuracy)
+
+
+def test_sketch_memory_is_bounded():
+    sketch = QuantileSketch(max_buckets=256)
+    sketch.add(np.geomspace(1e-3, 1e6, 100_000))
+    assert len(sketch.counts) == 256
+    assert sketch.count == 100_000
+    assert sketch.quantile(0.99) == pytest.approx(np.percentile(np.geomspace(1e-3, 1e6, 100_000), 99), rel=1e-3)
+
+
+def test_streaming_mode_uses_constant_memory():
+    def peak_bytes(n):
+        request = make_request(num_simulations=n, seed=3)
+        base_effort = calculate_base_effort(request)
+        tracemalloc.start()
+        results = run_monte_carlo(request, base_effort, streaming=True)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        assert "completion_samples" not in results
+        assert sum(b.count for b in results["histogram"]) == n
+        return peak
+
+    assert peak_bytes(8 * BLOCK_SIZE) < 1.2 * peak_bytes(2 * BLOCK_SIZE)
+
+
+def test_streaming_percentiles_match_exact_within_rounding():
+    request = make_request(num_simulations=300_000, seed=8)
+    base_effort = calculate_base_effort(request)
+
+    exact = run_monte_carlo(request, base_effort, streaming=False)
+    streamed = run_monte_carlo(request, base_effort, streaming=True)
+    for key in ("p50_weeks", "p90_weeks"):
+        assert streamed[key] == pytest.approx(exact[key], abs=0.1)
+    for key in ("on_time_probability", "expected_overrun_days", "histogram"):
+        assert streamed[key] == exact[key]
+
+
+def test_adaptive_run_stops_once_converged():
+    # Small, stable project with a generous deadline: converges quickly
+    request = make_request(
+        scope_size="small", complexity=1, integrations=0, scope_volatility=0,
+        deadline_weeks=40, num_simulations=100_000, seed=4,
+    )
+    results = run_monte_carlo_adaptive(request, calculate_base_effort(request), tolerance_weeks=0.1)
+
+    precision = results["precision"]
+    assert precision["converged"]
+    assert results["runs_used"] < 20_000
+    assert precision["p50_weeks"] <= 0.1 and precision["p90_weeks"] <= 0.1
+    assert precision["on_time_probability"] <= 0.01
+    assert len(results["completion_samples"]) == results["runs_used"]
+
+
+def test_adaptive_run_respects_run_budget_and_is_reproducible():
+    request = make_request(num_simulations=5000, seed=9)
+    base_effort = calculate_base_effort(request)
+
+    results = run_monte_carlo_adaptive(request, base_effort, tolerance_weeks=0.001)
+    assert results["runs_used"] == 5000
+    assert not results["precision"]["converged"]
+    again = run_monte_carlo_adaptive(request, base_effort, tolerance_weeks=0.001)
+    assert np.array_equal(again.pop("completion_samples"), results.pop("completion_samples"))
+    assert again == results
+
+
+def test_norm_ppf_matches_standard_library():
+    from statistics import NormalDist
+
+    u = np.array([1e-12, 1e-4, 0.01, 0.02425, 0.2, 0.5, 0.8, 0.99, 1 - 1e-9])
+    expected = np.array([NormalDist().inv_cdf(x) for x in u])
+    assert np.allclose(norm_ppf(u), expected, rtol=1e-8, atol=1e-8)
+
+
+@pytest.mark.parametrize("sampling", ["antithetic", "lhs", "sobol"])
+def test_sampling_modes_preserve_distribution_and_reduce_variance(sampling):
+    base_request = make_request(num_simulations=4096)
+    base_effort = calculate_base_effort(base_request)
+
+    def p90_samples(method):
+        p90s, pooled = [], []
+        for seed in range(30):
+            request = base_request.model_copy(update={"seed": seed, "sampling": method})
+            samples = np.asarray(run_monte_carlo(request, base_effort)["completion_samples"])
+            p90s.append(np.percentile(samples, 90))
+            pooled.append(samples)
+        return np.std(p90s), np.concatenate(pooled)
+
+    random_std, random_pooled = p90_samples("random")
+    method_std, method_pooled = p90_samples(sampling)
+
+    assert ks_statistic(method_pooled, random_pooled) < 1.95 * np.sqrt(2.0 / len(random_pooled))
+    assert method_std < random_std
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_deadline_curve_answers_any_deadline_from_one_simulation(streaming):
+    deadlines = [10.0, 20.0, 30.0, 40.0]
+    request = make_request(num_simulations=50_000, seed=6, include_cdf=True, cdf_deadlines=deadlines)
+    base_effort = calculate_base_effort(request)
+    results = run_monte_carlo(request, base_effort, streaming=streaming)
+
+    exact = run_monte_carlo(request, base_effort, streaming=False)["completion_samples"]
+    for point, deadline in zip(results["deadline_probabilities"], deadlines):
+        expected = np.mean(np.asarray(exact) <= deadline)
+        assert point["probability"] == pytest.approx(expected, abs=0.002)
+
+    curve = results["cdf"]
+    probabilities = [point["probability"] for point in curve]
+    assert probabilities == sorted(probabilities)
+    assert probabilities[-1] == 1.0
+    assert 0 < len(curve) <= 100
+
+
+def test_fan_bands_match_per_run_progress_trajectories():
+    request = make_request(num_simulations=20_001, seed=12, include_fan_bands=True)
+    results = run_monte_carlo(request, calculate_base_effort(request))
+    bands = results["fan_bands"]
+
+    # Brute force: every run's S-curve trajectory, percentiles taken per week
+    from core.monte_carlo import progress_s_curve
+    samples = np.asarray(results["completion_samples"])
+    weeks = np.array([band["week"] for band in bands], dtype=float)
+    trajectories = 100.0 * progress_s_curve(weeks[None, :] / samples[:, None])
+    for p in (5, 10, 25, 50, 75, 90, 95):
+        expected = np.percentile(trajectories, p, axis=0)
+        assert np.allclose([band[f"p{p}"] for band in bands], expected, atol=0.06)
+
+    assert bands[0]["p95"] == 0.0 and bands[-1]["p5"] == 100.0
+    assert all(b["p5"] <= b["p10"] <= b["p25"] <= b["p50"] <= b["p75"] <= b["p90"] <= b["p95"] for b in bands)
+    assert len(bands) <= 105
+
+
+def test_fan_bands_payload_is_fixed_size():
+    request = make_request(
+        scope_size="large", complexity=5, team_junior=1, team_mid=0, team_senior=0,
+        num_simulations=5000, seed=1, include_fan_bands=True,
+    )
+    results = run_monte_carlo(request, calculate_base_effort(request))
+    assert results["p90_weeks"] > 105
+    assert len(results["fan_bands"]) <= 105
+
+
+EQUICORRELATED = tuple(tuple(1.0 if i == j else 0.6 for j in range(4)) for i in range(4))
+
+
+def test_correlated_draws_keep_marginals_and_hit_target_correlation():
+    from core.sampling import cholesky_factor, standard_normals
+
+    z = standard_normals(np.random.default_rng(2), 4, 200_000, "random", EQUICORRELATED)
+    assert np.allclose(np.corrcoef(z), EQUICORRELATED, atol=0.01)
+    assert np.allclose(z.std(axis=1), 1.0, atol=0.01)
+    # The factor is computed once per matrix
+    assert cholesky_factor(EQUICORRELATED) is cholesky_factor(EQUICORRELATED)
+
+    # Perfect correlation is positive semidefinite, not definite, and still factorises
+    ones = tuple(tuple(1.0 for _ in range(4)) for _ in range(4))
+    z = standard_normals(np.random.default_rng(2), 4, 1000, "random", ones)
+    assert np.allclose(z, z[0], atol=1e-4)
+
+
+def test_positive_correlation_widens_the_tail():
+    from core.batch import run_monte_carlo_batch
+
+    request = make_request(num_simulations=50_000, seed=8)
+    correlated = request.model_copy(update={"correlation": EQUICORRELATED})
+    base_effort = calculate_base_effort(request)
+    independent = run_monte_carlo(request, base_effort)
+    results = run_monte_carlo(correlated, base_effort)
+    assert results["p90_weeks"] > independent["p90_weeks"] + 1
+    assert abs(results["p50_weeks"] - independent["p50_weeks"]) < 1
+
+    # The batch path draws the same correlated streams
+    results.pop("completion_samples")
+    assert run_monte_carlo_batch([correlated], [base_effort])[0] == results
+
+
+def test_correlation_matrix_is_validated():
+    with pytest.raises(ValueError, match="positive semidefinite"):
+        make_request(correlation=[[1, 0.9, -0.9, 0], [0.9, 1, 0.9, 0], [-0.9, 0.9, 1, 0], [0, 0, 0, 1]])
+    with pytest.raises(ValueError, match="symmetric"):
+        make_request(correlation=[[1, 0.5, 0, 0], [0.2, 1, 0, 0], [0, 0, 1, 0], [0, 0, 0, 1]])
+
+
+def dag_task(task_id, low, likely, high, *depends_on, distribution="pert"):
+    from models.schemas import DagTask
+    return DagTask(
+        id=task_id, optimistic_weeks=low, likely_weeks=likely, pessimistic_weeks=high,
+        distribution=distribution, depends_on=list(depends_on),
+    )
+
+
+def test_dag_longest_path_and_criticality_match_per_run_loop():
+    from core.dag import draw_durations, simulate_dag_block, topological_order
+
+    # Diamond with a side branch: a -> (b | c) -> d, e independent
+    tasks = [
+        dag_task("d", 1, 2, 3, "b", "c"),
+        dag_task("a", 1, 2, 4),
+        dag_task("b", 2, 3, 6, "a", distribution="triangular"),
+        dag_task("c", 1, 3, 7, "a"),
+        dag_task("e", 2, 6, 9),
+    ]
+    ordered, predecessors = topological_order(tasks)
+    ids = [task.id for task in ordered]
+    assert ids.index("a") < ids.index("b") < ids.index("d")
+
+    completion, _, finish_sums, critical = simulate_dag_block(
+        ordered, predecessors, np.random.default_rng(3), 5000
+    )
+    durations = draw_durations(ordered, np.random.default_rng(3), 5000)
+    index = {task_id: i for i, task_id in enumerate(ids)}
+    expected_critical = np.zeros(len(ids))
+    for run in range(5000):
+        d = {task_id: durations[index[task_id], run] for task_id in ids}
+        finish_b = d["a"] + d["b"]
+        finish_c = d["a"] + d["c"]
+        finish_d = max(finish_b, finish_c) + d["d"]
+        end = max(finish_d, d["e"])
+        assert completion[run] == pytest.approx(end)
+        if finish_d >= d["e"]:
+            for task_id in ("a", "d") + (("b",) if finish_b >= finish_c else ()) + (("c",) if finish_c >= finish_b else ()):
+                expected_critical[index[task_id]] += 1
+        if d["e"] >= finish_d:
+            expected_critical[index["e"]] += 1
+    assert critical.tolist() == expected_critical.tolist()
+    assert finish_sums[index["d"]] / 5000 > finish_sums[index["a"]] / 5000
+
+
+def test_dag_simulation_summary():
+    from core.dag import run_dag_monte_carlo
+
+    # A fixed 10-week chain always dominates the uncertain parallel task
+    tasks = [dag_task("x", 4, 4, 4), dag_task("y", 6, 6, 6, "x"), dag_task("z", 1, 2, 3)]
+    results = run_dag_monte_carlo(tasks, 20_000, deadline_weeks=10, seed=1)
+    assert results["p50_weeks"] == results["p90_weeks"] == 10.0
+    assert results["on_time_probability"] == 1.0
+    criticality = {task["id"]: task["criticality_index"] for task in results["tasks"]}
+    assert criticality == {"x": 1.0, "y": 1.0, "z": 0.0}
+    assert results == run_dag_monte_carlo(tasks, 20_000, deadline_weeks=10, seed=1)
+
+
+def test_dag_rejects_invalid_graphs():
+    from core.dag import topological_order
+
+    with pytest.raises(ValueError, match="cycle"):
+        topological_order([dag_task("a", 1, 1, 1, "b"), dag_task("b", 1, 1, 1, "a")])
+    with pytest.raises(ValueError, match="unknown"):
+        topological_order([dag_task("a", 1, 1, 1, "missing")])
+
+
+def portfolio_request(pool, policy="shared", **project_overrides):
+    from models.schemas import PortfolioRequest
+
+    projects = [
+        make_request(project_name="Checkout", scope_size="small", team_junior=1, team_mid=1, team_senior=1, **project_overrides),
+        make_request(project_name="Search", scope_size="medium", team_junior=0, team_mid=2, team_senior=1, **project_overrides),
+        make_request(project_name="Mobile", scope_size="large", team_junior=2, team_mid=1, team_senior=2, **project_overrides),
+    ]
+    return PortfolioRequest(projects=projects, pool=pool, policy=policy, num_simulations=2000, seed=6)
+
+
+def test_portfolio_matches_event_by_event_reallocation():
+    from core.portfolio import (
+        project_streams, shared_completion_weeks, standalone_weeks, staffing_share, team_demand,
+    )
+
+    request = portfolio_request({"junior": 1, "mid": 2, "senior": 2})
+    demand = team_demand(request)
+    pool = np.array([1.0, 2.0, 2.0])
+    params = [kernel_params(p, calculate_base_effort(p)) for p in request.projects]
+    standalone = standalone_weeks(request, project_streams(request), params, 0, 2000)
+    finish = shared_completion_weeks(standalone, demand, pool)
+
+    # Reference: step from one project finishing to the next, re-staffing in between
+    for run in range(0, 2000, 97):
+        remaining = standalone[:, run].copy()
+        active = np.ones(3, dtype=bool)
+        now = 0.0
+        expected = np.zeros(3)
+        while active.any():
+            share = staffing_share(pool, demand[active].sum(axis=0))
+            step = remaining[active].min()
+            now += step / share
+            remaining[active] -= step
+            done = active & (remaining <= 1e-12)
+            expected[done] = now
+            active &= ~done
+        assert np.allclose(finish[:, run], expected)
+
+
+def test_portfolio_policies_and_ample_pool():
+    from core.portfolio import run_portfolio
+
+    ample = run_portfolio(portfolio_request({"junior": 3, "mid": 4, "senior": 4}))
+    for project in ample["projects"]:
+        assert project["p90_weeks"] == project["standalone_p90_weeks"]
+    assert ample["portfolio"]["initial_staffing_share"] == 1.0
+
+    pool = {"junior": 1, "mid": 2, "senior": 2}
+    shared = run_portfolio(portfolio_request(pool))
+    fixed = run_portfolio(portfolio_request(pool, policy="fixed"))
+    assert shared["portfolio"]["initial_staffing_share"] == 0.333
+    for s, f in zip(shared["projects"], fixed["projects"]):
+        assert s["standalone_p90_weeks"] < s["p90_weeks"] <= f["p90_weeks"]
+    assert shared["portfolio"]["p90_weeks"] < fixed["portfolio"]["p90_weeks"]
+
+
+def test_portfolio_blocks_stay_close_to_exact_and_follow_project_precision(monkeypatch):
+    from core import portfolio
+
+    pool = {"junior": 1, "mid": 2, "senior": 2}
+    exact = portfolio.run_portfolio(portfolio_request(pool))
+    # Passes of 500 runs folded into sketches instead of the whole matrix
+    monkeypatch.setattr(portfolio, "PORTFOLIO_MAX_ELEMENTS", 1500)
+    sketched = portfolio.run_portfolio(portfolio_request(pool))
+    for e, s in zip(exact["projects"], sketched["projects"]):
+        assert abs(e["p90_weeks"] - s["p90_weeks"]) <= 0.1
+        assert e["on_time_probability"] == s["on_time_probability"]
+    assert exact["portfolio"] == sketched["portfolio"]
+
+    # A float32 project is drawn and mapped in float32, as /simulate does
+    request = portfolio_request(pool, precision="float32")
+    streams = portfolio.project_streams(request)
+    params = [kernel_params(p, calculate_base_effort(p)) for p in request.projects]
+    standalone = portfolio.standalone_weeks(request, streams, params, 0, 2000)
+    z = draw_block_normals(streams[0], 0, 2000, dtype="float32")
+    expected = completion_weeks_from_normals(params[0], z)
+    assert expected.dtype == np.float32
+    assert np.array_equal(standalone[0], expected)
+
+
+def test_numpy_kernel_backend_is_bit_identical_to_reference():
+    from core.kernels import numpy_kernel
+    from core.monte_carlo import completion_weeks_from_normals, kernel_params
+
+    request = make_request(integrations=5, team_junior=3)
+    params = kernel_params(request, calculate_base_effort(request))
+    z = draw_normals(root_seed_sequence(3), 100_000)
+    assert np.array_equal(numpy_kernel(params, z), completion_weeks_from_normals(params, z))
+
+
+def test_kernel_selection_falls_back_to_numpy(monkeypatch):
+    import core.kernels as kernels
+
+    previous = kernels.selected_kernel_name()
+    try:
+        # Numba is optional: without it only numpy is available, and asking for it falls back
+        if "numba" not in kernels.available_kernels():
+            assert kernels.select_kernel("numba") == "numpy"
+        assert kernels.select_kernel("no-such-backend") == "numpy"
+
+        # Auto-selection skips a faster backend whose results differ
+        def fast_but_wrong(params, z):
+            return np.zeros(z.shape[1])
+        monkeypatch.setattr(kernels, "available_kernels", lambda: {"numpy": kernels.numpy_kernel, "wrong": fast_but_wrong})
+        assert kernels.select_kernel("auto") == "numpy"
+        # ...and so does asking for it by name
+        assert kernels.select_kernel("wrong") == "numpy"
+    finally:
+        monkeypatch.undo()
+        kernels.select_kernel(previous)
+
+
+def test_numba_kernel_is_bit_identical_or_not_used():
+    pytest.importorskip("numba")
+    import core.kernels as kernels
+    from core.monte_carlo import kernel_params
+
+    request = make_request()
+    params = kernel_params(request, calculate_base_effort(request))
+    z = draw_normals(root_seed_sequence(4), 100_000)
+    numba_kernel = kernels.available_kernels()["numba"]
+    previous = kernels.selected_kernel_name()
+    try:
+        if not kernels.matches_numpy(numba_kernel, z):
+            # e.g. a libm exp that differs in the last bit: even asked for by name, it is not used
+            assert kernels.select_kernel("numba") == "numpy"
+            return
+        assert kernels.select_kernel("numba") == "numba"
+        for block in (z, z.astype(np.float32)):
+            weeks = numba_kernel(params, block)
+            assert weeks.dtype == block.dtype
+            np.testing.assert_array_equal(weeks, kernels.numpy_kernel(params, block))
+    finally:
+        kernels.select_kernel(previous)
+
+
+def test_float32_kernel_matches_float64_within_rounding():
+    from core.kernels import numpy_kernel
+    from core.monte_carlo import kernel_params
+
+    request = make_request()
+    params = kernel_params(request, calculate_base_effort(request))
+    z = draw_normals(root_seed_sequence(9), 200_000)
+    weeks64 = numpy_kernel(params, z)
+    weeks32 = numpy_kernel(params, z.astype(np.float32))
+    assert weeks32.dtype == np.float32
+    qs = [0.05, 0.5, 0.8, 0.9, 0.99]
+    assert np.allclose(np.quantile(weeks32, qs), np.quantile(weeks64, qs), atol=0.05)
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_float32_simulation_within_rounding_of_float64(streaming):
+    request = make_request(num_simulations=1_000_000, seed=5)
+    base_effort = calculate_base_effort(request)
+    results64 = run_monte_carlo(request, base_effort, streaming=streaming)
+    results32 = run_monte_carlo(request.model_copy(update={"precision": "float32"}), base_effort, streaming=streaming)
+
+    # Within one 0.1-week rounding step; float32 draws are their own stream,
+    # so this also allows for 1M-run sampling noise
+    assert results32["p50_weeks"] == pytest.approx(results64["p50_weeks"], abs=0.11)
+    assert results32["p90_weeks"] == pytest.approx(results64["p90_weeks"], abs=0.11)
+    assert abs(results32["on_time_probability"] - results64["on_time_probability"]) <= 0.002
+    assert results32["peak_memory_mb"] < 0.6 * results64["peak_memory_mb"]
+    if not streaming:
+        assert results32["peak_memory_mb"] == pytest.approx(results64["peak_memory_mb"] / 2, rel=0.01)
+
+
+@pytest.mark.parametrize("streaming", [True, False])
+def test_peak_memory_accounting_matches_measurement(streaming):
+    from core.kernels import get_kernel
+    get_kernel()  # kernel selection (and any JIT compilation) is not part of a run
+    for precision in ("float64", "float32"):
+        request = make_request(num_simulations=500_000, seed=5, precision=precision)
+        base_effort = calculate_base_effort(request)
+        tracemalloc.start()
+        results = run_monte_carlo(request, base_effort, streaming=streaming)
+        measured = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        tracemalloc.stop()
+        assert measured <= 1.25 * results["peak_memory_mb"]
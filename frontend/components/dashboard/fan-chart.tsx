@@ -14,6 +14,7 @@ import {
   Label,
 } from 'recharts'
 import { TrendingUp } from 'lucide-react'
+import type { FanBand } from '@/lib/types'
 
 interface Props {
   p50: number
@@ -22,10 +23,26 @@ interface Props {
   numSimulations: number
   complexity: number
   teamSize: number
+  bands?: FanBand[]
 }
 
-export function FanChart({ p50, p90, deadline, numSimulations, complexity, teamSize }: Props) {
+export function FanChart({ p50, p90, deadline, numSimulations, complexity, teamSize, bands }: Props) {
   const fanData = useMemo(() => {
+    // Prefer the backend's bands, computed from every simulated run, shown as
+    // % of work ahead of / behind the median path
+    if (bands && bands.length > 0) {
+      return bands.map((b) => ({
+        week: b.week,
+        p95Upper: b.p95 - b.p50,
+        p90Upper: b.p90 - b.p50,
+        p75Upper: b.p75 - b.p50,
+        p95Lower: b.p5 - b.p50,
+        p90Lower: b.p10 - b.p50,
+        p75Lower: b.p25 - b.p50,
+        median: 0,
+      }))
+    }
+
     const maxWeeks = Math.ceil(p90 * 1.2)
     const baselineGrowth = 100 / p50
     const baseVolatility = 0.15
@@ -77,7 +94,7 @@ export function FanChart({ p50, p90, deadline, numSimulations, complexity, teamS
       })
     }
     return data
-  }, [p50, p90, complexity, teamSize])
+  }, [p50, p90, complexity, teamSize, bands])
 
   const maxDeviation = useMemo(
     () => Math.max(...fanData.map((d) => Math.max(Math.abs(d.p95Upper), Math.abs(d.p95Lower)))),
@@ -22,7 +22,9 @@ import { ExecutiveSummaryAudio } from "@/components/ExecutiveSummaryAudio"
 // ── Failure Forecast Panel ──────────────────────────────────────────────────
 
 function FailureForecastPanel({ onClose }: { onClose: () => void }) {
-  const { formData } = useAppState()
+  // The forecast describes formData's project, so it uses that project's results:
+  // a what-if scenario's P90 would not match the team and deadline sent with it
+  const { formData, baseline } = useAppState()
   const [data, setData] = useState<FailureForecastResponse | null>(null)
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState(false)
@@ -31,7 +33,7 @@ function FailureForecastPanel({ onClose }: { onClose: () => void }) {
     setLoading(true)
     setError(false)
     try {
-      const result = await fetchFailureForecast(formData)
+      const result = await fetchFailureForecast(formData, baseline)
       setData(result)
     } catch {
       setError(true)
@@ -40,7 +42,7 @@ function FailureForecastPanel({ onClose }: { onClose: () => void }) {
     }
   }
 
-  useEffect(() => { load() }, [formData])
+  useEffect(() => { load() }, [formData, baseline])
 
   if (loading) {
     return (
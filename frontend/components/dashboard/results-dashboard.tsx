@@ -65,7 +65,7 @@ function EmptyState() {
 }
 
 export function ResultsDashboard() {
-  const { formData, baseline, scenario, isSimulating, hasRun } = useAppState()
+  const { formData, baseline, scenario, scenarioBaseline, isSimulating, hasRun } = useAppState()
   const [activeTab, setActiveTab] = useState<TabId>("overview")
 
   if (isSimulating) return <LoadingSkeleton />
@@ -77,7 +77,7 @@ export function ResultsDashboard() {
     <div className="flex flex-col gap-5">
       {/* Hero metrics */}
       <div className="animate-slide-up">
-        <HeroMetrics data={active} baseline={scenario ? baseline : undefined} />
+        <HeroMetrics data={active} baseline={scenario ? scenarioBaseline || baseline : undefined} />
       </div>
 
       {/* Tab navigation */}
@@ -129,6 +129,7 @@ export function ResultsDashboard() {
             numSimulations={active.num_simulations}
             complexity={formData.complexity}
             teamSize={formData.team_junior + formData.team_mid + formData.team_senior}
+            bands={active.fan_bands}
           />
         )}
 
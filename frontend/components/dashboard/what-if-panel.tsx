@@ -86,7 +86,7 @@ function CompareMetric({
 }
 
 export function WhatIfPanel() {
-  const { baseline, hasRun, runScenarioAction, isScenarioRunning, scenario } = useAppState()
+  const { baseline, hasRun, runScenarioAction, isScenarioRunning, scenario, scenarioBaseline } = useAppState()
   const [seniorDelta, setSeniorDelta] = useState(0)
   const [integrationsDelta, setIntegrationsDelta] = useState(0)
   const [deadlineDelta, setDeadlineDelta] = useState(0)
@@ -126,6 +126,8 @@ export function WhatIfPanel() {
 
   if (!hasRun || !baseline) return null
 
+  const reference = scenarioBaseline || baseline
+
   return (
     <div className="glass-card p-5">
       <div className="mb-4 flex items-center justify-between">
@@ -206,27 +208,27 @@ export function WhatIfPanel() {
           <div className="grid grid-cols-2 gap-2">
             <CompareMetric
               label="On-time chance"
-              baseline={baseline.on_time_probability}
+              baseline={reference.on_time_probability}
               current={scenario.on_time_probability}
               suffix="%"
             />
             <CompareMetric
               label="Expected finish"
-              baseline={baseline.p50_weeks}
+              baseline={reference.p50_weeks}
               current={scenario.p50_weeks}
               suffix="w"
               invert
             />
             <CompareMetric
               label="Worst case"
-              baseline={baseline.p90_weeks}
+              baseline={reference.p90_weeks}
               current={scenario.p90_weeks}
               suffix="w"
               invert
             />
             <CompareMetric
               label="Expected delay"
-              baseline={baseline.expected_overrun_days}
+              baseline={reference.expected_overrun_days}
               current={scenario.expected_overrun_days}
               suffix="d"
               invert
@@ -5,6 +5,7 @@ import type {
   TaskBreakdownResponse,
   ExecutiveSummaryResponse,
   ExecutionPlanResponse,
+  ScenarioResult,
 } from "./types"
 import {
   generateMockSimulation,
@@ -39,6 +40,8 @@ interface BackendSimulationResponse {
     devops: number
   }
   baseline_metrics: any
+  fan_bands?: Array<{ week: number; p5: number; p10: number; p25: number; p50: number; p75: number; p90: number; p95: number }>
+  simulation_id?: string | null
 }
 
 interface BackendFailureForecastResponse {
@@ -142,6 +145,8 @@ function transformSimulationResponse(backend: BackendSimulationResponse, numSimu
       devops_pct: devopsPct,
       recommendation: `Recommended: ${fePct}% FE, ${bePct}% BE, ${devopsPct}% DevOps`,
     },
+    fan_bands: backend.fan_bands,
+    simulation_id: backend.simulation_id ?? undefined,
   }
 }
 
@@ -160,6 +165,19 @@ async function post<T>(path: string, body: unknown): Promise<T> {
   return res.json()
 }
 
+// Follow-ups on a /simulate result send just its simulation_id; if the server
+// no longer holds that simulation, the full request is sent instead
+async function postFollowUp<T>(path: string, simulationId: string | undefined, fullRequest: unknown): Promise<T> {
+  if (simulationId) {
+    try {
+      return await post<T>(path, { simulation_id: simulationId })
+    } catch (error) {
+      console.warn(`Stored simulation unavailable for ${path}, sending full request:`, error)
+    }
+  }
+  return post<T>(path, fullRequest)
+}
+
 function delay(ms: number): Promise<void> {
   return new Promise((resolve) => setTimeout(resolve, ms))
 }
@@ -180,6 +198,7 @@ export async function runSimulation(req: SimulationRequest): Promise<SimulationR
       integrations: req.integrations_count, // frontend uses integrations_count, backend uses integrations
       scope_volatility: req.scope_volatility,
       num_simulations: req.num_simulations || 1000,
+      include_fan_bands: true,
     }
 
     const backendResponse = await post<BackendSimulationResponse>("/simulate", backendRequest)
@@ -191,23 +210,62 @@ export async function runSimulation(req: SimulationRequest): Promise<SimulationR
   }
 }
 
+interface BackendScenarioResponse {
+  baseline: BackendSimulationResponse
+  scenario: BackendSimulationResponse
+  delta: Record<string, number>
+}
+
 export async function runScenario(
+  req: SimulationRequest,
   baseline: SimulationResponse,
   seniorDelta: number,
   integrationsDelta: number,
   deadlineDelta: number
-): Promise<SimulationResponse> {
+): Promise<ScenarioResult> {
   try {
-    // For now, use mock scenario since backend doesn't have a scenario endpoint
-    await delay(600 + Math.random() * 400)
-    return generateMockScenario(baseline, seniorDelta, integrationsDelta, deadlineDelta)
-  } catch {
+    // Backend re-evaluates the baseline's own random draws (common random numbers),
+    // so slider moves show the effect of the change rather than fresh noise.
+    // Deltas must be taken against the baseline returned here, not the /simulate
+    // result, which came from different draws.
+    const backendRequest = {
+      baseline: {
+        project_name: req.project_name,
+        description: req.description,
+        scope_size: req.scope_size,
+        complexity: req.complexity,
+        stack: req.tech_stack,
+        deadline_weeks: req.deadline_weeks,
+        team_junior: req.team_junior,
+        team_mid: req.team_mid,
+        team_senior: req.team_senior,
+        integrations: req.integrations_count,
+        scope_volatility: req.scope_volatility,
+        num_simulations: req.num_simulations || 1000,
+        include_fan_bands: true,
+      },
+      senior_delta: seniorDelta,
+      integrations_delta: integrationsDelta,
+      deadline_delta: deadlineDelta,
+    }
+
+    const backendResponse = await post<BackendScenarioResponse>("/scenario", backendRequest)
+    const numSimulations = backendRequest.baseline.num_simulations
+    return {
+      baseline: transformSimulationResponse(backendResponse.baseline, numSimulations),
+      scenario: transformSimulationResponse(backendResponse.scenario, numSimulations),
+    }
+  } catch (error) {
+    console.error("API error, using mock scenario:", error)
     await delay(600 + Math.random() * 400)
-    return generateMockScenario(baseline, seniorDelta, integrationsDelta, deadlineDelta)
+    return { baseline, scenario: generateMockScenario(baseline, seniorDelta, integrationsDelta, deadlineDelta) }
   }
 }
 
-export async function fetchFailureForecast(req: SimulationRequest): Promise<FailureForecastResponse> {
+export async function fetchFailureForecast(
+  req: SimulationRequest,
+  sim?: SimulationResponse | null
+): Promise<FailureForecastResponse> {
   try {
     const backendRequest = {
       project_name: req.project_name,
@@ -222,9 +280,19 @@ export async function fetchFailureForecast(req: SimulationRequest): Promise<Fail
       integrations: req.integrations_count,
       scope_volatility: req.scope_volatility,
       num_simulations: req.num_simulations || 1000,
+      // Results already on screen, so the backend does not simulate again
+      ...(sim && {
+        p90_weeks: sim.p90_weeks,
+        risk_scores: {
+          integration: sim.risks.integration_risk.score,
+          team_imbalance: sim.risks.team_imbalance_risk.score,
+          scope_creep: sim.risks.scope_creep_risk.score,
+          learning_curve: sim.risks.learning_curve_risk.score,
+        },
+      }),
     }
 
-    const backendResponse = await post<BackendFailureForecastResponse>("/failure-forecast", backendRequest)
+    const backendResponse = await postFollowUp<BackendFailureForecastResponse>("/failure-forecast", sim?.simulation_id, backendRequest)
     return {
       failure_sequence: backendResponse.failure_story,
       mitigations: backendResponse.mitigations,
@@ -255,7 +323,7 @@ export async function fetchTaskBreakdown(
       },
     }
 
-    const backendResponse = await post<BackendTaskBreakdownResponse>("/task-breakdown", backendRequest)
+    const backendResponse = await postFollowUp<BackendTaskBreakdownResponse>("/task-breakdown", sim.simulation_id, backendRequest)
     return {
       tasks: backendResponse.tasks.map((task, idx) => ({
         index: idx + 1,
@@ -299,7 +367,7 @@ export async function fetchExecutionPlan(
       },
     }
 
-    const data = await post<ExecutionPlanResponse>("/execution-plan", backendRequest)
+    const data = await postFollowUp<ExecutionPlanResponse>("/execution-plan", sim.simulation_id, backendRequest)
     return data
   } catch (error) {
     console.error("fetchExecutionPlan error, using static fallback:", error)
@@ -393,7 +461,7 @@ export async function fetchExecutiveSummary(
       num_simulations: req.num_simulations ?? 1000,
     }
 
-    const backendResponse = await post<BackendExecutiveSummaryResponse>("/executive-summary", backendRequest)
+    const backendResponse = await postFollowUp<BackendExecutiveSummaryResponse>("/executive-summary", sim.simulation_id, backendRequest)
 
     // Determine top risk
     const risks = [
@@ -15,6 +15,8 @@ interface AppState {
   // Simulation
   baseline: SimulationResponse | null
   scenario: SimulationResponse | null
+  // Baseline on the scenario's random draws; compare the scenario against this
+  scenarioBaseline: SimulationResponse | null
   isSimulating: boolean
   isScenarioRunning: boolean
   hasRun: boolean
@@ -71,6 +73,7 @@ export function AppProvider({ children }: { children: ReactNode }) {
   const [formData, setFormData] = useState<SimulationRequest>(defaultForm)
   const [baseline, setBaseline] = useState<SimulationResponse | null>(null)
   const [scenario, setScenario] = useState<SimulationResponse | null>(null)
+  const [scenarioBaseline, setScenarioBaseline] = useState<SimulationResponse | null>(null)
   const [isSimulating, setIsSimulating] = useState(false)
   const [isScenarioRunning, setIsScenarioRunning] = useState(false)
   const [hasRun, setHasRun] = useState(false)
@@ -119,6 +122,7 @@ export function AppProvider({ children }: { children: ReactNode }) {
   const simulate = useCallback(async (data: SimulationRequest) => {
     setIsSimulating(true)
     setScenario(null)
+    setScenarioBaseline(null)
     try {
       const result = await runSimulation(data)
       setBaseline(result)
@@ -138,15 +142,16 @@ export function AppProvider({ children }: { children: ReactNode }) {
       if (!baseline) return
       setIsScenarioRunning(true)
       try {
-        const result = await runScenario(baseline, seniorDelta, integrationsDelta, deadlineDelta)
-        setScenario(result)
+        const result = await runScenario(formData, baseline, seniorDelta, integrationsDelta, deadlineDelta)
+        setScenario(result.scenario)
+        setScenarioBaseline(result.baseline)
       } catch {
         toast.error("Scenario failed", { description: "Please try again." })
       } finally {
         setIsScenarioRunning(false)
       }
     },
-    [baseline]
+    [baseline, formData]
   )
 
   const regenerateExecutionPlan = useCallback(async () => {
@@ -167,6 +172,7 @@ export function AppProvider({ children }: { children: ReactNode }) {
         loadDemo,
         baseline,
         scenario,
+        scenarioBaseline,
         isSimulating,
         isScenarioRunning,
         hasRun,
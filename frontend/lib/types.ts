@@ -29,6 +29,27 @@ export interface SimulationResponse {
   risks: RiskBreakdown
   team_stress: TeamStress
   allocation: SmartAllocation
+  fan_bands?: FanBand[]
+  // Server-side handle for follow-up requests (absent for scenario results)
+  simulation_id?: string
+}
+
+// A what-if result and the baseline it was simulated against (same random draws)
+export interface ScenarioResult {
+  baseline: SimulationResponse
+  scenario: SimulationResponse
+}
+
+// Server-computed percentiles of % work complete per week
+export interface FanBand {
+  week: number
+  p5: number
+  p10: number
+  p25: number
+  p50: number
+  p75: number
+  p90: number
+  p95: number
 }
 
 export interface DistributionBucket {